@@ -0,0 +1,80 @@
+import asyncio
+import logging
+import os
+import sys
+
+import discord
+
+import settings
+from db.migrations import init_schema
+from helpers.cluster import Coordinator, split_shards
+
+logger = logging.getLogger(__name__)
+
+# Discord allows one IDENTIFY per five seconds per bucket; AutoShardedClient spaces shards within a process
+IDENTIFY_INTERVAL = 5
+
+
+async def fetch_recommended_shard_count() -> int:
+    client = discord.Client(intents=discord.Intents.none())
+    try:
+        await client.login(settings.DISCORD_API_SECRET)
+        shard_count, _ = await client.http.get_bot_gateway()
+        return shard_count
+    finally:
+        await client.close()
+
+
+async def run_cluster(cluster_id: int, cluster_count: int, shard_ids: list, shard_count: int, start_delay: float):
+    await asyncio.sleep(start_delay)
+    env = {
+        **os.environ,
+        "CLUSTER_ID": str(cluster_id),
+        "CLUSTER_COUNT": str(cluster_count),
+        "SHARD_IDS": ",".join(str(shard_id) for shard_id in shard_ids),
+        "SHARD_COUNT": str(shard_count),
+    }
+
+    while True:
+        logger.info(f"Launching cluster {cluster_id} with shards {shard_ids}")
+        process = await asyncio.create_subprocess_exec(sys.executable, str(settings.BASE_DIR / "main.py"), env=env)
+        return_code = await process.wait()
+        if return_code == 0:
+            logger.info(f"Cluster {cluster_id} exited cleanly")
+            return
+        logger.warning(f"Cluster {cluster_id} exited with code {return_code}, restarting in 10 seconds")
+        await asyncio.sleep(10)
+
+
+async def main():
+    shard_count = settings.SHARD_COUNT or await fetch_recommended_shard_count()
+    cluster_count = min(settings.CLUSTER_COUNT, shard_count)
+    clusters = split_shards(shard_count, cluster_count)
+    logger.info(f"Starting {cluster_count} cluster(s) for {shard_count} shard(s)")
+
+    # Migrations and partition creation run here once; workers racing each other through them would deadlock or fail
+    if not await asyncio.to_thread(init_schema):
+        logger.error("Failed to initialize database")
+        sys.exit(1)
+
+    coordinator = Coordinator()
+    await coordinator.start()
+
+    delays, elapsed = [], 0
+    for shard_ids in clusters:
+        delays.append(elapsed)
+        elapsed += len(shard_ids) * IDENTIFY_INTERVAL
+
+    await asyncio.gather(
+        *(
+            run_cluster(cluster_id, cluster_count, shard_ids, shard_count, delay)
+            for cluster_id, (shard_ids, delay) in enumerate(zip(clusters, delays))
+        )
+    )
+
+
+if __name__ == "__main__":
+    try:
+        asyncio.run(main())
+    except KeyboardInterrupt:
+        logger.info("Cluster launcher was stopped by user.")
@@ -1,27 +1,39 @@
+import asyncio
 import logging
 import math
-from typing import Dict, List, Tuple
+import time
+from typing import Dict, List, Optional, Tuple
 
 import discord
 from discord import app_commands
 from discord.ext import commands
 
+from db.cache import list_cache
 from db.database import (
     REPORT_TYPE_DISPLAY,
     CheaterReportFields,
     DatabaseManager,
     ReportType,
 )
+from db.heavy_hitters import SpaceSaving
+from db.snapshot import SummaryRow, report_snapshot
 from helpers import checks, utils
+from helpers.deferral import auto_defer, reply
+from helpers.member_index import member_indexes
 from helpers.pagination import Pagination
 
 logger = logging.getLogger("command")
 
+SINCE_WINDOWS = {
+    "24h": ("Last 24 Hours", 24 * 60 * 60),
+    "7d": ("Last 7 Days", 7 * 24 * 60 * 60),
+    "30d": ("Last 30 Days", 30 * 24 * 60 * 60),
+}
+
 
 class CheaterReport:
-    def __init__(self, cheater_id: str, cheater_name: str, reporter_id: str, report_time: float):
+    def __init__(self, cheater_id: str, reporter_id: str, report_time: float):
         self.cheater_id = cheater_id
-        self.cheater_name = cheater_name
         self.reporter_id = reporter_id
         self.report_time = report_time
 
@@ -31,18 +43,27 @@ class CheaterSummary:
         self.count = 0
         self.latest_name = ""
         self.latest_time = 0
-        self.reporters: Dict[str, int] = {}
+        self.reporters = SpaceSaving()
 
     def update(self, report: CheaterReport):
         self.count += 1
-        if report.report_time > self.latest_time:
-            self.latest_time = report.report_time
-            self.latest_name = report.cheater_name
-        self.reporters[report.reporter_id] = self.reporters.get(report.reporter_id, 0) + 1
+        self.latest_time = max(self.latest_time, report.report_time)
+        self.reporters.add(report.reporter_id)
+
+    @classmethod
+    def from_snapshot(cls, row: SummaryRow) -> "CheaterSummary":
+        _, count, latest_name, latest_time, top_reporter, top_reporter_count = row
+        summary = cls()
+        summary.count = count
+        summary.latest_name = latest_name
+        summary.latest_time = latest_time
+        summary.reporters.add(top_reporter, top_reporter_count)
+        return summary
 
     @property
     def top_reporter(self):
-        return max(self.reporters, key=self.reporters.get) if self.reporters else None
+        top = self.reporters.top
+        return top[0] if top else None
 
 
 class ListReports(commands.Cog):
@@ -60,73 +81,145 @@ class ListReports(commands.Cog):
 
     async def user_autocomplete(self, interaction: discord.Interaction, current: str) -> List[app_commands.Choice[str]]:
         logger.debug(f"User autocomplete called with current: {current}")
-        members = interaction.guild.members
-        choices = [
-            app_commands.Choice(name=f"@{member.display_name}", value=str(member.id))
-            for member in members
-            if current.lower() in member.display_name.lower()
-        ]
+        if self.bot.intents.members:
+            matches = (await member_indexes.get(interaction.guild)).search(current, limit=8)
+        else:
+            matches = await self.query_members(interaction.guild, current)
+        choices = [app_commands.Choice(name=f"@{display_name}", value=str(member_id)) for member_id, display_name in matches]
         logger.debug(f"Returning {len(choices)} user autocomplete choices")
-        return choices[:8]
+        return choices
+
+    async def query_members(self, guild: discord.Guild, current: str) -> List[Tuple[int, str]]:
+        # Without the members intent there is no member cache, so ask the gateway for prefix matches instead
+        if not current:
+            return []
+        try:
+            members = await guild.query_members(query=current, limit=8, cache=False)
+        except asyncio.TimeoutError:
+            logger.warning(f"Member query timed out in guild {guild.id}")
+            return []
+        return [(member.id, member.display_name) for member in members]
+
+    @commands.Cog.listener()
+    async def on_member_join(self, member: discord.Member):
+        member_indexes.add(member)
+
+    @commands.Cog.listener()
+    async def on_member_update(self, before: discord.Member, after: discord.Member):
+        if before.display_name != after.display_name:
+            member_indexes.add(after)
+
+    @commands.Cog.listener()
+    async def on_user_update(self, before: discord.User, after: discord.User):
+        if before.display_name != after.display_name:
+            for guild in after.mutual_guilds:
+                member = guild.get_member(after.id)
+                if member:
+                    member_indexes.add(member)
+
+    @commands.Cog.listener()
+    async def on_member_remove(self, member: discord.Member):
+        member_indexes.remove(member)
+
+    @commands.Cog.listener()
+    async def on_guild_remove(self, guild: discord.Guild):
+        member_indexes.drop(guild.id)
 
     @commands.hybrid_command(
         name="list_reports",
         description="List all users reported.",
     )
     @app_commands.autocomplete(report_type=report_type_autocomplete, user=user_autocomplete)
-    async def list_reports(self, ctx, report_type: str, user: str = None):
-        logger.info(f"list_reports command called by {ctx.author} with report_type: {report_type}, user: {user}")
+    @app_commands.choices(
+        since=[app_commands.Choice(name=label, value=key) for key, (label, _) in SINCE_WINDOWS.items()],
+        scope=[
+            app_commands.Choice(name="This Server", value="server"),
+            app_commands.Choice(name="Global", value="global"),
+        ],
+    )
+    @auto_defer(ephemeral=False)
+    async def list_reports(self, ctx, report_type: str, user: str = None, since: str = None, scope: str = "global"):
+        logger.info(
+            f"list_reports command called by {ctx.author} with report_type: {report_type}, user: {user}, since: {since}, scope: {scope}"
+        )
 
         if not await self.check_guild_configuration(ctx):
             return
 
         if report_type == "From User" and not user:
             logger.warning("From User selected but no user provided")
-            await ctx.send("Please select a user when using 'From User' option.", ephemeral=True)
+            await reply(ctx, "Please select a user when using 'From User' option.", ephemeral=True)
             return
 
-        reports = await self.fetch_reports(report_type, user)
-        if not reports:
-            await ctx.send("No non-absolved reports found for the given criteria.", ephemeral=True)
+        if since is not None and since not in SINCE_WINDOWS:
+            await reply(ctx, f"Unknown time window '{since}'. Use one of: {', '.join(SINCE_WINDOWS)}.", ephemeral=True)
             return
 
-        cheater_summary = self.process_reports(reports)
-        sorted_summary = self.sort_cheater_summary(cheater_summary)
-        await self.display_pagination(ctx, sorted_summary, report_type)
+        server_id = ctx.guild.id if scope == "server" else None
+        # Relative windows are resolved at request time; cached entries age out with the list cache TTL
+        since_time = int(time.time()) - SINCE_WINDOWS[since][1] if since else None
+
+        cache_key = ("list_reports", report_type, user, server_id, since)
+        sorted_summary = list_cache.get(cache_key)
+        if sorted_summary is None:
+            sorted_summary = await self.build_summary(report_type, user, since_time, server_id)
+            if not sorted_summary:
+                await reply(ctx, "No non-absolved reports found for the given criteria.", ephemeral=True)
+                return
+
+            list_cache.set(cache_key, sorted_summary, profile_ids=[cheater_id for cheater_id, _ in sorted_summary])
+        else:
+            logger.debug(f"Serving cached summary for {cache_key}")
+
+        await self.display_pagination(ctx, sorted_summary, report_type, since, server_id is not None)
 
     async def check_guild_configuration(self, ctx) -> bool:
         if not checks.is_guild_id_configured(ctx.guild.id):
             logger.warning(f"Guild {ctx.guild.id} not configured")
-            await ctx.send(
+            await reply(
+                ctx,
                 "Please configure the server with `/set_reporting_channel` and the channels id.",
                 ephemeral=True,
             )
             return False
         return True
 
-    async def fetch_reports(self, report_type: str, user: str = None) -> List[CheaterReport]:
-        logger.debug(f"Fetching non-absolved cheater reports for type: {report_type}")
+    async def build_summary(
+        self, report_type: str, user: str = None, since: Optional[int] = None, server_id: Optional[int] = None
+    ) -> List[Tuple[str, CheaterSummary]]:
+        if report_snapshot.loaded:
+            return self.summarize_snapshot(report_type, user, since, server_id)
+
+        reports = await self.fetch_reports(report_type, user, since, server_id)
+        cheater_summary = self.process_reports(reports)
+        names = await asyncio.to_thread(DatabaseManager.get_player_names, list(cheater_summary)) or {}
+        for cheater_id, summary in cheater_summary.items():
+            summary.latest_name = names.get(cheater_id, "")
+        return self.sort_cheater_summary(cheater_summary)
+
+    def summarize_snapshot(
+        self, report_type: str, user: str = None, since: Optional[int] = None, server_id: Optional[int] = None
+    ) -> List[Tuple[str, CheaterSummary]]:
+        logger.debug(f"Summarizing snapshot for type: {report_type}, user: {user}, since: {since}, server: {server_id}")
         try:
-            if user:
-                user_id = int(user)
-                if report_type == "All":
-                    db_reports = DatabaseManager.get_cheater_reports_by_user(user_id, absolved=False)
-                else:
-                    report_enum = ReportType[report_type]
-                    db_reports = DatabaseManager.get_cheater_reports_by_type_and_user(report_enum, user_id, absolved=False)
-            else:
-                if report_type == "All":
-                    db_reports = []
-                    for rt in ReportType:
-                        db_reports.extend(DatabaseManager.get_cheater_reports_by_type(rt, absolved=False))
-                else:
-                    report_enum = ReportType[report_type]
-                    db_reports = DatabaseManager.get_cheater_reports_by_type(report_enum, absolved=False)
+            type_code = ReportType[report_type].value if report_type != "All" else None
+            reporter_id = int(user) if user else None
+            rows = report_snapshot.summarize(type_code=type_code, reporter_id=reporter_id, since=since, server_id=server_id)
+            return [(row[0], CheaterSummary.from_snapshot(row)) for row in rows]
+        except Exception as e:
+            logger.error(f"An error occurred while summarizing the report snapshot: {e}")
+            return []
 
+    async def fetch_reports(
+        self, report_type: str, user: str = None, since: Optional[int] = None, server_id: Optional[int] = None
+    ) -> List[CheaterReport]:
+        logger.debug(f"Fetching non-absolved cheater reports for type: {report_type}, since: {since}, server: {server_id}")
+        try:
+            # The queries block, so run them off the event loop where they can't hold up the deferral timer
+            db_reports = await asyncio.to_thread(self.query_reports, report_type, user, since, server_id)
             return [
                 CheaterReport(
                     report[CheaterReportFields.CHEATER_PROFILE_ID.value],
-                    report[CheaterReportFields.CHEATER_GAME_NAME.value],
                     report[CheaterReportFields.REPORTER_USER_ID.value],
                     report[CheaterReportFields.REPORT_TIME.value],
                 )
@@ -136,6 +229,23 @@ class ListReports(commands.Cog):
             logger.error(f"An error occurred while retrieving reports: {e}")
             return []
 
+    def query_reports(self, report_type: str, user: str, since: Optional[int], server_id: Optional[int]) -> List[Dict]:
+        window = {"since": since, "server_id": server_id}
+        if user:
+            user_id = int(user)
+            if report_type == "All":
+                return DatabaseManager.get_cheater_reports_by_user(user_id, absolved=False, **window)
+            report_enum = ReportType[report_type]
+            return DatabaseManager.get_cheater_reports_by_type_and_user(report_enum, user_id, absolved=False, **window)
+
+        if report_type == "All":
+            db_reports = []
+            for rt in ReportType:
+                db_reports.extend(DatabaseManager.get_cheater_reports_by_type(rt, absolved=False, **window))
+            return db_reports
+        report_enum = ReportType[report_type]
+        return DatabaseManager.get_cheater_reports_by_type(report_enum, absolved=False, **window)
+
     def process_reports(self, reports: List[CheaterReport]) -> Dict[str, CheaterSummary]:
         logger.debug(f"Processing {len(reports)} reports")
         cheater_summary = {}
@@ -149,7 +259,9 @@ class ListReports(commands.Cog):
         logger.debug("Sorting cheater summary")
         return sorted(cheater_summary.items(), key=lambda x: x[1].count, reverse=True)
 
-    async def display_pagination(self, ctx, sorted_summary: List[Tuple[str, CheaterSummary]], report_type: str):
+    async def display_pagination(
+        self, ctx, sorted_summary: List[Tuple[str, CheaterSummary]], report_type: str, since: str = None, this_server: bool = False
+    ):
         items_per_page = 10
         pages = math.ceil(len(sorted_summary) / items_per_page)
         logger.debug(f"Calculated {pages} pages for pagination")
@@ -165,8 +277,14 @@ class ListReports(commands.Cog):
             except KeyError:
                 report_type_display = report_type
 
+            title = f"Reports for '{report_type_display}'"
+            if since:
+                title += f" ({SINCE_WINDOWS[since][0]})"
+            if this_server:
+                title += f" in {ctx.guild.name}"
+
             embed = discord.Embed(
-                title=f"Reports for '{report_type_display}'",
+                title=title,
                 color=discord.Color.red(),
             )
 
@@ -1,3 +1,4 @@
+import asyncio
 import logging
 import math
 from typing import Dict, List, Tuple
@@ -5,8 +6,10 @@ from typing import Dict, List, Tuple
 import discord
 from discord.ext import commands
 
+from db.cache import list_cache
 from db.database import DatabaseManager, VerifiedLegitFields
 from helpers import checks, utils
+from helpers.deferral import auto_defer, reply
 from helpers.pagination import Pagination
 
 logger = logging.getLogger("command")
@@ -26,16 +29,14 @@ class UserSummary:
         self.verified_count = 0
         self.first_verified_by = ""
         self.first_verified_time = float("inf")
-        self.latest_verified_time = 0
 
     def update(self, user: VerifiedUser):
         self.verified_count += 1
         if user.verified_time < self.first_verified_time:
             self.first_verified_time = user.verified_time
             self.first_verified_by = user.verified_by
-        if user.verified_time > self.latest_verified_time:
-            self.latest_name = user.game_name
-            self.latest_verified_time = user.verified_time
+        # Every row carries the player's current name from the players table
+        self.latest_name = user.game_name
 
 
 class ListVerified(commands.Cog):
@@ -46,25 +47,34 @@ class ListVerified(commands.Cog):
         name="list_verified",
         description="List all verified users.",
     )
+    @auto_defer(ephemeral=False)
     async def list_verified(self, ctx):
         logger.info(f"list_verified command called by {ctx.author}")
 
         if not await self.check_guild_configuration(ctx):
             return
 
-        verified_users = await self.fetch_verified_users()
-        if not verified_users:
-            await ctx.send("No verified users found.", ephemeral=True)
-            return
+        cache_key = ("list_verified",)
+        sorted_summary = list_cache.get(cache_key)
+        if sorted_summary is None:
+            verified_users = await self.fetch_verified_users()
+            if not verified_users:
+                await reply(ctx, "No verified users found.", ephemeral=True)
+                return
+
+            user_summary = self.process_verified_users(verified_users)
+            sorted_summary = self.sort_user_summary(user_summary)
+            list_cache.set(cache_key, sorted_summary, profile_ids=user_summary.keys())
+        else:
+            logger.debug("Serving cached verified summary")
 
-        user_summary = self.process_verified_users(verified_users)
-        sorted_summary = self.sort_user_summary(user_summary)
         await self.display_pagination(ctx, sorted_summary)
 
     async def check_guild_configuration(self, ctx) -> bool:
         if not checks.is_guild_id_configured(ctx.guild.id):
             logger.warning(f"Guild {ctx.guild.id} not configured")
-            await ctx.send(
+            await reply(
+                ctx,
                 "Please configure the server with `/set_reporting_channel` and the channels id.",
                 ephemeral=True,
             )
@@ -74,12 +84,12 @@ class ListVerified(commands.Cog):
     async def fetch_verified_users(self) -> List[VerifiedUser]:
         logger.debug("Fetching verified users")
         try:
-            db_users = DatabaseManager.get_all_verified_users()
+            db_users = await asyncio.to_thread(DatabaseManager.get_all_verified_users)
             logger.debug(f"Retrieved {len(db_users)} verified users")
             return [
                 VerifiedUser(
                     user[VerifiedLegitFields.TARKOV_PROFILE_ID.value],
-                    user[VerifiedLegitFields.TARKOV_GAME_NAME.value],
+                    user["tarkov_game_name"],
                     user[VerifiedLegitFields.VERIFIER_USER_ID.value],
                     user[VerifiedLegitFields.VERIFIED_TIME.value],
                 )
@@ -0,0 +1,107 @@
+import asyncio
+import logging
+import time
+
+from discord.ext import commands, tasks
+
+import settings
+from db.database import DatabaseManager, DatabaseUnavailableError
+from db.migrations import rebuild_daily_stats
+from db.partitions import maintain_report_partitions
+from db.spool import write_spool
+
+logger = logging.getLogger("command")
+
+
+class Maintenance(commands.Cog):
+    def __init__(self, bot):
+        self.bot = bot
+        self.maintenance.change_interval(hours=settings.MAINTENANCE_INTERVAL_HOURS)
+        self.maintenance.start()
+        self.replay_spool.change_interval(seconds=settings.SPOOL_REPLAY_INTERVAL)
+        self.replay_spool.start()
+
+    async def cog_unload(self):
+        self.maintenance.cancel()
+        self.replay_spool.cancel()
+
+    @property
+    def is_maintainer(self) -> bool:
+        # Only one cluster runs maintenance; the others would just race it for the same locks
+        cluster = getattr(self.bot, "cluster", None)
+        return cluster is None or cluster.is_leader
+
+    @tasks.loop(hours=24)
+    async def maintenance(self):
+        if not self.is_maintainer:
+            return
+
+        start = time.perf_counter()
+        created = await asyncio.to_thread(maintain_report_partitions)
+        if created is not None:
+            logger.info(f"Partition maintenance created {created} partition(s) in {time.perf_counter() - start:.2f}s")
+
+        await self.archive_reports()
+        await self.prune_applied_writes()
+        await self.rebuild_statistics()
+
+    async def archive_reports(self):
+        older_than = int(time.time()) - settings.ARCHIVE_AFTER_DAYS * 86400 if settings.ARCHIVE_AFTER_DAYS > 0 else None
+        if not settings.ARCHIVE_ABSOLVED and older_than is None:
+            return
+
+        start = time.perf_counter()
+        try:
+            moved = await asyncio.to_thread(
+                DatabaseManager.archive_reports, settings.ARCHIVE_ABSOLVED, older_than, settings.ARCHIVE_BATCH_SIZE
+            )
+        except DatabaseUnavailableError as e:
+            # An unhandled error would stop the loop for good; skip this run and try again next interval
+            logger.warning(f"Skipping report archiving: {e}")
+            return
+        if moved is not None:
+            DatabaseManager.apply_cache_event("reports_archived", {"older_than": older_than, "moved": moved})
+            logger.info(f"Archived {moved} report(s) in {time.perf_counter() - start:.2f}s")
+
+    async def prune_applied_writes(self):
+        older_than = int(time.time()) - settings.APPLIED_WRITE_RETENTION_DAYS * 86400
+        try:
+            pruned = await asyncio.to_thread(DatabaseManager.prune_applied_writes, older_than)
+        except DatabaseUnavailableError as e:
+            logger.warning(f"Skipping applied write pruning: {e}")
+            return
+        if pruned:
+            logger.info(f"Pruned {pruned} applied write id(s)")
+
+    async def rebuild_statistics(self):
+        if not settings.REBUILD_DAILY_STATS:
+            return
+
+        start = time.perf_counter()
+        if await asyncio.to_thread(rebuild_daily_stats):
+            logger.info(f"Rebuilt daily statistics rollups in {time.perf_counter() - start:.2f}s")
+
+    @maintenance.error
+    async def maintenance_error(self, error: Exception):
+        logger.error(f"Maintenance task failed: {error}")
+
+    @tasks.loop(seconds=15)
+    async def replay_spool(self):
+        # Every process owns its own spool file, so this runs everywhere rather than only on the maintainer
+        pending = len(write_spool)
+        if not pending:
+            return
+
+        start = time.perf_counter()
+        # Replays apply cache events, which must stay on the event loop, so bound the work per tick instead
+        replayed = DatabaseManager.replay_spooled_writes(limit=settings.SPOOL_REPLAY_BATCH)
+        if replayed:
+            logger.info(f"Replayed {replayed} of {pending} spooled write(s) in {time.perf_counter() - start:.2f}s")
+
+    @replay_spool.error
+    async def replay_spool_error(self, error: Exception):
+        logger.error(f"Spool replay task failed: {error}")
+
+
+async def setup(bot):
+    await bot.add_cog(Maintenance(bot))
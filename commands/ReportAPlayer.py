@@ -1,3 +1,4 @@
+import asyncio
 import logging
 import time
 from dataclasses import dataclass
@@ -7,12 +8,15 @@ import discord
 from discord import app_commands
 from discord.ext import commands
 
-from db.database import REPORT_TYPE_DISPLAY, DatabaseManager, ReportType
+from db.database import REPORT_TYPE_DISPLAY, DatabaseManager, DatabaseUnavailableError, DeadlineExceededError, ReportResult, ReportType
 from helpers import checks
+from helpers.deferral import auto_defer, respond
 from helpers.utils import (
     create_already_verified_embed,
     get_user_mention,
     is_valid_game_name,
+    send_database_unavailable,
+    send_query_timed_out,
     send_to_report_channels,
 )
 
@@ -74,6 +78,7 @@ class ReportModal(discord.ui.Modal):
         required=False,
     )
 
+    @auto_defer(ephemeral=True)
     async def on_submit(self, modal_interaction: discord.Interaction):
         logger.debug(f"Report modal submitted by {modal_interaction.user}")
 
@@ -92,6 +97,15 @@ class ReportModal(discord.ui.Modal):
 
         await self.submit_report(modal_interaction, report_data)
 
+    async def on_error(self, interaction: discord.Interaction, error: Exception):
+        if isinstance(error, DatabaseUnavailableError):
+            await send_database_unavailable(interaction)
+            return
+        if isinstance(error, DeadlineExceededError):
+            await send_query_timed_out(interaction)
+            return
+        await super().on_error(interaction, error)
+
     async def validate_report(self, interaction: discord.Interaction, report_data: ReportData) -> bool:
         if not is_valid_game_name(report_data.cheater_name):
             logger.warning(f"Invalid cheater name provided: {report_data.cheater_name}")
@@ -100,14 +114,19 @@ class ReportModal(discord.ui.Modal):
                 description="Please enter a name between 3 and 15 characters, using only letters, numbers (max 4), underscores '_', and hyphens '-'.",
                 color=discord.Color.red(),
             )
-            await interaction.response.send_message(embed=embed, ephemeral=True)
+            await respond(interaction, embed=embed, ephemeral=True)
             return False
 
-        verified_status = DatabaseManager.check_verified_legit_status(report_data.cheater_profile_id)
-        if verified_status["is_verified"]:
+        try:
+            verified_status = await asyncio.to_thread(DatabaseManager.check_verified_legit_status, report_data.cheater_profile_id)
+        except (DatabaseUnavailableError, DeadlineExceededError):
+            # Intake keeps going during an outage; the report is spooled and applied once the database is back
+            verified_status = None
+        if verified_status and verified_status["is_verified"]:
             logger.info(f"Attempt to report verified player {report_data.cheater_name} (ID: {report_data.cheater_profile_id})")
             embed = await self.create_verified_player_embed(interaction, verified_status, report_data)
-            await interaction.response.send_message(
+            await respond(
+                interaction,
                 "This player has been verified as legitimate and cannot be reported.",
                 embed=embed,
                 ephemeral=True,
@@ -118,7 +137,8 @@ class ReportModal(discord.ui.Modal):
 
     async def submit_report(self, interaction: discord.Interaction, report_data: ReportData):
         logger.info(f"Adding cheater report for {report_data.cheater_name} (ID: {report_data.cheater_profile_id})")
-        DatabaseManager.add_cheater_report(
+        result = await asyncio.to_thread(
+            DatabaseManager.add_cheater_report,
             reporter_user_id=report_data.reporter_id,
             server_id=report_data.server_id,
             cheater_game_name=report_data.cheater_name,
@@ -129,12 +149,38 @@ class ReportModal(discord.ui.Modal):
             absolved=False,
         )
 
+        if result == ReportResult.COALESCED:
+            logger.info(f"Report merged into a recent report by {report_data.reporter_id}, skipping broadcast")
+            await respond(
+                interaction,
+                f"You already reported this player recently, so this {self.report_type_display} report was merged into it.",
+                ephemeral=True,
+                silent=True,
+            )
+            return
+
         embed = self.create_report_embed(interaction, report_data)
-        server_settings = DatabaseManager.get_server_settings()
-        await send_to_report_channels(self.bot, server_settings, embed)
+        try:
+            server_settings = await asyncio.to_thread(DatabaseManager.get_server_settings)
+        except (DatabaseUnavailableError, DeadlineExceededError):
+            logger.warning("Skipping report broadcast, server settings are unavailable")
+            server_settings = None
+        if server_settings:
+            await send_to_report_channels(self.bot, server_settings, embed)
+
+        if result == ReportResult.SPOOLED:
+            logger.info("Report spooled locally until the database is reachable")
+            await respond(
+                interaction,
+                f"{self.report_type_display} report has been submitted. The database is unreachable right now, so it will be saved once it is back.",
+                ephemeral=True,
+                silent=True,
+            )
+            return
 
         logger.info("Report submitted successfully")
-        await interaction.response.send_message(
+        await respond(
+            interaction,
             f"{self.report_type_display} report has been submitted successfully.",
             ephemeral=True,
             silent=True,
@@ -145,7 +191,7 @@ class ReportModal(discord.ui.Modal):
     ) -> discord.Embed:
         embed = await create_already_verified_embed(interaction, self.bot, verified_status)
 
-        last_known_game_name = verified_status["tarkov_game_names"][-1] if verified_status["tarkov_game_names"] else "Unknown"
+        last_known_game_name = verified_status["tarkov_game_name"] or "Unknown"
         twitch_name = verified_status["twitch_name"]
 
         verifier_mentions = await self.get_verifier_mentions(verified_status)
@@ -1,13 +1,16 @@
+import asyncio
 import logging
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from typing import Dict, List, Optional
 
 import discord
 from discord import app_commands
 from discord.ext import commands
 
+from db.cache import entity_cache
 from db.database import REPORT_TYPE_DISPLAY, DatabaseManager, ReportType
 from helpers import checks
+from helpers.deferral import auto_defer, latest_autocomplete, respond
 from helpers.pagination import Pagination
 from helpers.utils import get_user_mention
 
@@ -20,6 +23,15 @@ class CheaterReport:
     total_reports: int
     last_reported_by: int
     last_report_time: int
+    most_reported_by: Optional[int] = None
+    most_reported_count: int = 0
+
+
+@dataclass
+class ArchivedReport:
+    report_type: ReportType
+    total_reports: int
+    last_report_time: int
 
 
 @dataclass
@@ -42,41 +54,34 @@ class CheaterDetails:
     name: str
     reports: Dict[ReportType, CheaterReport]
     top_reported_servers: List[ServerReport]
-    notes: List[CheaterNote]
+    note_count: int
+    archived_reports: Dict[ReportType, ArchivedReport] = field(default_factory=dict)
+    archived_note_count: int = 0
     last_report_type: Optional[ReportType] = None
     last_reported_time: int = 0
     last_reported_by: Optional[int] = None
+    main_embed: Optional[discord.Embed] = field(default=None, repr=False)
 
 
 class ReportDetails(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
 
+    @latest_autocomplete
     async def cheater_autocomplete(self, interaction: discord.Interaction, current: str) -> list[app_commands.Choice[str]]:
         logger.debug(f"Cheater autocomplete called with current: {current}")
-        cheaters = DatabaseManager.get_all_cheaters()
+        cheaters = await asyncio.to_thread(DatabaseManager.get_all_cheaters) or []
         logger.debug(f"Retrieved {len(cheaters)} cheaters from database")
 
-        latest_cheaters = self.get_latest_cheaters(cheaters)
-        logger.debug(f"Filtered to {len(latest_cheaters)} latest cheaters")
-
-        choices = self.create_autocomplete_choices(latest_cheaters, current)
+        choices = self.create_autocomplete_choices(cheaters, current)
         logger.debug(f"Returning {len(choices)} autocomplete choices")
         return choices[:25]
 
-    def get_latest_cheaters(self, cheaters: List[Dict]) -> Dict[int, Dict]:
-        latest_cheaters = {}
-        for cheater in cheaters:
-            cheater_id = cheater["id"]
-            if cheater_id not in latest_cheaters or cheater["report_time"] > latest_cheaters[cheater_id]["report_time"]:
-                latest_cheaters[cheater_id] = cheater
-        return latest_cheaters
-
-    def create_autocomplete_choices(self, latest_cheaters: Dict[int, Dict], current: str) -> List[app_commands.Choice[str]]:
+    def create_autocomplete_choices(self, cheaters: List[Dict], current: str) -> List[app_commands.Choice[str]]:
         return [
             app_commands.Choice(name=f"{cheater['name']} ({cheater['id']})", value=str(cheater["id"]))
-            for cheater in latest_cheaters.values()
-            if current.lower() in str(cheater["id"]).lower() or current.lower() in cheater["name"].lower()
+            for cheater in cheaters
+            if current.lower() in str(cheater["id"]).lower() or current.lower() in (cheater["name"] or "").lower()
         ]
 
     @app_commands.command(
@@ -84,6 +89,7 @@ class ReportDetails(commands.Cog):
         description="Get detailed information about a suspected cheater",
     )
     @app_commands.autocomplete(cheater=cheater_autocomplete)
+    @auto_defer(ephemeral=True)
     async def get_cheater_details(self, interaction: discord.Interaction, cheater: str):
         logger.debug(f"get_reported_details called with cheater: {cheater}")
 
@@ -98,13 +104,13 @@ class ReportDetails(commands.Cog):
         if not cheater_details:
             return
 
-        embeds = await self.create_embeds(cheater_details)
-        await self.display_pagination(interaction, embeds)
+        await self.display_pagination(interaction, cheater_details)
 
     async def check_guild_configuration(self, interaction: discord.Interaction) -> bool:
         if not checks.is_guild_id_configured(interaction.guild.id):
             logger.debug(f"Guild {interaction.guild.id} not configured")
-            await interaction.response.send_message(
+            await respond(
+                interaction,
                 "Please configure the server with `/set_reporting_channel` first.",
                 ephemeral=True,
             )
@@ -116,16 +122,22 @@ class ReportDetails(commands.Cog):
             return int(cheater)
         except ValueError:
             logger.debug(f"Invalid cheater ID format: {cheater}")
-            await interaction.response.send_message("Invalid cheater ID format.", ephemeral=True)
+            await respond(interaction, "Invalid cheater ID format.", ephemeral=True)
             return None
 
     async def fetch_cheater_details(self, interaction: discord.Interaction, cheater_id: int) -> Optional[CheaterDetails]:
+        version = entity_cache.version(cheater_id)
+        cached = entity_cache.get("cheater", cheater_id)
+        if cached is not None:
+            logger.debug(f"Serving cached cheater details for ID: {cheater_id}")
+            return cached
+
         logger.debug(f"Fetching comprehensive cheater details for ID: {cheater_id}")
-        details = DatabaseManager.get_comprehensive_cheater_details(cheater_id)
+        details = await asyncio.to_thread(DatabaseManager.get_comprehensive_cheater_details, cheater_id)
 
         if not details:
             logger.debug(f"No details found for cheater ID: {cheater_id}")
-            await interaction.response.send_message("Cheater not found.", ephemeral=True)
+            await respond(interaction, "Cheater not found.", ephemeral=True)
             return None
 
         reports = {}
@@ -133,6 +145,7 @@ class ReportDetails(commands.Cog):
             total_reports_key = f"total_{report_type.name.lower()}_reports"
             last_reported_by_key = f"last_{report_type.name.lower()}_reported_by"
             last_report_time_key = f"last_{report_type.name.lower()}_report_time"
+            most_reported_by = details.get(f"most_{report_type.name.lower()}_reported_by")
 
             if details.get(total_reports_key, 0) > 0:
                 reports[report_type] = CheaterReport(
@@ -140,6 +153,8 @@ class ReportDetails(commands.Cog):
                     total_reports=details[total_reports_key],
                     last_reported_by=details[last_reported_by_key],
                     last_report_time=details[last_report_time_key],
+                    most_reported_by=most_reported_by["user_id"] if most_reported_by else None,
+                    most_reported_count=most_reported_by["count"] if most_reported_by else 0,
                 )
 
         top_reported_servers = [
@@ -155,26 +170,45 @@ class ReportDetails(commands.Cog):
             for server_info in details.get("top_reported_servers", [])[:3]
         ]
 
-        notes = [
-            CheaterNote(verifier_user_id=note["verifier_user_id"], timestamp=note["timestamp"], content=note["content"])
-            for note in details.get("notes", [])
-        ]
-
-        return CheaterDetails(
-            id=details["id"], name=details["name"], reports=reports, top_reported_servers=top_reported_servers, notes=notes
+        archived_reports = {
+            ReportType[name]: ArchivedReport(
+                report_type=ReportType[name], total_reports=archived["total"], last_report_time=archived["last_report_time"]
+            )
+            for name, archived in details.get("archived_reports", {}).items()
+        }
+
+        cheater_details = CheaterDetails(
+            id=details["id"],
+            name=details["name"],
+            reports=reports,
+            top_reported_servers=top_reported_servers,
+            note_count=details.get("note_count", 0),
+            archived_reports=archived_reports,
+            archived_note_count=details.get("archived_note_count", 0),
         )
-
-    async def create_embeds(self, cheater_details: CheaterDetails) -> List[discord.Embed]:
-        embeds = []
-        main_embed = await self.create_main_embed(cheater_details)
-        embeds.append(main_embed)
-
-        for note in cheater_details.notes:
-            note_embed = await self.create_note_embed(note)
-            embeds.append(note_embed)
-
-        logger.debug(f"Created {len(embeds)} embeds")
-        return embeds
+        entity_cache.set("cheater", cheater_id, cheater_details, version)
+        return cheater_details
+
+    async def create_page(self, details: CheaterDetails, page: int) -> discord.Embed:
+        if page == 1:
+            # Rendered once per cached details object and reused until the profile changes
+            if details.main_embed is None:
+                details.main_embed = await self.create_main_embed(details)
+            return details.main_embed
+
+        # Notes are fetched one at a time as the user pages, newest first, followed by notes on archived reports
+        index = page - 2
+        if index < details.note_count:
+            title = "Report Note"
+            note = await asyncio.to_thread(DatabaseManager.get_cheater_note, details.id, index, details.note_count)
+        else:
+            title = "Archived Report Note"
+            note = await asyncio.to_thread(
+                DatabaseManager.get_archived_cheater_note, details.id, index - details.note_count, details.archived_note_count
+            )
+        if not note:
+            return discord.Embed(title=title, description="This note is no longer available.", color=discord.Color.blue())
+        return await self.create_note_embed(CheaterNote(**note), title)
 
     async def create_main_embed(self, details: CheaterDetails) -> discord.Embed:
         main_embed = discord.Embed(
@@ -205,9 +239,11 @@ class ReportDetails(commands.Cog):
         report_details = []
         for report in details.reports.values():
             last_reported_mention = await get_user_mention(report.last_reported_by)
-            report_details.append(
-                f"`{REPORT_TYPE_DISPLAY[report.report_type]}` has `{report.total_reports}` report(s). Last by {last_reported_mention} <t:{report.last_report_time}:R>"
-            )
+            line = f"`{REPORT_TYPE_DISPLAY[report.report_type]}` has `{report.total_reports}` report(s). Last by {last_reported_mention} <t:{report.last_report_time}:R>"
+            if report.most_reported_by and report.most_reported_count > 1:
+                most_reported_mention = await get_user_mention(report.most_reported_by)
+                line += f", most by {most_reported_mention} (`{report.most_reported_count}`)"
+            report_details.append(line)
 
         if report_details:
             main_embed.add_field(
@@ -224,11 +260,22 @@ class ReportDetails(commands.Cog):
                 inline=False,
             )
 
+        if details.archived_reports:
+            archived_details = [
+                f"`{REPORT_TYPE_DISPLAY[archived.report_type]}` has `{archived.total_reports}` archived report(s). Last <t:{archived.last_report_time}:R>"
+                for archived in details.archived_reports.values()
+            ]
+            main_embed.add_field(
+                name="Archived History",
+                value="\n".join(archived_details),
+                inline=False,
+            )
+
         return main_embed
 
-    async def create_note_embed(self, note: CheaterNote) -> discord.Embed:
+    async def create_note_embed(self, note: CheaterNote, title: str = "Report Note") -> discord.Embed:
         note_embed = discord.Embed(
-            title="Report Note",
+            title=title,
             color=discord.Color.blue(),
         )
         verifier_mention = await get_user_mention(note.verifier_user_id)
@@ -244,9 +291,9 @@ class ReportDetails(commands.Cog):
         )
         return note_embed
 
-    async def display_pagination(self, interaction: discord.Interaction, embeds: List[discord.Embed]):
+    async def display_pagination(self, interaction: discord.Interaction, details: CheaterDetails):
         async def get_page(page):
-            return embeds[page - 1], len(embeds)
+            return await self.create_page(details, page), details.note_count + details.archived_note_count + 1
 
         logger.debug("Creating pagination view")
         view = Pagination(interaction, get_page, timeout=120, delete_on_timeout=True, ephemeral=True)
@@ -6,6 +6,8 @@ from discord import app_commands
 from discord.ext import commands
 
 from db.database import DatabaseManager
+from helpers.broadcast import prepare_channel
+from helpers.deferral import respond
 
 logger = logging.getLogger("command")
 
@@ -26,6 +28,8 @@ class SetReportingChannel(commands.Cog):
     )
     @app_commands.checks.has_permissions(administrator=True)
     async def set_channel(self, interaction: discord.Interaction, channel: discord.TextChannel):
+        # Setting up the broadcast webhook takes several Discord round trips
+        await interaction.response.defer(ephemeral=True, thinking=True)
         guild = interaction.guild
         settings = ServerSettings(server_id=guild.id, channel_id=channel.id)
 
@@ -41,18 +45,46 @@ class SetReportingChannel(commands.Cog):
             DatabaseManager.add_guild_server_settings(server_id=settings.server_id, channel_id=settings.channel_id)
             message = f"Reporting channel for server `{interaction.guild.name}` set to {interaction.guild.get_channel(settings.channel_id).mention}"
 
+        if not await prepare_channel(interaction.guild.get_channel(settings.channel_id)):
+            message += "\nI could not create a webhook there, so reports will be posted by the bot. Grant **Manage Webhooks** and run this again to fix it."
+
+        await respond(interaction, message, ephemeral=True)
+
+    @app_commands.command(
+        name="set_report_digest",
+        description="Bundle reports into one message every few minutes instead of posting each one immediately.",
+    )
+    @app_commands.describe(minutes="Minutes to collect reports before posting them together (0 posts every report immediately)")
+    @app_commands.checks.has_permissions(administrator=True)
+    async def set_digest(self, interaction: discord.Interaction, minutes: app_commands.Range[int, 0, 60]):
+        if not DatabaseManager.get_server_settings(server_id=interaction.guild_id):
+            await interaction.response.send_message(
+                "Please configure the server with `/set_reporting_channel` first.",
+                ephemeral=True,
+            )
+            return
+
+        DatabaseManager.update_server_digest_interval(server_id=interaction.guild_id, digest_interval=minutes * 60 or None)
+        if minutes:
+            message = f"Reports for server `{interaction.guild.name}` will be posted together every {minutes} minute(s), or sooner once 10 are waiting"
+        else:
+            message = f"Reports for server `{interaction.guild.name}` will be posted immediately"
+
         await interaction.response.send_message(message, ephemeral=True)
 
     @set_channel.error
+    @set_digest.error
     async def set_channel_error(self, interaction: discord.Interaction, error: app_commands.AppCommandError):
         if isinstance(error, app_commands.errors.MissingPermissions):
-            await interaction.response.send_message(
+            await respond(
+                interaction,
                 "You do not have the necessary permissions to use this command.",
                 ephemeral=True,
             )
         else:
             logger.error(f"Error in set_channel command: {error}")
-            await interaction.response.send_message(
+            await respond(
+                interaction,
                 "An error occurred while processing the command. Please try again later.",
                 ephemeral=True,
             )
@@ -0,0 +1,145 @@
+import asyncio
+import logging
+import time
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+
+import discord
+from discord import app_commands
+from discord.ext import commands
+
+from db.breaker import database_breaker
+from db.database import REPORT_TYPE_DISPLAY, DatabaseManager, ReportType, stat_day
+from helpers import checks
+from helpers.deferral import auto_defer, respond
+from helpers.utils import get_user_mention
+
+logger = logging.getLogger("command")
+
+# window -> (label, number of calendar days including today, None for all time)
+STATS_WINDOWS = {
+    "7d": ("Last 7 Days", 7),
+    "30d": ("Last 30 Days", 30),
+    "all": ("All Time", None),
+}
+
+
+@dataclass
+class Statistics:
+    total_reports: int
+    reports_by_type: Dict[ReportType, int]
+    verifications: int
+    top_reporters: List[Dict[str, int]]
+    busiest_day: Optional[Dict[str, int]] = None
+    top_servers: List[Dict[str, int]] = field(default_factory=list)
+
+
+class Stats(commands.Cog):
+    def __init__(self, bot):
+        self.bot = bot
+
+    @app_commands.command(
+        name="stats",
+        description="Show reporting activity for this server or across every server",
+    )
+    @app_commands.choices(
+        scope=[
+            app_commands.Choice(name="This Server", value="server"),
+            app_commands.Choice(name="Global", value="global"),
+        ],
+        window=[app_commands.Choice(name=label, value=key) for key, (label, _) in STATS_WINDOWS.items()],
+    )
+    @auto_defer(ephemeral=False)
+    async def stats(self, interaction: discord.Interaction, scope: str = "server", window: str = "30d"):
+        logger.info(f"stats command called by {interaction.user} with scope: {scope}, window: {window}")
+
+        if not await self.check_guild_configuration(interaction):
+            return
+
+        server_id = interaction.guild.id if scope == "server" else None
+        statistics = await self.fetch_statistics(window, server_id)
+        if statistics is None:
+            await respond(interaction, "Statistics are unavailable right now, please try again later.", ephemeral=True)
+            return
+
+        await respond(interaction, embed=await self.create_embed(interaction, statistics, window, server_id))
+
+    async def check_guild_configuration(self, interaction: discord.Interaction) -> bool:
+        if not checks.is_guild_id_configured(interaction.guild.id):
+            logger.debug(f"Guild {interaction.guild.id} not configured")
+            await respond(
+                interaction,
+                "Please configure the server with `/set_reporting_channel` first.",
+                ephemeral=True,
+            )
+            return False
+        return True
+
+    async def fetch_statistics(self, window: str, server_id: Optional[int]) -> Optional[Statistics]:
+        days = STATS_WINDOWS[window][1]
+        since_day = stat_day(int(time.time())) - (days - 1) * 86400 if days else None
+        stats = await asyncio.to_thread(DatabaseManager.get_statistics, since_day=since_day, server_id=server_id)
+        if stats is None:
+            return None
+
+        return Statistics(
+            total_reports=stats["total_reports"],
+            reports_by_type={ReportType[name]: count for name, count in stats["reports_by_type"].items()},
+            verifications=stats["verifications"],
+            top_reporters=stats["top_reporters"],
+            busiest_day=stats["busiest_day"],
+            top_servers=stats.get("top_servers", []),
+        )
+
+    async def create_embed(
+        self, interaction: discord.Interaction, statistics: Statistics, window: str, server_id: Optional[int]
+    ) -> discord.Embed:
+        scope_display = interaction.guild.name if server_id else "All Servers"
+        embed = discord.Embed(
+            title=f"Statistics for {scope_display} ({STATS_WINDOWS[window][0]})",
+            color=discord.Color.gold(),
+        )
+
+        embed.add_field(name="Reports", value=f"`{statistics.total_reports}`", inline=True)
+        embed.add_field(name="Verifications", value=f"`{statistics.verifications}`", inline=True)
+        if statistics.busiest_day:
+            embed.add_field(
+                name="Busiest Day",
+                value=f"<t:{statistics.busiest_day['day']}:D> with `{statistics.busiest_day['count']}` report(s)",
+                inline=True,
+            )
+
+        if statistics.reports_by_type:
+            type_lines = [
+                f"`{REPORT_TYPE_DISPLAY[report_type]}`: `{count}`"
+                for report_type, count in sorted(statistics.reports_by_type.items(), key=lambda item: item[1], reverse=True)
+            ]
+            embed.add_field(name="Reports by Type", value="\n".join(type_lines), inline=False)
+
+        if statistics.top_reporters:
+            leaderboard = [
+                f"**{rank}.** {await get_user_mention(reporter['user_id'])} `{reporter['count']}` report(s)"
+                for rank, reporter in enumerate(statistics.top_reporters, start=1)
+            ]
+            embed.add_field(name="Top Reporters", value="\n".join(leaderboard), inline=False)
+
+        if statistics.top_servers:
+            server_lines = []
+            for server in statistics.top_servers:
+                guild = self.bot.get_guild(server["server_id"])
+                server_name = guild.name if guild else f"Unknown Server ({server['server_id']})"
+                server_lines.append(f"`{server_name}`: `{server['count']}` report(s)")
+            embed.add_field(name="Top Reporting Servers", value="\n".join(server_lines), inline=False)
+
+        if not statistics.total_reports and not statistics.verifications:
+            embed.description = "No activity recorded in this period."
+
+        breaker = database_breaker.metrics()
+        embed.set_footer(
+            text=f"Database circuit {breaker['state']}: {breaker['trips']} trip(s), {breaker['rejected']} fast failure(s) since startup"
+        )
+        return embed
+
+
+async def setup(bot):
+    await bot.add_cog(Stats(bot))
@@ -1,14 +1,16 @@
+import asyncio
 import logging
-from collections import defaultdict
-from dataclasses import dataclass
-from typing import List
+from dataclasses import dataclass, field
+from typing import List, Optional
 
 import discord
 from discord import app_commands
 from discord.ext import commands
 
+from db.cache import entity_cache
 from db.database import DatabaseManager
 from helpers import checks
+from helpers.deferral import auto_defer, latest_autocomplete, respond
 from helpers.pagination import Pagination
 from helpers.utils import get_user_mention
 
@@ -31,28 +33,24 @@ class VerifiedUserDetails:
     tarkov_profile_id: int
     twitch_name: str
     unique_verifiers: List[int]
-    notes: List[VerificationNote]
+    note_count: int
+    main_embed: Optional[discord.Embed] = field(default=None, repr=False)
 
 
 class VerifiedDetails(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
 
+    @latest_autocomplete
     async def verified_autocomplete(self, interaction: discord.Interaction, current: str) -> list[app_commands.Choice[str]]:
         logger.debug(f"Verified autocomplete called with current: {current}")
-        verified_users = DatabaseManager.get_all_verified_users()
+        verified_users = await asyncio.to_thread(DatabaseManager.get_verified_players) or []
         logger.debug(f"Retrieved {len(verified_users)} verified users from database")
 
-        latest_verifications = defaultdict(lambda: {"verified_time": 0})
-        for user in verified_users:
-            profile_id = user["tarkov_profile_id"]
-            if user["verified_time"] > latest_verifications[profile_id]["verified_time"]:
-                latest_verifications[profile_id] = user
-
         choices = [
             app_commands.Choice(name=f"{user['tarkov_game_name']} ({user['tarkov_profile_id']})", value=str(user["tarkov_profile_id"]))
-            for user in latest_verifications.values()
-            if current.lower() in str(user["tarkov_profile_id"]).lower() or current.lower() in user["tarkov_game_name"].lower()
+            for user in verified_users
+            if current.lower() in str(user["tarkov_profile_id"]).lower() or current.lower() in (user["tarkov_game_name"] or "").lower()
         ]
 
         logger.debug(f"Returning {len(choices)} autocomplete choices")
@@ -63,6 +61,7 @@ class VerifiedDetails(commands.Cog):
         description="Get detailed information about a verified user",
     )
     @app_commands.autocomplete(verified_user=verified_autocomplete)
+    @auto_defer(ephemeral=True)
     async def get_verified_details(self, interaction: discord.Interaction, verified_user: str):
         logger.debug(f"get_verified_details called with user: {verified_user}")
 
@@ -77,13 +76,13 @@ class VerifiedDetails(commands.Cog):
         if not verified_details:
             return
 
-        embeds = await self.create_embeds(verified_details)
-        await self.display_pagination(interaction, embeds)
+        await self.display_pagination(interaction, verified_details)
 
     async def check_guild_configuration(self, interaction: discord.Interaction) -> bool:
         if not checks.is_guild_id_configured(interaction.guild.id):
             logger.debug(f"Guild {interaction.guild.id} not configured")
-            await interaction.response.send_message(
+            await respond(
+                interaction,
                 "Please configure the server with `/set_reporting_channel` and the channels id.",
                 ephemeral=True,
             )
@@ -96,45 +95,48 @@ class VerifiedDetails(commands.Cog):
             return int(verified_user)
         except ValueError:
             logger.debug(f"Invalid verified user ID format: {verified_user}")
-            await interaction.response.send_message("Invalid verified user ID format.", ephemeral=True)
+            await respond(interaction, "Invalid verified user ID format.", ephemeral=True)
             return None
 
     async def fetch_verified_details(self, interaction: discord.Interaction, verified_user_id: int) -> VerifiedUserDetails:
+        version = entity_cache.version(verified_user_id)
+        cached = entity_cache.get("verified", verified_user_id)
+        if cached is not None:
+            logger.debug(f"Serving cached verified user details for ID: {verified_user_id}")
+            return cached
+
         logger.debug(f"Fetching comprehensive verified user details for ID: {verified_user_id}")
-        details = DatabaseManager.get_comprehensive_verified_details(verified_user_id)
+        details = await asyncio.to_thread(DatabaseManager.get_comprehensive_verified_details, verified_user_id)
 
         if not details:
             logger.debug(f"No details found for verified user ID: {verified_user_id}")
-            await interaction.response.send_message("Verified user not found.", ephemeral=True)
+            await respond(interaction, "Verified user not found.", ephemeral=True)
             return None
 
-        # The first verification in all_verifications is the latest one
-        latest_verification = details["tarkov_game_name"]  # This is already the latest name
-
-        return VerifiedUserDetails(
+        verified_details = VerifiedUserDetails(
             verifier_user_id=details["verifier_user_id"],
             verification_count=details["verification_count"],
             first_verified_time=details["first_verified_time"],
-            latest_tarkov_game_name=latest_verification,
+            latest_tarkov_game_name=details["tarkov_game_name"],
             tarkov_profile_id=details["tarkov_profile_id"],
             twitch_name=details.get("twitch_name"),
             unique_verifiers=details["unique_verifiers"],  # Add this line
-            notes=[VerificationNote(**note) for note in details["notes"]],
+            note_count=details.get("note_count", 0),
         )
+        entity_cache.set("verified", verified_user_id, verified_details, version)
+        return verified_details
 
-    async def create_embeds(self, verified_details: VerifiedUserDetails) -> List[discord.Embed]:
-        logger.debug("Creating embeds")
-        embeds = []
-
-        main_embed = await self.create_main_embed(verified_details)
-        embeds.append(main_embed)
-
-        for note in verified_details.notes:
-            note_embed = await self.create_note_embed(note)
-            embeds.append(note_embed)
+    async def create_page(self, details: VerifiedUserDetails, page: int) -> discord.Embed:
+        if page == 1:
+            if details.main_embed is None:
+                details.main_embed = await self.create_main_embed(details)
+            return details.main_embed
 
-        logger.debug(f"Created {len(embeds)} embeds")
-        return embeds
+        # Notes are fetched one at a time as the user pages, newest first
+        note = await asyncio.to_thread(DatabaseManager.get_verified_note, details.tarkov_profile_id, page - 2, details.note_count)
+        if not note:
+            return discord.Embed(title="Verification Note", description="This note is no longer available.", color=discord.Color.blue())
+        return await self.create_note_embed(VerificationNote(**note))
 
     async def create_main_embed(self, details: VerifiedUserDetails) -> discord.Embed:
         main_embed = discord.Embed(
@@ -191,9 +193,9 @@ class VerifiedDetails(commands.Cog):
         )
         return note_embed
 
-    async def display_pagination(self, interaction: discord.Interaction, embeds: List[discord.Embed]):
+    async def display_pagination(self, interaction: discord.Interaction, details: VerifiedUserDetails):
         async def get_page(page):
-            return embeds[page - 1], len(embeds)
+            return await self.create_page(details, page), details.note_count + 1
 
         logger.debug("Creating pagination view")
         view = Pagination(interaction, get_page, timeout=120, delete_on_timeout=True, ephemeral=True)
@@ -1,3 +1,4 @@
+import asyncio
 import logging
 import time
 from dataclasses import dataclass
@@ -6,10 +7,13 @@ import discord
 from discord import app_commands
 from discord.ext import commands
 
-from db.database import DatabaseManager
+from db.database import DatabaseManager, DatabaseUnavailableError, DeadlineExceededError
+from helpers.deferral import auto_defer, respond
 from helpers.utils import (
     create_already_verified_embed,
     is_valid_game_name,
+    send_database_unavailable,
+    send_query_timed_out,
     send_to_report_channels,
 )
 
@@ -76,6 +80,7 @@ class VerifyLegitModal(discord.ui.Modal, title="Verify Player as Legitimate"):
         required=False,
     )
 
+    @auto_defer(ephemeral=True)
     async def on_submit(self, modal_interaction: discord.Interaction):
         logger.debug(f"Verify legit modal submitted by {modal_interaction.user}")
 
@@ -94,6 +99,16 @@ class VerifyLegitModal(discord.ui.Modal, title="Verify Player as Legitimate"):
 
         await self.process_verification(modal_interaction, verification_data)
 
+    async def on_error(self, interaction: discord.Interaction, error: Exception):
+        # Verifying needs the player's current status, so unlike report intake this can't be spooled blind
+        if isinstance(error, DatabaseUnavailableError):
+            await send_database_unavailable(interaction)
+            return
+        if isinstance(error, DeadlineExceededError):
+            await send_query_timed_out(interaction)
+            return
+        await super().on_error(interaction, error)
+
     async def validate_verification(self, interaction: discord.Interaction, verification_data: VerificationData) -> bool:
         logger.debug(f"Validating Tarkov game name: {verification_data.tarkov_game_name}")
         if not is_valid_game_name(verification_data.tarkov_game_name):
@@ -103,14 +118,14 @@ class VerifyLegitModal(discord.ui.Modal, title="Verify Player as Legitimate"):
                 description="Please enter a name between 3 and 15 characters, using only letters, numbers (max 4), underscores '_', and hyphens '-'.",
                 color=discord.Color.red(),
             )
-            await interaction.response.send_message(embed=embed, ephemeral=True)
+            await respond(interaction, embed=embed, ephemeral=True)
             return False
         return True
 
     async def process_verification(self, interaction: discord.Interaction, verification_data: VerificationData):
-        verified_status = DatabaseManager.check_verified_legit_status(verification_data.tarkov_profile_id)
+        verified_status = await asyncio.to_thread(DatabaseManager.check_verified_legit_status, verification_data.tarkov_profile_id)
 
-        if verified_status["is_verified"]:
+        if verified_status and verified_status["is_verified"]:
             await self.handle_already_verified(interaction, verification_data, verified_status)
         else:
             await self.handle_new_verification(interaction, verification_data)
@@ -130,7 +145,8 @@ class VerifyLegitModal(discord.ui.Modal, title="Verify Player as Legitimate"):
             inline=True,
         )
 
-        DatabaseManager.add_verified_legit(
+        await asyncio.to_thread(
+            DatabaseManager.add_verified_legit,
             verifier_user_id=verification_data.verifier_id,
             server_id=verification_data.server_id,
             verified_time=verification_data.verified_time,
@@ -140,7 +156,8 @@ class VerifyLegitModal(discord.ui.Modal, title="Verify Player as Legitimate"):
             notes=verification_data.notes,
         )
 
-        await interaction.response.send_message(
+        await respond(
+            interaction,
             "Thanks for the verification. This player was already verified as legitimate.",
             embed=embed,
             ephemeral=True,
@@ -148,7 +165,8 @@ class VerifyLegitModal(discord.ui.Modal, title="Verify Player as Legitimate"):
 
     async def handle_new_verification(self, interaction: discord.Interaction, verification_data: VerificationData):
         logger.info(f"Verifying player {verification_data.tarkov_game_name} (ID: {verification_data.tarkov_profile_id}) as legitimate")
-        DatabaseManager.add_and_mark_verified_legit(
+        await asyncio.to_thread(
+            DatabaseManager.add_and_mark_verified_legit,
             verifier_user_id=verification_data.verifier_id,
             server_id=verification_data.server_id,
             verified_time=verification_data.verified_time,
@@ -161,11 +179,12 @@ class VerifyLegitModal(discord.ui.Modal, title="Verify Player as Legitimate"):
         embed = self.create_verification_embed(interaction, verification_data)
 
         logger.debug("Fetching server settings for report channel")
-        server_settings = DatabaseManager.get_server_settings()
+        server_settings = await asyncio.to_thread(DatabaseManager.get_server_settings)
         await send_to_report_channels(self.bot, server_settings, embed)
 
         logger.info("Player verification submitted successfully")
-        await interaction.response.send_message(
+        await respond(
+            interaction,
             "Player has been verified as legitimate and all related reports have been absolved.",
             ephemeral=True,
         )
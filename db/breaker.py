@@ -0,0 +1,84 @@
+import logging
+import threading
+import time
+from enum import Enum
+from typing import Any, Dict
+
+import settings
+
+logger = logging.getLogger("database")
+
+
+class BreakerState(Enum):
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half-open"
+
+
+class CircuitBreaker:
+    def __init__(self, failure_threshold: int, reset_timeout: float):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = BreakerState.CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+        self.trips = 0
+        self.rejected = 0
+        # Operations run on the event loop and in worker threads alike
+        self._lock = threading.Lock()
+        self._probing = False
+
+    @property
+    def retry_after(self) -> float:
+        if self.state == BreakerState.CLOSED:
+            return 0.0
+        return max(0.0, self.opened_at + self.reset_timeout - time.monotonic())
+
+    def allow(self) -> bool:
+        with self._lock:
+            if self.state == BreakerState.CLOSED:
+                return True
+            if self.state == BreakerState.OPEN and time.monotonic() - self.opened_at >= self.reset_timeout:
+                self.state = BreakerState.HALF_OPEN
+                logger.info("Database circuit half-open, letting one operation through to probe")
+            if self.state == BreakerState.HALF_OPEN and not self._probing:
+                # A single probe pays the connect timeout; everyone else keeps failing fast until it reports back
+                self._probing = True
+                return True
+            self.rejected += 1
+            return False
+
+    def record_success(self):
+        with self._lock:
+            self._probing = False
+            self.failures = 0
+            if self.state != BreakerState.CLOSED:
+                self.state = BreakerState.CLOSED
+                logger.info("Database circuit closed, database is reachable again")
+
+    def record_failure(self):
+        with self._lock:
+            self._probing = False
+            self.failures += 1
+            if self.state == BreakerState.HALF_OPEN or (
+                self.state == BreakerState.CLOSED and self.failures >= self.failure_threshold
+            ):
+                self.state = BreakerState.OPEN
+                self.opened_at = time.monotonic()
+                self.trips += 1
+                logger.warning(
+                    f"Database circuit opened after {self.failures} consecutive connectivity failure(s), "
+                    f"failing fast for {self.reset_timeout}s"
+                )
+
+    def metrics(self) -> Dict[str, Any]:
+        return {
+            "state": self.state.value,
+            "failures": self.failures,
+            "trips": self.trips,
+            "rejected": self.rejected,
+            "retry_after": round(self.retry_after, 1),
+        }
+
+
+database_breaker = CircuitBreaker(settings.DB_BREAKER_FAILURE_THRESHOLD, settings.DB_BREAKER_RESET_TIMEOUT)
@@ -0,0 +1,143 @@
+import logging
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, FrozenSet, Hashable, Iterable, Optional, Tuple
+
+import settings
+
+logger = logging.getLogger("database")
+
+
+class ResultCache:
+    def __init__(self, ttl: int, keep_stale: bool = False):
+        self.ttl = ttl
+        # Keep expired entries as a fallback for when the database can't be reached; only for small, bounded key spaces
+        self.keep_stale = keep_stale
+        self._entries: Dict[Hashable, Tuple[float, Any, FrozenSet[int]]] = {}
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: Hashable, stale: bool = False) -> Optional[Any]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+
+        expires_at, value, _ = entry
+        if expires_at < time.monotonic():
+            if not self.keep_stale:
+                del self._entries[key]
+                return None
+            if not stale:
+                return None
+        return value
+
+    def set(self, key: Hashable, value: Any, profile_ids: Iterable[int] = ()):
+        self._entries[key] = (time.monotonic() + self.ttl, value, frozenset(profile_ids))
+
+    def invalidate(self, predicate: Callable[[Hashable, FrozenSet[int]], bool]):
+        stale_keys = [key for key, (_, _, profile_ids) in self._entries.items() if predicate(key, profile_ids)]
+        for key in stale_keys:
+            del self._entries[key]
+        if stale_keys:
+            logger.debug(f"Invalidated {len(stale_keys)} cached results")
+
+    def clear(self):
+        self._entries.clear()
+
+
+class RecentReportIndex:
+    def __init__(self, window: int):
+        self.window = window
+        # (reporter_user_id, cheater_profile_id, report_type name, server_id) -> (report id, report_time), oldest first
+        self._entries: "OrderedDict[Tuple[int, int, str, Optional[int]], Tuple[int, int]]" = OrderedDict()
+        # Report writes look entries up from worker threads while cache events update them on the loop
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _prune(self, now: int):
+        while self._entries:
+            key, (_, report_time) = next(iter(self._entries.items()))
+            if report_time >= now - self.window:
+                break
+            del self._entries[key]
+
+    def add(self, key: Tuple[int, int, str, Optional[int]], report_id: int, report_time: int):
+        with self._lock:
+            self._entries[key] = (report_id, report_time)
+            self._entries.move_to_end(key)
+            self._prune(report_time)
+
+    def get(self, key: Tuple[int, int, str, Optional[int]], now: int) -> Optional[int]:
+        with self._lock:
+            self._prune(now)
+            entry = self._entries.get(key)
+        return entry[0] if entry else None
+
+    def discard(self, key: Tuple[int, int, str, Optional[int]]):
+        with self._lock:
+            self._entries.pop(key, None)
+
+
+class EntityCache:
+    def __init__(self, max_entries: int, ttl: int):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        # Bumped on every change to a profile; clear() starts a new generation so in-flight reads can't store stale values
+        self._versions: Dict[int, int] = {}
+        self._generation = 0
+        # (kind, profile_id) -> (version the value was read at, expiry, value), least recently used first
+        self._entries: "OrderedDict[Tuple[str, int], Tuple[Tuple[int, int], float, Any]]" = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def version(self, profile_id: int) -> Tuple[int, int]:
+        return self._generation, self._versions.get(profile_id, 0)
+
+    def bump(self, profile_id: int):
+        self._versions[profile_id] = self._versions.get(profile_id, 0) + 1
+
+    def get(self, kind: str, profile_id: int) -> Optional[Any]:
+        key = (kind, profile_id)
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+
+        version, expires_at, value = entry
+        if version != self.version(profile_id) or expires_at < time.monotonic():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return value
+
+    def set(self, kind: str, profile_id: int, value: Any, version: Tuple[int, int]):
+        # `version` must be taken before the read that produced `value`; a write in between makes it stale on arrival
+        if version != self.version(profile_id):
+            return
+        key = (kind, profile_id)
+        self._entries[key] = (version, time.monotonic() + self.ttl, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def clear(self):
+        self._generation += 1
+        self._versions.clear()
+        self._entries.clear()
+
+
+# Keys are (command, report_type, user filter, server filter, since window); values are the sorted summaries shown by the list commands
+list_cache = ResultCache(ttl=settings.LIST_CACHE_TTL)
+
+# Keys are ("server", server_id) or ("all",); values are get_server_settings results
+settings_cache = ResultCache(ttl=settings.SETTINGS_CACHE_TTL, keep_stale=True)
+
+# Reports still open for merging repeats from the same reporter, fed by local writes and other instances' events
+recent_reports = RecentReportIndex(window=settings.REPORT_COALESCE_WINDOW)
+
+# Assembled cheater/verified details and their rendered main embeds, kept exact by per-profile versions bumped on writes
+entity_cache = EntityCache(max_entries=settings.ENTITY_CACHE_SIZE, ttl=settings.ENTITY_CACHE_TTL)
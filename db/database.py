@@ -1,15 +1,25 @@
+import asyncio
+import json
 import logging
+import time
+import uuid
 from enum import Enum, auto
-from typing import Any, Dict, List, Optional
+from typing import Any, Callable, Dict, List, Optional
 
-from sqlalchemy import BigInteger, Boolean, Column
+from sqlalchemy import JSON, BigInteger, Boolean, Column
 from sqlalchemy import Enum as SQLAlchemyEnum
-from sqlalchemy import Integer, String, Text, create_engine, func
-from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy import ForeignKey, Index, Integer, String, Text, case, create_engine, event, func, insert, literal, or_, select, text, tuple_
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.exc import DBAPIError, IntegrityError, OperationalError, SQLAlchemyError
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 
 import settings
+from db.breaker import database_breaker
+from db.cache import entity_cache, list_cache, recent_reports, settings_cache
+from db.deadline import deadline_at, query_scope, remaining
+from db.snapshot import report_snapshot
+from db.spool import write_spool
 
 logger = logging.getLogger("database")
 
@@ -18,6 +28,9 @@ class ServerSettingsFields(Enum):
     TABLE_NAME = "server_settings"
     SERVER_ID = "server_id"
     CHANNEL_ID = "channel_id"
+    DIGEST_INTERVAL = "digest_interval"
+    WEBHOOK_ID = "webhook_id"
+    WEBHOOK_TOKEN = "webhook_token"
 
 
 class CheaterReportFields(Enum):
@@ -25,12 +38,12 @@ class CheaterReportFields(Enum):
     ID = "id"
     REPORTER_USER_ID = "reporter_user_id"
     SERVER_ID = "server_id"
-    CHEATER_GAME_NAME = "cheater_game_name"
     CHEATER_PROFILE_ID = "cheater_profile_id"
     REPORT_TIME = "report_time"
     REPORT_TYPE = "report_type"
     NOTES = "notes"
     ABSOLVED = "absolved"
+    OCCURRENCES = "occurrences"
 
 
 class VerifiedLegitFields(Enum):
@@ -39,12 +52,22 @@ class VerifiedLegitFields(Enum):
     VERIFIER_USER_ID = "verifier_user_id"
     SERVER_ID = "server_id"
     VERIFIED_TIME = "verified_time"
-    TARKOV_GAME_NAME = "tarkov_game_name"
     TARKOV_PROFILE_ID = "tarkov_profile_id"
     TWITCH_NAME = "twitch_name"
     NOTES = "notes"
 
 
+class PlayerFields(Enum):
+    TABLE_NAME = "players"
+    PROFILE_ID = "profile_id"
+    CURRENT_NAME = "current_name"
+    NAME_HISTORY = "name_history"
+    IS_VERIFIED = "is_verified"
+    REPORT_COUNT = "report_count"
+    VERIFICATION_COUNT = "verification_count"
+    LAST_SEEN_TIME = "last_seen_time"
+
+
 class ReportType(Enum):
     KILLED_BY_CHEATER = auto()
     KILLED_A_CHEATER = auto()
@@ -53,6 +76,12 @@ class ReportType(Enum):
     WORD_OF_MOUTH = auto()
 
 
+class ReportResult(Enum):
+    ADDED = auto()
+    COALESCED = auto()
+    SPOOLED = auto()
+
+
 REPORT_TYPE_DISPLAY = {
     ReportType.KILLED_BY_CHEATER: "Killed by Cheater",
     ReportType.KILLED_A_CHEATER: "Killed a Cheater",
@@ -66,18 +95,86 @@ class DatabaseConnectionError(Exception):
     pass
 
 
-# Create the SQLAlchemy engine with error handling
-try:
-    engine = create_engine(
-        f"postgresql+psycopg2://{settings.DB_USER}:{settings.DB_PASSWORD}@{settings.DB_HOST}:{settings.DB_PORT}/{settings.DB_NAME}",
-        pool_recycle=3600,
-        pool_pre_ping=True,
-        connect_args={"connect_timeout": 10},
-    )
-    logger.info("Database connection established successfully.")
-except SQLAlchemyError as e:
-    logger.error(f"Error connecting to the database: {e}")
-    engine = None
+class DatabaseUnavailableError(DatabaseConnectionError):
+    # Raised without touching the database while the circuit breaker is open
+    pass
+
+
+class DeadlineExceededError(Exception):
+    # Nobody is waiting for the result any more; says nothing about the database's health
+    pass
+
+
+def is_query_cancelled(error: Exception) -> bool:
+    # statement_timeout expiry and pg_cancel_backend both surface as query_canceled
+    return isinstance(error, DBAPIError) and getattr(error.orig, "pgcode", None) == "57014"
+
+
+def is_connectivity_error(error: Exception) -> bool:
+    if isinstance(error, DatabaseConnectionError):
+        return True
+    if isinstance(error, DBAPIError) and error.connection_invalidated:
+        return True
+    if isinstance(error, OperationalError):
+        # Client-side connection failures carry no SQLSTATE; server-side ones are class 08 or an admin shutdown
+        code = getattr(error.orig, "pgcode", None)
+        return code is None or code.startswith("08") or code in ("57P01", "57P02", "57P03")
+    return False
+
+
+# Called with a server id whenever that server's settings change here or on another instance
+settings_listeners: List[Callable[[int], None]] = []
+
+# Writes announce themselves on this channel so every bot process can drop or patch its local caches
+CACHE_EVENT_CHANNEL = "tarkov_cache_events"
+INSTANCE_ID = uuid.uuid4().hex
+
+# The loop that owns the in-process caches; writes running in worker threads hand their cache events back to it
+_cache_loop: Optional[asyncio.AbstractEventLoop] = None
+
+
+def bind_cache_loop(loop: Optional[asyncio.AbstractEventLoop]):
+    global _cache_loop
+    _cache_loop = loop
+
+
+def _off_cache_loop() -> bool:
+    if _cache_loop is None:
+        return False
+    try:
+        return asyncio.get_running_loop() is not _cache_loop
+    except RuntimeError:
+        return True
+
+
+_engine = None
+_session_factory = None
+
+
+def get_engine():
+    global _engine
+    if _engine is None:
+        try:
+            _engine = create_engine(
+                f"postgresql+psycopg2://{settings.DB_USER}:{settings.DB_PASSWORD}@{settings.DB_HOST}:{settings.DB_PORT}/{settings.DB_NAME}",
+                pool_recycle=3600,
+                pool_pre_ping=True,
+                connect_args={"connect_timeout": 10},
+            )
+            logger.info("Database engine created successfully.")
+        except SQLAlchemyError as e:
+            logger.error(f"Error connecting to the database: {e}")
+    return _engine
+
+
+def get_session_factory():
+    global _session_factory
+    if _session_factory is None:
+        engine = get_engine()
+        if engine is not None:
+            _session_factory = sessionmaker(bind=engine)
+    return _session_factory
+
 
 Base = declarative_base()
 
@@ -87,6 +184,20 @@ class ServerSettings(Base):
     __tablename__ = ServerSettingsFields.TABLE_NAME.value
     server_id = Column(BigInteger, primary_key=True)
     channel_id = Column(BigInteger)
+    digest_interval = Column(Integer)
+    webhook_id = Column(BigInteger)
+    webhook_token = Column(String(255))
+
+
+class Player(Base):
+    __tablename__ = PlayerFields.TABLE_NAME.value
+    profile_id = Column(BigInteger, primary_key=True)
+    current_name = Column(String(255))
+    name_history = Column(JSON, nullable=False, default=list)  # Distinct names in the order they were first seen
+    is_verified = Column(Boolean, nullable=False, default=False, server_default="false")
+    report_count = Column(Integer, nullable=False, default=0, server_default="0")
+    verification_count = Column(Integer, nullable=False, default=0, server_default="0")
+    last_seen_time = Column(BigInteger)
 
 
 class CheaterReport(Base):
@@ -94,12 +205,21 @@ class CheaterReport(Base):
     id = Column(Integer, primary_key=True, autoincrement=True)
     reporter_user_id = Column(BigInteger)
     server_id = Column(BigInteger)
-    cheater_game_name = Column(String(255))
-    cheater_profile_id = Column(BigInteger)
-    report_time = Column(BigInteger)
+    cheater_profile_id = Column(BigInteger, ForeignKey(Player.profile_id))
+    # Partitioned by month on report_time, which Postgres requires to be part of the primary key
+    report_time = Column(BigInteger, primary_key=True)
     report_type = Column(SQLAlchemyEnum(ReportType, create_type=True))
     notes = Column(Text)
     absolved = Column(Boolean, default=False)
+    occurrences = Column(Integer, nullable=False, default=1, server_default="1")
+
+    __table_args__ = (
+        Index("ix_cheater_reports_profile_reporter_type", "cheater_profile_id", "reporter_user_id", "report_type"),
+        Index("ix_cheater_reports_notes", "cheater_profile_id", "report_time", "id", postgresql_where=notes.isnot(None)),
+        Index("ix_cheater_reports_time", "report_time"),
+        Index("ix_cheater_reports_server_time", "server_id", "report_time"),
+        {"postgresql_partition_by": "RANGE (report_time)"},
+    )
 
 
 class VerifiedLegit(Base):
@@ -108,41 +228,282 @@ class VerifiedLegit(Base):
     verifier_user_id = Column(BigInteger)
     server_id = Column(BigInteger)
     verified_time = Column(BigInteger)
-    tarkov_game_name = Column(String(255))
-    tarkov_profile_id = Column(BigInteger)
+    tarkov_profile_id = Column(BigInteger, ForeignKey(Player.profile_id))
     twitch_name = Column(String(255))
     notes = Column(Text)
 
+    __table_args__ = (Index("ix_verified_legit_notes", "tarkov_profile_id", "verified_time", "id", postgresql_where=notes.isnot(None)),)
 
-# Create tables
-if engine:
-    try:
-        Base.metadata.create_all(engine)
-        logger.info("Database schema created successfully.")
-    except SQLAlchemyError as e:
-        logger.error(f"Error creating database schema: {e}")
 
-# Create session factory
-Session = sessionmaker(bind=engine) if engine else None
+class ArchivedCheaterReport(Base):
+    # Cold storage for absolved and aged-out reports; same columns as cheater_reports plus when the row was moved
+    __tablename__ = "cheater_reports_archive"
+    id = Column(Integer, primary_key=True)
+    reporter_user_id = Column(BigInteger)
+    server_id = Column(BigInteger)
+    cheater_profile_id = Column(BigInteger)
+    report_time = Column(BigInteger)
+    report_type = Column(SQLAlchemyEnum(ReportType, create_type=True))
+    notes = Column(Text)
+    absolved = Column(Boolean, default=False)
+    occurrences = Column(Integer, nullable=False, default=1, server_default="1")
+    archived_time = Column(BigInteger, nullable=False)
+
+    __table_args__ = (Index("ix_cheater_reports_archive_profile", "cheater_profile_id", "report_time"),)
+
+
+# Daily rollups maintained alongside every write so statistics never scan the report tables.
+# `day` is the UTC midnight of the event as a unix timestamp.
+def stat_day(timestamp: int) -> int:
+    return timestamp - timestamp % 86400
+
+
+class ReportDailyStat(Base):
+    __tablename__ = "report_daily_stats"
+    day = Column(BigInteger, primary_key=True)
+    server_id = Column(BigInteger, primary_key=True)
+    report_type = Column(SQLAlchemyEnum(ReportType, create_type=True), primary_key=True)
+    count = Column(Integer, nullable=False, default=0)
+
+    __table_args__ = (Index("ix_report_daily_stats_server_day", "server_id", "day"),)
+
+
+class ReporterDailyStat(Base):
+    __tablename__ = "reporter_daily_stats"
+    day = Column(BigInteger, primary_key=True)
+    server_id = Column(BigInteger, primary_key=True)
+    reporter_user_id = Column(BigInteger, primary_key=True)
+    count = Column(Integer, nullable=False, default=0)
+
+    __table_args__ = (Index("ix_reporter_daily_stats_server_day", "server_id", "day"),)
+
+
+class VerificationDailyStat(Base):
+    __tablename__ = "verification_daily_stats"
+    day = Column(BigInteger, primary_key=True)
+    server_id = Column(BigInteger, primary_key=True)
+    count = Column(Integer, nullable=False, default=0)
+
+
+class AppliedWrite(Base):
+    # Ids of spoolable writes that committed, recorded in the same transaction, so a replay can tell the write already landed
+    __tablename__ = "applied_writes"
+    write_id = Column(String(32), primary_key=True)
+    applied_time = Column(BigInteger, nullable=False)
+
+    __table_args__ = (Index("ix_applied_writes_time", "applied_time"),)
+
+
+class SchemaVersion(Base):
+    __tablename__ = "schema_version"
+    id = Column(Integer, primary_key=True)
+    version = Column(Integer, nullable=False)
 
 
 class DatabaseManager:
     @staticmethod
     def _get_session():
-        if Session is None:
+        session_factory = get_session_factory()
+        if session_factory is None:
             raise DatabaseConnectionError("Database connection is not available")
-        return Session()
+        return session_factory()
 
     @staticmethod
-    def _execute_db_operation(operation):
+    def _apply_deadline(session, time_left: Optional[float]):
+        scope = query_scope.get()
+        if time_left is None and scope is None:
+            return None
+        if session.get_bind().dialect.name != "postgresql":
+            return None
+        if time_left is not None:
+            # SET can't take bind parameters; the value is always an int we computed
+            session.execute(text(f"SET LOCAL statement_timeout = {max(1, int(time_left * 1000))}"))
+        if scope is None:
+            return None
+        if not scope.attach(session.connection().connection.dbapi_connection):
+            scope.detach()
+            raise DeadlineExceededError("Query was superseded before it started")
+
+        def release_connection(_session):
+            # The connection goes back to the pool on commit, so stop pointing cancels at it
+            scope.detach()
+
+        event.listen(session, "after_commit", release_connection)
+        return scope
+
+    @staticmethod
+    def _run_operation(operation):
+        time_left = remaining()
+        if time_left is not None and time_left <= 0:
+            raise DeadlineExceededError("Interaction deadline passed before the query started")
+        if not database_breaker.allow():
+            raise DatabaseUnavailableError(f"Database circuit is open, retrying in {database_breaker.retry_after:.0f}s")
         try:
             with DatabaseManager._get_session() as session:
-                return operation(session)
+                scope = DatabaseManager._apply_deadline(session, time_left)
+                try:
+                    result = operation(session)
+                finally:
+                    if scope is not None:
+                        scope.detach()
+        except Exception as e:
+            # Only connectivity failures count against the database; any other error means it answered
+            if is_connectivity_error(e):
+                database_breaker.record_failure()
+            else:
+                database_breaker.record_success()
+            raise
+        database_breaker.record_success()
+        return result
+
+    @staticmethod
+    def _execute_db_operation(operation):
+        try:
+            return DatabaseManager._run_operation(operation)
+        except (DatabaseUnavailableError, DeadlineExceededError):
+            raise
         except DatabaseConnectionError as e:
             logger.error(f"Database connection error: {e}")
         except SQLAlchemyError as e:
+            if is_query_cancelled(e):
+                # A None result would read as "not found", so let the caller tell the user it timed out
+                logger.warning(f"Database query cancelled at its deadline: {e.orig}")
+                raise DeadlineExceededError("Query was cancelled at the interaction's deadline") from e
             logger.error(f"Database operation error: {e}")
 
+    @classmethod
+    def _execute_spooled_write(cls, name: str, payload: Dict[str, Any], operation, replay: bool = False):
+        # Writes must land even after the user gave up waiting, so they never inherit a deadline
+        with deadline_at(None):
+            return cls._execute_spooled_write_now(name, payload, operation, replay)
+
+    @classmethod
+    def _execute_spooled_write_now(cls, name: str, payload: Dict[str, Any], operation, replay: bool):
+        if replay:
+            # The replayer decides between retrying and dead-lettering, so it needs the actual error
+            return cls._run_operation(operation)
+        if len(write_spool):
+            # Older writes are still waiting; queue behind them so they are applied in the order they happened
+            write_spool.append(name, payload)
+            return ReportResult.SPOOLED
+        try:
+            return cls._run_operation(operation)
+        except (DatabaseConnectionError, SQLAlchemyError) as e:
+            if not is_connectivity_error(e):
+                logger.error(f"Database operation error: {e}")
+                return None
+            logger.error(f"Database unreachable, spooling {name}: {e}")
+            write_spool.append(name, payload)
+            return ReportResult.SPOOLED
+
+    @classmethod
+    def replay_spooled_writes(cls, limit: int = 100) -> Optional[int]:
+        replayers = {
+            "add_cheater_report": cls.add_cheater_report,
+            "add_verified_legit": cls.add_verified_legit,
+            "mark_cheater_reports_as_absolved": cls.mark_cheater_reports_as_absolved,
+        }
+        replayed = 0
+        for seq, name, payload in write_spool.peek(limit):
+            if name not in replayers:
+                logger.error(f"Dead-lettering spooled write {seq} with unknown operation '{name}'")
+                write_spool.dead_letter(seq, f"Unknown operation '{name}'")
+                continue
+            try:
+                replayers[name](**payload, replay=True)
+            except Exception as e:
+                if is_connectivity_error(e):
+                    # Still unreachable; keep it and everything after it for the next pass
+                    return replayed
+                # Postgres answered and rejected it, so retrying would fail the same way forever
+                logger.error(f"Dead-lettering spooled write {seq} ({name}) after a permanent failure: {e}")
+                write_spool.dead_letter(seq, str(e))
+                continue
+            write_spool.remove(seq)
+            replayed += 1
+        return replayed
+
+    # Cache Events
+    @staticmethod
+    def _notify(session, event: str, **payload):
+        # pg_notify is transactional: other instances only hear about the write once it has committed
+        session.execute(
+            text("SELECT pg_notify(:channel, :payload)"),
+            {"channel": CACHE_EVENT_CHANNEL, "payload": json.dumps({"origin": INSTANCE_ID, "event": event, **payload})},
+        )
+
+    @classmethod
+    def _commit_with_event(cls, session, event: str, **payload):
+        cls._notify(session, event, **payload)
+        session.commit()
+        if _off_cache_loop():
+            # Scheduled ahead of the to_thread result, so the awaiting handler resumes with the caches already updated
+            _cache_loop.call_soon_threadsafe(cls.apply_cache_event, event, payload)
+        else:
+            cls.apply_cache_event(event, payload)
+
+    @staticmethod
+    def apply_cache_event(event: str, payload: Dict[str, Any]):
+        if event == "report_added":
+            entity_cache.bump(payload["cheater_profile_id"])
+            recent_reports.add(
+                (payload["reporter_user_id"], payload["cheater_profile_id"], payload["report_type"], payload["server_id"]),
+                payload["id"],
+                payload["report_time"],
+            )
+            list_cache.invalidate(
+                lambda key, _: key[0] == "list_reports"
+                and key[1] in ("All", payload["report_type"])
+                and key[2] in (None, str(payload["reporter_user_id"]))
+                and key[3] in (None, payload["server_id"])
+            )
+            report_snapshot.append(
+                (
+                    payload["cheater_profile_id"],
+                    payload["reporter_user_id"],
+                    payload["server_id"],
+                    ReportType[payload["report_type"]].value,
+                    payload["report_time"],
+                    payload["absolved"],
+                )
+            )
+            report_snapshot.rename(payload["cheater_profile_id"], payload["cheater_game_name"])
+            if payload.get("renamed"):
+                list_cache.invalidate(lambda key, profile_ids: payload["cheater_profile_id"] in profile_ids)
+        elif event == "report_coalesced":
+            entity_cache.bump(payload["cheater_profile_id"])
+            # Summaries count distinct reports, so merging into an existing one only matters when the name changed
+            if payload.get("renamed"):
+                report_snapshot.rename(payload["cheater_profile_id"], payload["cheater_game_name"])
+                list_cache.invalidate(lambda key, profile_ids: payload["cheater_profile_id"] in profile_ids)
+        elif event == "reports_absolved":
+            entity_cache.bump(payload["profile_id"])
+            list_cache.invalidate(lambda key, profile_ids: key[0] == "list_reports" and payload["profile_id"] in profile_ids)
+            report_snapshot.absolve(payload["profile_id"])
+        elif event == "reports_archived":
+            if payload["moved"]:
+                entity_cache.clear()
+            # Absolved rows are already out of every summary; only aged-out active reports change the lists
+            if payload["older_than"] is not None and payload["moved"]:
+                list_cache.invalidate(lambda key, _: key[0] == "list_reports")
+                report_snapshot.retire(payload["older_than"])
+        elif event == "reports_changed":
+            entity_cache.clear()
+            list_cache.invalidate(lambda key, _: key[0] == "list_reports")
+            report_snapshot.invalidate()
+        elif event == "verified":
+            entity_cache.bump(payload["profile_id"])
+            list_cache.invalidate(lambda key, _: key[0] == "list_verified")
+            if payload.get("renamed"):
+                report_snapshot.rename(payload["profile_id"], payload["tarkov_game_name"])
+                list_cache.invalidate(lambda key, profile_ids: payload["profile_id"] in profile_ids)
+        elif event == "server_settings":
+            settings_cache.invalidate(lambda key, _: key == ("all",) or key == ("server", payload["server_id"]))
+            for listener in settings_listeners:
+                listener(payload["server_id"])
+        else:
+            logger.warning(f"Ignoring unknown cache event '{event}'")
+
     # Server Settings Operations
     @classmethod
     def add_guild_server_settings(cls, server_id: int, channel_id: int) -> None:
@@ -155,19 +516,34 @@ class DatabaseManager:
                     }
                 )
             )
-            session.commit()
+            cls._commit_with_event(session, "server_settings", server_id=server_id)
 
         cls._execute_db_operation(op)
 
     @classmethod
     def get_server_settings(cls, server_id: Optional[int] = None) -> List[Dict[str, Any]]:
+        cache_key = ("server", server_id) if server_id else ("all",)
+        cached = settings_cache.get(cache_key)
+        if cached is not None:
+            return cached
+
         def op(session):
             query = session.query(ServerSettings)
             if server_id:
                 query = query.filter_by(**{ServerSettingsFields.SERVER_ID.value: server_id})
             return [item.__dict__ for item in query.all()]
 
-        return cls._execute_db_operation(op)
+        try:
+            result = cls._execute_db_operation(op)
+        except DatabaseUnavailableError:
+            # Settings rarely change, so an expired copy beats failing every command during an outage
+            stale = settings_cache.get(cache_key, stale=True)
+            if stale is None:
+                raise
+            return stale
+        if result is not None:
+            settings_cache.set(cache_key, result)
+        return result
 
     @classmethod
     def update_guild_server_settings(cls, server_id: int, channel_id: int) -> None:
@@ -176,7 +552,32 @@ class DatabaseManager:
                 {ServerSettingsFields.CHANNEL_ID.value: channel_id},
                 synchronize_session=False,
             )
-            session.commit()
+            cls._commit_with_event(session, "server_settings", server_id=server_id)
+
+        cls._execute_db_operation(op)
+
+    @classmethod
+    def update_server_digest_interval(cls, server_id: int, digest_interval: Optional[int]) -> None:
+        def op(session):
+            session.query(ServerSettings).filter(ServerSettings.server_id == server_id).update(
+                {ServerSettingsFields.DIGEST_INTERVAL.value: digest_interval},
+                synchronize_session=False,
+            )
+            cls._commit_with_event(session, "server_settings", server_id=server_id)
+
+        cls._execute_db_operation(op)
+
+    @classmethod
+    def update_server_webhook(cls, server_id: int, webhook_id: Optional[int], webhook_token: Optional[str]) -> None:
+        def op(session):
+            session.query(ServerSettings).filter(ServerSettings.server_id == server_id).update(
+                {
+                    ServerSettingsFields.WEBHOOK_ID.value: webhook_id,
+                    ServerSettingsFields.WEBHOOK_TOKEN.value: webhook_token,
+                },
+                synchronize_session=False,
+            )
+            cls._commit_with_event(session, "server_settings", server_id=server_id)
 
         cls._execute_db_operation(op)
 
@@ -184,7 +585,7 @@ class DatabaseManager:
     def delete_server_settings(cls, server_id: int) -> None:
         def op(session):
             session.query(ServerSettings).filter(ServerSettings.server_id == server_id).delete(synchronize_session=False)
-            session.commit()
+            cls._commit_with_event(session, "server_settings", server_id=server_id)
 
         cls._execute_db_operation(op)
 
@@ -200,25 +601,206 @@ class DatabaseManager:
         report_type: ReportType,
         notes: Text,
         absolved: Boolean,
-    ) -> None:
+        replay: bool = False,
+        write_id: Optional[str] = None,
+    ) -> Optional[ReportResult]:
+        if isinstance(report_type, str):
+            report_type = ReportType[report_type]
+        # Entries spooled before writes carried an id can only be matched on the report's natural key
+        legacy_replay = replay and write_id is None
+        write_id = write_id or uuid.uuid4().hex
+        payload = {
+            "write_id": write_id,
+            "reporter_user_id": reporter_user_id,
+            "server_id": server_id,
+            "cheater_game_name": cheater_game_name,
+            "cheater_profile_id": cheater_profile_id,
+            "report_time": report_time,
+            "report_type": report_type.name,
+            "notes": notes,
+            "absolved": absolved,
+        }
+
         def op(session):
-            session.add(
-                CheaterReport(
-                    **{
-                        CheaterReportFields.REPORTER_USER_ID.value: reporter_user_id,
-                        CheaterReportFields.SERVER_ID.value: server_id,
-                        CheaterReportFields.CHEATER_GAME_NAME.value: cheater_game_name,
-                        CheaterReportFields.CHEATER_PROFILE_ID.value: cheater_profile_id,
-                        CheaterReportFields.REPORT_TIME.value: report_time,
-                        CheaterReportFields.REPORT_TYPE.value: report_type,
-                        CheaterReportFields.NOTES.value: notes,
-                        CheaterReportFields.ABSOLVED.value: absolved,
-                    }
+            if replay and (
+                cls._report_exists(session, reporter_user_id, cheater_profile_id, report_type, report_time)
+                if legacy_replay
+                else session.get(AppliedWrite, write_id) is not None
+            ):
+                # A coalesced report has no row of its own, so only the write id shows it already landed
+                logger.info(f"Spooled report of {cheater_profile_id} by {reporter_user_id} was already applied")
+                return ReportResult.ADDED
+            session.add(AppliedWrite(write_id=write_id, applied_time=int(time.time())))
+
+            if settings.REPORT_COALESCE_WINDOW > 0 and not absolved:
+                existing_id = cls._find_coalescible_report(
+                    session, reporter_user_id, cheater_profile_id, report_type, server_id, report_time
                 )
+                if existing_id is not None and cls._coalesce_report(session, existing_id, notes):
+                    renamed = cls._touch_player(session, cheater_profile_id, cheater_game_name, report_time)
+                    cls._commit_with_event(
+                        session,
+                        "report_coalesced",
+                        id=existing_id,
+                        cheater_profile_id=cheater_profile_id,
+                        cheater_game_name=cheater_game_name,
+                        renamed=renamed,
+                    )
+                    logger.info(f"Coalesced repeat report of {cheater_profile_id} by {reporter_user_id} into report {existing_id}")
+                    return ReportResult.COALESCED
+
+            renamed = cls._touch_player(session, cheater_profile_id, cheater_game_name, report_time, reports=1)
+            report = CheaterReport(
+                **{
+                    CheaterReportFields.REPORTER_USER_ID.value: reporter_user_id,
+                    CheaterReportFields.SERVER_ID.value: server_id,
+                    CheaterReportFields.CHEATER_PROFILE_ID.value: cheater_profile_id,
+                    CheaterReportFields.REPORT_TIME.value: report_time,
+                    CheaterReportFields.REPORT_TYPE.value: report_type,
+                    CheaterReportFields.NOTES.value: notes,
+                    CheaterReportFields.ABSOLVED.value: absolved,
+                }
+            )
+            session.add(report)
+            session.flush()
+            cls._bump_report_stats(session, 1, server_id, reporter_user_id, report_type, report_time)
+            cls._commit_with_event(
+                session,
+                "report_added",
+                id=report.id,
+                reporter_user_id=reporter_user_id,
+                server_id=server_id,
+                cheater_game_name=cheater_game_name,
+                cheater_profile_id=cheater_profile_id,
+                report_time=report_time,
+                report_type=report_type.name,
+                absolved=absolved,
+                renamed=renamed,
+            )
+            return ReportResult.ADDED
+
+        return cls._execute_spooled_write("add_cheater_report", payload, op, replay)
+
+    @staticmethod
+    def _report_exists(session, reporter_user_id: int, cheater_profile_id: int, report_type: ReportType, report_time: int) -> bool:
+        # Natural key of a report; replaying a write that reached the database before the spool entry was removed is a no-op
+        return (
+            session.query(CheaterReport.id)
+            .filter_by(
+                reporter_user_id=reporter_user_id,
+                cheater_profile_id=cheater_profile_id,
+                report_type=report_type,
+                report_time=report_time,
             )
+            .first()
+            is not None
+        )
+
+    @classmethod
+    def prune_applied_writes(cls, older_than: int) -> Optional[int]:
+        def op(session):
+            pruned = session.query(AppliedWrite).filter(AppliedWrite.applied_time < older_than).delete(synchronize_session=False)
             session.commit()
+            return pruned
 
-        cls._execute_db_operation(op)
+        return cls._execute_db_operation(op)
+
+    # Player Operations
+    @staticmethod
+    def _touch_player(session, profile_id: int, name: str, seen_time: int, reports: int = 0, verifications: int = 0) -> bool:
+        player = session.get(Player, profile_id, with_for_update=True)
+        if player is None:
+            try:
+                with session.begin_nested():
+                    session.add(
+                        Player(
+                            **{
+                                PlayerFields.PROFILE_ID.value: profile_id,
+                                PlayerFields.CURRENT_NAME.value: name,
+                                PlayerFields.NAME_HISTORY.value: [name],
+                                PlayerFields.IS_VERIFIED.value: verifications > 0,
+                                PlayerFields.REPORT_COUNT.value: reports,
+                                PlayerFields.VERIFICATION_COUNT.value: verifications,
+                                PlayerFields.LAST_SEEN_TIME.value: seen_time,
+                            }
+                        )
+                    )
+                return True
+            except IntegrityError:
+                # Another instance created the player first; fall through and update its row instead
+                player = session.get(Player, profile_id, with_for_update=True, populate_existing=True)
+
+        renamed = False
+        if name and seen_time >= (player.last_seen_time or 0):
+            renamed = name != player.current_name
+            player.current_name = name
+            player.last_seen_time = seen_time
+        if name and name not in player.name_history:
+            player.name_history = player.name_history + [name]
+        player.report_count += reports
+        player.verification_count += verifications
+        if verifications:
+            player.is_verified = True
+        session.flush()
+        return renamed
+
+    @classmethod
+    def get_player(cls, profile_id: int) -> Optional[Dict[str, Any]]:
+        def op(session):
+            player = session.get(Player, profile_id)
+            return {field.value: getattr(player, field.value) for field in PlayerFields if field != PlayerFields.TABLE_NAME} if player else None
+
+        return cls._execute_db_operation(op)
+
+    @classmethod
+    def get_player_names(cls, profile_ids: Optional[List[int]] = None) -> Dict[int, str]:
+        def op(session):
+            query = session.query(Player.profile_id, Player.current_name)
+            if profile_ids is not None:
+                query = query.filter(Player.profile_id.in_(profile_ids))
+            return {profile_id: name for profile_id, name in query}
+
+        return cls._execute_db_operation(op)
+
+    @staticmethod
+    def _find_coalescible_report(
+        session, reporter_user_id: int, cheater_profile_id: int, report_type: ReportType, server_id: Optional[int], report_time: int
+    ):
+        # Repeats are only merged within one server, so per-server counts still see a report from every server
+        report_id = recent_reports.get((reporter_user_id, cheater_profile_id, report_type.name, server_id), report_time)
+        if report_id is not None:
+            return report_id
+
+        # Reports from before a restart or missed events are still found in the table itself
+        return (
+            session.query(CheaterReport.id)
+            .filter(
+                CheaterReport.reporter_user_id == reporter_user_id,
+                CheaterReport.cheater_profile_id == cheater_profile_id,
+                CheaterReport.report_type == report_type,
+                CheaterReport.server_id.is_not_distinct_from(server_id),
+                CheaterReport.absolved == False,
+                CheaterReport.report_time >= report_time - settings.REPORT_COALESCE_WINDOW,
+            )
+            .order_by(CheaterReport.report_time.desc())
+            .limit(1)
+            .scalar()
+        )
+
+    @staticmethod
+    def _coalesce_report(session, report_id: int, notes: Optional[str]) -> bool:
+        updates = {CheaterReport.occurrences: CheaterReport.occurrences + 1}
+        if notes:
+            updates[CheaterReport.notes] = case(
+                (CheaterReport.notes.is_(None), notes),
+                else_=CheaterReport.notes + "\n" + notes,
+            )
+        updated = (
+            session.query(CheaterReport)
+            .filter(CheaterReport.id == report_id, CheaterReport.absolved == False)
+            .update(updates, synchronize_session=False)
+        )
+        return updated > 0
 
     @classmethod
     def get_cheater_reports(
@@ -241,78 +823,245 @@ class DatabaseManager:
 
     @classmethod
     def update_cheater_report(cls, id: int, updates: Dict[str, Any]) -> None:
+        stat_fields = (
+            CheaterReportFields.SERVER_ID.value,
+            CheaterReportFields.REPORTER_USER_ID.value,
+            CheaterReportFields.REPORT_TYPE.value,
+            CheaterReportFields.REPORT_TIME.value,
+        )
+
         def op(session):
+            report = (
+                session.query(CheaterReport.cheater_profile_id, *(getattr(CheaterReport, field) for field in stat_fields))
+                .filter(CheaterReport.id == id)
+                .first()
+            )
             session.query(CheaterReport).filter(CheaterReport.id == id).update(updates, synchronize_session=False)
-            session.commit()
+            if report is not None:
+                profile_id, *before = report
+                new_profile_id = updates.get(CheaterReportFields.CHEATER_PROFILE_ID.value, profile_id)
+                if new_profile_id != profile_id:
+                    # The report now counts towards a different player
+                    session.query(Player).filter(Player.profile_id == profile_id).update(
+                        {Player.report_count: Player.report_count - 1}, synchronize_session=False
+                    )
+                    session.query(Player).filter(Player.profile_id == new_profile_id).update(
+                        {Player.report_count: Player.report_count + 1}, synchronize_session=False
+                    )
+                if any(field in updates for field in stat_fields):
+                    # Move the report's contribution from its old rollup rows to its new ones in the same transaction
+                    after = dict(zip(stat_fields, before))
+                    after.update({field: updates[field] for field in stat_fields if field in updates})
+                    if isinstance(after[CheaterReportFields.REPORT_TYPE.value], str):
+                        after[CheaterReportFields.REPORT_TYPE.value] = ReportType[after[CheaterReportFields.REPORT_TYPE.value]]
+                    cls._bump_report_stats(session, -1, *before)
+                    cls._bump_report_stats(session, 1, *(after[field] for field in stat_fields))
+            cls._commit_with_event(session, "reports_changed")
 
         cls._execute_db_operation(op)
 
     @classmethod
     def delete_cheater_report(cls, id: int) -> None:
         def op(session):
+            report = (
+                session.query(
+                    CheaterReport.cheater_profile_id,
+                    CheaterReport.server_id,
+                    CheaterReport.reporter_user_id,
+                    CheaterReport.report_type,
+                    CheaterReport.report_time,
+                )
+                .filter(CheaterReport.id == id)
+                .first()
+            )
             session.query(CheaterReport).filter(CheaterReport.id == id).delete(synchronize_session=False)
-            session.commit()
+            if report is not None:
+                profile_id, server_id, reporter_user_id, report_type, report_time = report
+                session.query(Player).filter(Player.profile_id == profile_id).update(
+                    {Player.report_count: Player.report_count - 1}, synchronize_session=False
+                )
+                cls._bump_report_stats(session, -1, server_id, reporter_user_id, report_type, report_time)
+            cls._commit_with_event(session, "reports_changed")
 
         cls._execute_db_operation(op)
 
     @classmethod
     def get_comprehensive_cheater_details(cls, cheater_id: int) -> Optional[Dict[str, Any]]:
         def op(session):
-            cheater = cls.get_cheater_basic_info(session, cheater_id)
+            cheater = cls.get_cheater_snapshot_info(cheater_id) if report_snapshot.loaded else None
+            if cheater is None:
+                # Also covers cheaters whose reports have all been archived out of the snapshot
+                cheater = cls.get_cheater_query_info(session, cheater_id)
             verified_status = cls.check_verified_legit_status(cheater_id)
 
             if not cheater or verified_status["is_verified"]:
                 return None
 
-            for report_type in ReportType:
-                total_reports_key = f"total_{report_type.name.lower()}_reports"
-                last_reported_by_key = f"last_{report_type.name.lower()}_reported_by"
-                last_report_time_key = f"last_{report_type.name.lower()}_report_time"
-                most_reported_by_key = f"most_{report_type.name.lower()}_reported_by"
+            cheater["note_count"] = cls.count_notes(session, CheaterReport, CheaterReport.cheater_profile_id, cheater_id)
+            cheater["archived_reports"] = cls.get_archived_report_counts(session, cheater_id)
+            cheater["archived_note_count"] = cls.count_notes(
+                session, ArchivedCheaterReport, ArchivedCheaterReport.cheater_profile_id, cheater_id
+            )
+            return cheater
 
-                cheater[total_reports_key] = cls.count_reports(session, cheater_id, report_type, absolved=False)
+        return cls._execute_db_operation(op)
 
-                last_report = cls.get_last_report(session, cheater_id, report_type, absolved=False)
-                if last_report:
-                    cheater[last_reported_by_key] = last_report.reporter_user_id
-                    cheater[last_report_time_key] = last_report.report_time
-                else:
-                    cheater[last_reported_by_key] = None
-                    cheater[last_report_time_key] = None
+    @classmethod
+    def get_archived_cheater_note(cls, cheater_id: int, index: int, total: int) -> Optional[Dict[str, Any]]:
+        def op(session):
+            return cls.get_note_at(
+                session,
+                ArchivedCheaterReport,
+                ArchivedCheaterReport.cheater_profile_id,
+                ArchivedCheaterReport.report_time,
+                ArchivedCheaterReport.reporter_user_id,
+                cheater_id,
+                index,
+                total,
+            )
 
-                most_reported_by = cls.get_most_reported_by(session, cheater_id, report_type, absolved=False)
-                cheater[most_reported_by_key] = most_reported_by
+        return cls._execute_db_operation(op)
 
-            cheater["most_reported_server"] = cls.get_most_reported_server(session, cheater_id, absolved=False)
-            cheater["top_reported_servers"] = cls.get_top_reported_servers(session, cheater_id, absolved=False)
+    @staticmethod
+    def get_archived_report_counts(session, cheater_id: int) -> Dict[str, Dict[str, int]]:
+        rows = (
+            session.query(ArchivedCheaterReport.report_type, func.count(), func.max(ArchivedCheaterReport.report_time))
+            .filter(ArchivedCheaterReport.cheater_profile_id == cheater_id)
+            .group_by(ArchivedCheaterReport.report_type)
+            .all()
+        )
+        return {report_type.name: {"total": total, "last_report_time": last_report_time} for report_type, total, last_report_time in rows}
 
-            # Get all reports for this cheater
-            all_reports = (
-                session.query(CheaterReport)
-                .filter(CheaterReport.cheater_profile_id == cheater_id)
-                .order_by(CheaterReport.report_time.desc())
-                .all()
-            )
+    @classmethod
+    def archive_reports(cls, include_absolved: bool, older_than: Optional[int], batch_size: int) -> Optional[int]:
+        conditions = []
+        if include_absolved:
+            conditions.append(CheaterReport.absolved == True)
+        if older_than is not None:
+            conditions.append(CheaterReport.report_time < older_than)
+        if not conditions:
+            return 0
+
+        reports = CheaterReport.__table__
+        columns = [column.name for column in reports.columns]
 
-            # Collect all notes
-            cheater["notes"] = [
-                {
-                    "content": report.notes,
-                    "verifier_user_id": report.reporter_user_id,
-                    "timestamp": report.report_time,
-                }
-                for report in all_reports
-                if report.notes
-            ]
+        def op(session):
+            archived_time = int(time.time())
+            moved_total = 0
+            while True:
+                # Batches keep each DELETE short so writers are never blocked for long
+                batch = select(reports.c.id, reports.c.report_time).where(or_(*conditions)).limit(batch_size)
+                moved = reports.delete().where(tuple_(reports.c.id, reports.c.report_time).in_(batch)).returning(*reports.columns).cte("moved")
+                result = session.execute(
+                    insert(ArchivedCheaterReport.__table__).from_select(
+                        columns + ["archived_time"],
+                        select(*[moved.c[column] for column in columns], literal(archived_time)),
+                    )
+                )
+                moved_total += result.rowcount
+                if result.rowcount < batch_size:
+                    break
+                session.commit()
 
-            return cheater
+            # Runs off the event loop, so the caller applies the event locally once it is back on the loop
+            cls._notify(session, "reports_archived", older_than=older_than, moved=moved_total)
+            session.commit()
+            return moved_total
 
         return cls._execute_db_operation(op)
 
+    @classmethod
+    def get_cheater_note(cls, cheater_id: int, index: int, total: int) -> Optional[Dict[str, Any]]:
+        def op(session):
+            return cls.get_note_at(
+                session,
+                CheaterReport,
+                CheaterReport.cheater_profile_id,
+                CheaterReport.report_time,
+                CheaterReport.reporter_user_id,
+                cheater_id,
+                index,
+                total,
+            )
+
+        return cls._execute_db_operation(op)
+
+    @staticmethod
+    def count_notes(session, model, profile_column, profile_id: int) -> int:
+        return session.query(func.count(model.id)).filter(profile_column == profile_id, model.notes.isnot(None), model.notes != "").scalar()
+
+    @staticmethod
+    def get_note_at(session, model, profile_column, time_column, author_column, profile_id: int, index: int, total: int):
+        # Notes are numbered newest first; walk in from whichever end is closer so the first and last pages stay cheap
+        newest_first = index < total - index
+        if newest_first:
+            order, offset = (time_column.desc(), model.id.desc()), index
+        else:
+            order, offset = (time_column.asc(), model.id.asc()), total - 1 - index
+
+        note = (
+            session.query(model.notes, author_column, time_column)
+            .filter(profile_column == profile_id, model.notes.isnot(None), model.notes != "")
+            .order_by(*order)
+            .offset(offset)
+            .limit(1)
+            .first()
+        )
+        return {"content": note[0], "verifier_user_id": note[1], "timestamp": note[2]} if note else None
+
+    @classmethod
+    def get_cheater_query_info(cls, session, cheater_id: int) -> Optional[Dict[str, Any]]:
+        cheater = cls.get_cheater_basic_info(session, cheater_id)
+        if not cheater:
+            return None
+
+        for report_type in ReportType:
+            total_reports_key = f"total_{report_type.name.lower()}_reports"
+            last_reported_by_key = f"last_{report_type.name.lower()}_reported_by"
+            last_report_time_key = f"last_{report_type.name.lower()}_report_time"
+            most_reported_by_key = f"most_{report_type.name.lower()}_reported_by"
+
+            cheater[total_reports_key] = cls.count_reports(session, cheater_id, report_type, absolved=False)
+
+            last_report = cls.get_last_report(session, cheater_id, report_type, absolved=False)
+            if last_report:
+                cheater[last_reported_by_key] = last_report.reporter_user_id
+                cheater[last_report_time_key] = last_report.report_time
+            else:
+                cheater[last_reported_by_key] = None
+                cheater[last_report_time_key] = None
+
+            most_reported_by = cls.get_most_reported_by(session, cheater_id, report_type, absolved=False)
+            cheater[most_reported_by_key] = most_reported_by
+
+        cheater["most_reported_server"] = cls.get_most_reported_server(session, cheater_id, absolved=False)
+        cheater["top_reported_servers"] = cls.get_top_reported_servers(session, cheater_id, absolved=False)
+        return cheater
+
+    @staticmethod
+    def get_cheater_snapshot_info(cheater_id: int) -> Optional[Dict[str, Any]]:
+        snapshot = report_snapshot.cheater_details(cheater_id, [report_type.value for report_type in ReportType])
+        if not snapshot:
+            return None
+
+        cheater = {
+            "id": snapshot["id"],
+            "name": snapshot["name"],
+            "most_reported_server": snapshot["most_reported_server"],
+            "top_reported_servers": snapshot["top_reported_servers"],
+        }
+        for report_type in ReportType:
+            report = snapshot["reports"][report_type.value]
+            cheater[f"total_{report_type.name.lower()}_reports"] = report["total"]
+            cheater[f"last_{report_type.name.lower()}_reported_by"] = report["last_reported_by"]
+            cheater[f"last_{report_type.name.lower()}_report_time"] = report["last_report_time"]
+            cheater[f"most_{report_type.name.lower()}_reported_by"] = report["most_reported_by"]
+        return cheater
+
     @staticmethod
     def get_cheater_basic_info(session, cheater_id: int) -> Optional[Dict[str, Any]]:
-        cheater = session.query(CheaterReport).filter_by(cheater_profile_id=cheater_id).order_by(CheaterReport.report_time.desc()).first()
-        return {"id": cheater.cheater_profile_id, "name": cheater.cheater_game_name} if cheater else None
+        player = session.get(Player, cheater_id)
+        return {"id": player.profile_id, "name": player.current_name} if player and player.report_count > 0 else None
 
     @staticmethod
     def count_reports(session, cheater_id: int, report_type: ReportType, absolved: bool = False) -> int:
@@ -365,8 +1114,19 @@ class DatabaseManager:
             .first()
         )
 
+    @staticmethod
+    def _filter_report_window(query, since: Optional[int] = None, server_id: Optional[int] = None):
+        # Served by ix_cheater_reports_time and ix_cheater_reports_server_time, and lets Postgres prune old partitions
+        if server_id is not None:
+            query = query.filter(CheaterReport.server_id == server_id)
+        if since is not None:
+            query = query.filter(CheaterReport.report_time >= since)
+        return query
+
     @classmethod
-    def get_cheater_reports_by_type(cls, report_type: ReportType, absolved: bool = False) -> List[Dict[str, Any]]:
+    def get_cheater_reports_by_type(
+        cls, report_type: ReportType, absolved: bool = False, since: Optional[int] = None, server_id: Optional[int] = None
+    ) -> List[Dict[str, Any]]:
         def op(session):
             query = session.query(CheaterReport).filter_by(
                 **{
@@ -374,33 +1134,32 @@ class DatabaseManager:
                     CheaterReportFields.ABSOLVED.value: absolved,
                 }
             )
+            query = cls._filter_report_window(query, since, server_id)
             return [item.__dict__ for item in query.all()]
 
         return cls._execute_db_operation(op)
 
     @classmethod
-    def get_all_cheaters(cls) -> List[Dict[str, Any]]:
+    def get_report_snapshot_rows(cls) -> List[tuple]:
         def op(session):
-            all_cheaters = (
-                session.query(
-                    CheaterReport.cheater_profile_id,
-                    CheaterReport.cheater_game_name,
-                    CheaterReport.report_time,
-                    CheaterReport.report_type,
-                )
-                .filter(CheaterReport.absolved == False)
-                .all()
-            )
+            rows = session.query(
+                CheaterReport.cheater_profile_id,
+                CheaterReport.reporter_user_id,
+                CheaterReport.server_id,
+                CheaterReport.report_type,
+                CheaterReport.report_time,
+                CheaterReport.absolved,
+            ).yield_per(50000)
+            return [(r[0], r[1], r[2], r[3].value, r[4], r[5]) for r in rows]
 
-            return [
-                {
-                    "id": c[0],
-                    "name": c[1],
-                    "report_time": c[2],
-                    "report_type": c[3].name,
-                }
-                for c in all_cheaters
-            ]
+        return cls._execute_db_operation(op)
+
+    @classmethod
+    def get_all_cheaters(cls) -> List[Dict[str, Any]]:
+        def op(session):
+            reported = session.query(CheaterReport.cheater_profile_id).filter(CheaterReport.absolved == False)
+            cheaters = session.query(Player.profile_id, Player.current_name).filter(Player.profile_id.in_(reported)).all()
+            return [{"id": c[0], "name": c[1]} for c in cheaters]
 
         return cls._execute_db_operation(op)
 
@@ -417,30 +1176,37 @@ class DatabaseManager:
         return [{"server_id": result[0], "count": result[1]} for result in results]
 
     @classmethod
-    def get_cheater_reports_by_user(cls, user_id: int, absolved: bool = False) -> List[Dict[str, Any]]:
+    def get_cheater_reports_by_user(
+        cls, user_id: int, absolved: bool = False, since: Optional[int] = None, server_id: Optional[int] = None
+    ) -> List[Dict[str, Any]]:
         def op(session):
-            reports = (
+            query = (
                 session.query(CheaterReport)
                 .filter(CheaterReport.reporter_user_id == user_id)
                 .filter(CheaterReport.absolved == absolved)
-                .order_by(CheaterReport.report_time.desc())
-                .all()
             )
+            reports = cls._filter_report_window(query, since, server_id).order_by(CheaterReport.report_time.desc()).all()
             return [item.__dict__ for item in reports]
 
         return cls._execute_db_operation(op)
 
     @classmethod
-    def get_cheater_reports_by_type_and_user(cls, report_type: ReportType, user_id: int, absolved: bool = False) -> List[Dict[str, Any]]:
+    def get_cheater_reports_by_type_and_user(
+        cls,
+        report_type: ReportType,
+        user_id: int,
+        absolved: bool = False,
+        since: Optional[int] = None,
+        server_id: Optional[int] = None,
+    ) -> List[Dict[str, Any]]:
         def op(session):
-            reports = (
+            query = (
                 session.query(CheaterReport)
                 .filter(CheaterReport.report_type == report_type)
                 .filter(CheaterReport.reporter_user_id == user_id)
                 .filter(CheaterReport.absolved == absolved)
-                .order_by(CheaterReport.report_time.desc())
-                .all()
             )
+            reports = cls._filter_report_window(query, since, server_id).order_by(CheaterReport.report_time.desc()).all()
             return [item.__dict__ for item in reports]
 
         return cls._execute_db_operation(op)
@@ -455,34 +1221,60 @@ class DatabaseManager:
         tarkov_profile_id: int,
         twitch_name: str,
         notes: str,
-    ) -> None:
+        replay: bool = False,
+    ) -> Optional[Any]:
+        payload = {
+            "verifier_user_id": verifier_user_id,
+            "server_id": server_id,
+            "verified_time": verified_time,
+            "tarkov_game_name": tarkov_game_name,
+            "tarkov_profile_id": tarkov_profile_id,
+            "twitch_name": twitch_name,
+            "notes": notes,
+        }
+
         def op(session):
+            if replay and (
+                session.query(VerifiedLegit.id)
+                .filter_by(verifier_user_id=verifier_user_id, tarkov_profile_id=tarkov_profile_id, verified_time=verified_time)
+                .first()
+            ):
+                logger.info(f"Spooled verification of {tarkov_profile_id} by {verifier_user_id} was already applied")
+                return True
+
+            renamed = cls._touch_player(session, tarkov_profile_id, tarkov_game_name, verified_time, verifications=1)
             session.add(
                 VerifiedLegit(
                     **{
                         VerifiedLegitFields.VERIFIER_USER_ID.value: verifier_user_id,
                         VerifiedLegitFields.SERVER_ID.value: server_id,
                         VerifiedLegitFields.VERIFIED_TIME.value: verified_time,
-                        VerifiedLegitFields.TARKOV_GAME_NAME.value: tarkov_game_name,
                         VerifiedLegitFields.TARKOV_PROFILE_ID.value: tarkov_profile_id,
                         VerifiedLegitFields.TWITCH_NAME.value: twitch_name,
                         VerifiedLegitFields.NOTES.value: notes,
                     }
                 )
             )
-            session.commit()
+            cls._bump_daily_stat(session, VerificationDailyStat, day=stat_day(verified_time), server_id=server_id or 0)
+            cls._commit_with_event(
+                session, "verified", profile_id=tarkov_profile_id, tarkov_game_name=tarkov_game_name, renamed=renamed
+            )
+            return True
 
-        cls._execute_db_operation(op)
+        return cls._execute_spooled_write("add_verified_legit", payload, op, replay)
 
     @classmethod
-    def mark_cheater_reports_as_absolved(cls, tarkov_profile_id: int) -> None:
+    def mark_cheater_reports_as_absolved(cls, tarkov_profile_id: int, replay: bool = False) -> Optional[Any]:
         def op(session):
             session.query(CheaterReport).filter(CheaterReport.cheater_profile_id == tarkov_profile_id).update(
                 {CheaterReportFields.ABSOLVED.value: True}, synchronize_session=False
             )
-            session.commit()
+            cls._commit_with_event(session, "reports_absolved", profile_id=tarkov_profile_id)
+            return True
 
-        cls._execute_db_operation(op)
+        return cls._execute_spooled_write(
+            "mark_cheater_reports_as_absolved", {"tarkov_profile_id": tarkov_profile_id}, op, replay
+        )
 
     @classmethod
     def add_and_mark_verified_legit(
@@ -495,38 +1287,46 @@ class DatabaseManager:
         twitch_name: str,
         notes: str,
     ) -> None:
-        def op(session):
-            cls.add_verified_legit(
-                verifier_user_id,
-                server_id,
-                verified_time,
-                tarkov_game_name,
-                tarkov_profile_id,
-                twitch_name,
-                notes,
-            )
-            cls.mark_cheater_reports_as_absolved(tarkov_profile_id)
-
-        cls._execute_db_operation(op)
+        # Each half spools on its own during an outage, and the spool replays them in this order
+        cls.add_verified_legit(
+            verifier_user_id,
+            server_id,
+            verified_time,
+            tarkov_game_name,
+            tarkov_profile_id,
+            twitch_name,
+            notes,
+        )
+        cls.mark_cheater_reports_as_absolved(tarkov_profile_id)
 
     @classmethod
     def check_verified_legit_status(cls, tarkov_profile_id: int) -> Dict[str, Any]:
         def op(session):
+            # Most lookups are for players who were never verified, which the players row answers on its own
+            player = session.get(Player, tarkov_profile_id)
+            if player is None or not player.is_verified:
+                return {
+                    "is_verified": False,
+                    "count": 0,
+                    "verifier_ids": [],
+                    "verification_times": [],
+                    "tarkov_game_name": player.current_name if player else None,
+                    "twitch_name": None,
+                }
+
             query = session.query(VerifiedLegit).filter(VerifiedLegit.tarkov_profile_id == tarkov_profile_id)
             results = query.all()
-            is_verified = len(results) > 0
             verifier_ids = [result.verifier_user_id for result in results]
             verification_times = [result.verified_time for result in results]
-            tarkov_game_names = [result.tarkov_game_name for result in results]
 
             twitch_name = next((result.twitch_name for result in results if result.twitch_name), None)
 
             return {
-                "is_verified": is_verified,
+                "is_verified": True,
                 "count": len(results),
                 "verifier_ids": verifier_ids,
                 "verification_times": verification_times,
-                "tarkov_game_names": tarkov_game_names,
+                "tarkov_game_name": player.current_name,
                 "twitch_name": twitch_name,
             }
 
@@ -535,20 +1335,33 @@ class DatabaseManager:
     @classmethod
     def get_all_verified_users(cls) -> List[Dict[str, Any]]:
         def op(session):
-            verified_users = session.query(VerifiedLegit).order_by(VerifiedLegit.verified_time.desc()).all()
+            verified_users = (
+                session.query(VerifiedLegit, Player.current_name)
+                .join(Player, Player.profile_id == VerifiedLegit.tarkov_profile_id)
+                .order_by(VerifiedLegit.verified_time.desc())
+                .all()
+            )
             return [
                 {
                     "tarkov_profile_id": user.tarkov_profile_id,
-                    "tarkov_game_name": user.tarkov_game_name,
+                    "tarkov_game_name": current_name,
                     "twitch_name": user.twitch_name,
                     "verifier_user_id": user.verifier_user_id,
                     "verified_time": user.verified_time,
                 }
-                for user in verified_users
+                for user, current_name in verified_users
             ]
 
         return cls._execute_db_operation(op)
 
+    @classmethod
+    def get_verified_players(cls) -> List[Dict[str, Any]]:
+        def op(session):
+            players = session.query(Player.profile_id, Player.current_name).filter(Player.is_verified == True).all()
+            return [{"tarkov_profile_id": p[0], "tarkov_game_name": p[1]} for p in players]
+
+        return cls._execute_db_operation(op)
+
     @classmethod
     def get_comprehensive_verified_details(cls, verified_user_id: int) -> Optional[Dict[str, Any]]:
         def op(session):
@@ -564,35 +1377,118 @@ class DatabaseManager:
 
             details = {
                 "tarkov_profile_id": verified_user.tarkov_profile_id,
-                "tarkov_game_name": verified_user.tarkov_game_name,
+                "tarkov_game_name": session.get(Player, verified_user_id).current_name,
                 "twitch_name": verified_user.twitch_name,
                 "verifier_user_id": verified_user.verifier_user_id,
                 "verified_time": verified_user.verified_time,
             }
 
-            # Get all verifications for this user
-            all_verifications = (
-                session.query(VerifiedLegit)
+            verification_count, first_verified_time = (
+                session.query(func.count(VerifiedLegit.id), func.min(VerifiedLegit.verified_time))
                 .filter(VerifiedLegit.tarkov_profile_id == verified_user_id)
-                .order_by(VerifiedLegit.verified_time.desc())
-                .all()
+                .one()
             )
-
-            details["verification_count"] = len(all_verifications)
-            details["first_verified_time"] = all_verifications[-1].verified_time if all_verifications else None
-            details["unique_verifiers"] = list(set(v.verifier_user_id for v in all_verifications))
-
-            # Collect all notes
-            details["notes"] = [
-                {
-                    "content": v.notes,
-                    "verifier_user_id": v.verifier_user_id,
-                    "timestamp": v.verified_time,
-                }
-                for v in all_verifications
-                if v.notes
+            details["verification_count"] = verification_count
+            details["first_verified_time"] = first_verified_time
+            details["unique_verifiers"] = [
+                verifier_user_id
+                for (verifier_user_id,) in session.query(VerifiedLegit.verifier_user_id)
+                .filter(VerifiedLegit.tarkov_profile_id == verified_user_id)
+                .distinct()
             ]
+            details["note_count"] = cls.count_notes(session, VerifiedLegit, VerifiedLegit.tarkov_profile_id, verified_user_id)
 
             return details
 
         return cls._execute_db_operation(op)
+
+    @classmethod
+    def get_verified_note(cls, verified_user_id: int, index: int, total: int) -> Optional[Dict[str, Any]]:
+        def op(session):
+            return cls.get_note_at(
+                session,
+                VerifiedLegit,
+                VerifiedLegit.tarkov_profile_id,
+                VerifiedLegit.verified_time,
+                VerifiedLegit.verifier_user_id,
+                verified_user_id,
+                index,
+                total,
+            )
+
+        return cls._execute_db_operation(op)
+
+    # Statistics Operations
+    @staticmethod
+    def _bump_daily_stat(session, model, amount: int = 1, **key):
+        # Upsert keeps concurrent writers on the same day/server row from racing each other
+        statement = pg_insert(model).values(**key, count=amount)
+        session.execute(
+            statement.on_conflict_do_update(index_elements=list(key), set_={"count": model.count + statement.excluded.count})
+        )
+
+    @classmethod
+    def _bump_report_stats(cls, session, amount: int, server_id, reporter_user_id, report_type, report_time):
+        day = stat_day(report_time or 0)
+        cls._bump_daily_stat(session, ReportDailyStat, amount, day=day, server_id=server_id or 0, report_type=report_type)
+        # reporter_user_id is part of the key, so reports without one only count towards the per-type rollup, as in the backfill
+        if reporter_user_id is not None:
+            cls._bump_daily_stat(session, ReporterDailyStat, amount, day=day, server_id=server_id or 0, reporter_user_id=reporter_user_id)
+
+    @staticmethod
+    def _filter_stat_window(query, model, since_day: Optional[int], server_id: Optional[int]):
+        if server_id is not None:
+            query = query.filter(model.server_id == server_id)
+        if since_day is not None:
+            query = query.filter(model.day >= since_day)
+        return query
+
+    @classmethod
+    def get_statistics(
+        cls, since_day: Optional[int] = None, server_id: Optional[int] = None, leaderboard_size: int = 10
+    ) -> Optional[Dict[str, Any]]:
+        def op(session):
+            def window(query, model):
+                return cls._filter_stat_window(query, model, since_day, server_id)
+
+            by_type = window(
+                session.query(ReportDailyStat.report_type, func.sum(ReportDailyStat.count)), ReportDailyStat
+            ).group_by(ReportDailyStat.report_type)
+            busiest_day = (
+                window(session.query(ReportDailyStat.day, func.sum(ReportDailyStat.count).label("total")), ReportDailyStat)
+                .group_by(ReportDailyStat.day)
+                .order_by(text("total DESC"), ReportDailyStat.day.desc())
+                .first()
+            )
+            top_reporters = (
+                window(
+                    session.query(ReporterDailyStat.reporter_user_id, func.sum(ReporterDailyStat.count).label("total")),
+                    ReporterDailyStat,
+                )
+                .group_by(ReporterDailyStat.reporter_user_id)
+                .having(func.sum(ReporterDailyStat.count) > 0)
+                .order_by(text("total DESC"))
+                .limit(leaderboard_size)
+            )
+            verifications = window(session.query(func.sum(VerificationDailyStat.count)), VerificationDailyStat).scalar()
+
+            stats = {
+                "reports_by_type": {report_type.name: int(total) for report_type, total in by_type if total},
+                "busiest_day": {"day": busiest_day[0], "count": int(busiest_day[1])} if busiest_day and busiest_day[1] else None,
+                "top_reporters": [{"user_id": user_id, "count": int(total)} for user_id, total in top_reporters],
+                "verifications": int(verifications or 0),
+            }
+            stats["total_reports"] = sum(stats["reports_by_type"].values())
+
+            if server_id is None:
+                top_servers = (
+                    window(session.query(ReportDailyStat.server_id, func.sum(ReportDailyStat.count).label("total")), ReportDailyStat)
+                    .group_by(ReportDailyStat.server_id)
+                    .having(func.sum(ReportDailyStat.count) > 0)
+                    .order_by(text("total DESC"))
+                    .limit(5)
+                )
+                stats["top_servers"] = [{"server_id": sid, "count": int(total)} for sid, total in top_servers]
+            return stats
+
+        return cls._execute_db_operation(op)
@@ -0,0 +1,57 @@
+import logging
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Optional
+
+logger = logging.getLogger("database")
+
+# Wall-clock time after which nobody is waiting for the current interaction's queries; copied into asyncio.to_thread workers
+query_deadline: ContextVar[Optional[float]] = ContextVar("query_deadline", default=None)
+
+
+class QueryScope:
+    # Lets another task cancel the query currently running on behalf of this scope, server-side
+    def __init__(self):
+        self.cancelled = False
+        self._connection = None
+        self._lock = threading.Lock()
+
+    def attach(self, connection) -> bool:
+        with self._lock:
+            self._connection = connection
+            return not self.cancelled
+
+    def detach(self):
+        # Must run before the connection goes back to the pool, or a late cancel could hit someone else's query
+        with self._lock:
+            self._connection = None
+
+    def cancel(self):
+        with self._lock:
+            self.cancelled = True
+            if self._connection is not None:
+                try:
+                    self._connection.cancel()
+                except Exception as e:
+                    logger.debug(f"Failed to cancel superseded query: {e}")
+
+
+query_scope: ContextVar[Optional[QueryScope]] = ContextVar("query_scope", default=None)
+
+
+def remaining() -> Optional[float]:
+    deadline = query_deadline.get()
+    return None if deadline is None else deadline - time.time()
+
+
+@contextmanager
+def deadline_at(deadline: Optional[float], scope: Optional[QueryScope] = None):
+    deadline_token = query_deadline.set(deadline)
+    scope_token = query_scope.set(scope)
+    try:
+        yield
+    finally:
+        query_scope.reset(scope_token)
+        query_deadline.reset(deadline_token)
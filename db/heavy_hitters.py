@@ -0,0 +1,54 @@
+from typing import Dict, Hashable, List, Optional, Tuple
+
+import settings
+
+
+class SpaceSaving:
+    __slots__ = ("capacity", "_counts", "_errors", "_top")
+
+    def __init__(self, capacity: int = settings.TOP_REPORTER_SLOTS):
+        self.capacity = capacity
+        self._counts: Dict[Hashable, int] = {}
+        self._errors: Dict[Hashable, int] = {}
+        self._top: Optional[Hashable] = None
+
+    def __len__(self) -> int:
+        return len(self._counts)
+
+    def __bool__(self) -> bool:
+        return bool(self._counts)
+
+    def add(self, item: Hashable, count: int = 1):
+        if item in self._counts:
+            self._counts[item] += count
+        elif len(self._counts) < self.capacity:
+            self._counts[item] = count
+            self._errors[item] = 0
+        else:
+            # Evict the smallest slot; the newcomer inherits its count as an upper bound on what it may have missed
+            victim = min(self._counts, key=self._counts.get)
+            floor = self._counts.pop(victim)
+            del self._errors[victim]
+            self._counts[item] = floor + count
+            self._errors[item] = floor
+
+        # Counts only grow, so the maximum can be tracked on insert instead of searched on read
+        if self._top is None or self._top not in self._counts or self._counts[item] >= self._counts[self._top]:
+            self._top = item
+
+    @property
+    def top(self) -> Optional[Tuple[Hashable, int]]:
+        # Read from worker threads through snapshot views while the loop offers new items
+        top = self._top
+        count = self._counts.get(top) if top is not None else None
+        if count is None:
+            return None
+        return top, count
+
+    def items(self) -> List[Tuple[Hashable, int, int]]:
+        # (item, estimated count, maximum overestimation), most frequent first
+        return sorted(
+            ((item, count, self._errors[item]) for item, count in self._counts.items()),
+            key=lambda entry: entry[1],
+            reverse=True,
+        )
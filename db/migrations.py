@@ -0,0 +1,285 @@
+import logging
+from typing import Callable, Dict
+
+from sqlalchemy import inspect, select, text
+from sqlalchemy.engine import Connection
+from sqlalchemy.exc import SQLAlchemyError
+
+import settings
+from db.database import (
+    AppliedWrite,
+    ArchivedCheaterReport,
+    Base,
+    CheaterReport,
+    CheaterReportFields,
+    Player,
+    ReportDailyStat,
+    ReporterDailyStat,
+    SchemaVersion,
+    VerificationDailyStat,
+    get_engine,
+)
+from db.partitions import ensure_report_partitions, is_partitioned
+
+logger = logging.getLogger("database")
+
+SCHEMA_VERSION = 11
+
+
+def add_report_occurrences(conn: Connection):
+    conn.execute(text("ALTER TABLE cheater_reports ADD COLUMN IF NOT EXISTS occurrences INTEGER NOT NULL DEFAULT 1"))
+    conn.execute(
+        text(
+            "CREATE INDEX IF NOT EXISTS ix_cheater_reports_profile_reporter_type "
+            "ON cheater_reports (cheater_profile_id, reporter_user_id, report_type)"
+        )
+    )
+
+
+def add_server_digest_interval(conn: Connection):
+    conn.execute(text("ALTER TABLE server_settings ADD COLUMN IF NOT EXISTS digest_interval INTEGER"))
+
+
+def add_server_webhook(conn: Connection):
+    conn.execute(text("ALTER TABLE server_settings ADD COLUMN IF NOT EXISTS webhook_id BIGINT"))
+    conn.execute(text("ALTER TABLE server_settings ADD COLUMN IF NOT EXISTS webhook_token VARCHAR(255)"))
+
+
+def add_note_indexes(conn: Connection):
+    conn.execute(
+        text(
+            "CREATE INDEX IF NOT EXISTS ix_cheater_reports_notes "
+            "ON cheater_reports (cheater_profile_id, report_time, id) WHERE notes IS NOT NULL"
+        )
+    )
+    conn.execute(
+        text(
+            "CREATE INDEX IF NOT EXISTS ix_verified_legit_notes "
+            "ON verified_legit (tarkov_profile_id, verified_time, id) WHERE notes IS NOT NULL"
+        )
+    )
+
+
+def add_players(conn: Connection):
+    Player.__table__.create(conn, checkfirst=True)
+
+    # One row per profile seen in either table; the current name comes from the latest sighting
+    conn.execute(
+        text(
+            """
+            WITH sightings AS (
+                SELECT cheater_profile_id AS profile_id, cheater_game_name AS name, report_time AS seen, 1 AS reports, 0 AS verifications
+                FROM cheater_reports
+                UNION ALL
+                SELECT tarkov_profile_id, tarkov_game_name, verified_time, 0, 1
+                FROM verified_legit
+            ),
+            first_seen AS (
+                SELECT profile_id, name, MIN(seen) AS seen
+                FROM sightings
+                WHERE name IS NOT NULL
+                GROUP BY profile_id, name
+            )
+            INSERT INTO players (profile_id, current_name, name_history, is_verified, report_count, verification_count, last_seen_time)
+            SELECT
+                s.profile_id,
+                (ARRAY_AGG(s.name ORDER BY s.seen DESC) FILTER (WHERE s.name IS NOT NULL))[1],
+                COALESCE((SELECT json_agg(f.name ORDER BY f.seen) FROM first_seen f WHERE f.profile_id = s.profile_id), '[]'::json),
+                SUM(s.verifications) > 0,
+                SUM(s.reports),
+                SUM(s.verifications),
+                MAX(s.seen)
+            FROM sightings s
+            WHERE s.profile_id IS NOT NULL
+            GROUP BY s.profile_id
+            ON CONFLICT (profile_id) DO NOTHING
+            """
+        )
+    )
+
+    conn.execute(
+        text(
+            "ALTER TABLE cheater_reports ADD CONSTRAINT cheater_reports_cheater_profile_id_fkey "
+            "FOREIGN KEY (cheater_profile_id) REFERENCES players (profile_id)"
+        )
+    )
+    conn.execute(
+        text(
+            "ALTER TABLE verified_legit ADD CONSTRAINT verified_legit_tarkov_profile_id_fkey "
+            "FOREIGN KEY (tarkov_profile_id) REFERENCES players (profile_id)"
+        )
+    )
+    conn.execute(text("ALTER TABLE cheater_reports DROP COLUMN cheater_game_name"))
+    conn.execute(text("ALTER TABLE verified_legit DROP COLUMN tarkov_game_name"))
+
+
+def partition_reports(conn: Connection):
+    if is_partitioned(conn):
+        return
+
+    # Postgres cannot partition a table in place: move the old one aside, create the partitioned one and copy across
+    conn.execute(text("ALTER TABLE cheater_reports RENAME TO cheater_reports_legacy"))
+    conn.execute(text("ALTER TABLE cheater_reports_legacy RENAME CONSTRAINT cheater_reports_pkey TO cheater_reports_legacy_pkey"))
+    conn.execute(text("ALTER SEQUENCE cheater_reports_id_seq RENAME TO cheater_reports_legacy_id_seq"))
+    conn.execute(text("DROP INDEX IF EXISTS ix_cheater_reports_profile_reporter_type"))
+    conn.execute(text("DROP INDEX IF EXISTS ix_cheater_reports_notes"))
+    Base.metadata.create_all(conn, tables=[CheaterReport.__table__])
+
+    first = conn.execute(text("SELECT MIN(report_time) FROM cheater_reports_legacy WHERE report_time > 0")).scalar()
+    ensure_report_partitions(conn, settings.REPORT_PARTITIONS_AHEAD, first=first)
+
+    columns = "id, reporter_user_id, server_id, cheater_profile_id, report_time, report_type, notes, absolved, occurrences"
+    conn.execute(
+        text(
+            f"INSERT INTO cheater_reports ({columns}) "
+            "SELECT id, reporter_user_id, server_id, cheater_profile_id, COALESCE(report_time, 0), report_type, notes, absolved, occurrences "
+            "FROM cheater_reports_legacy"
+        )
+    )
+    conn.execute(
+        text("SELECT setval(pg_get_serial_sequence('cheater_reports', 'id'), COALESCE((SELECT MAX(id) FROM cheater_reports), 0) + 1, false)")
+    )
+    conn.execute(text("DROP TABLE cheater_reports_legacy"))
+
+
+def add_report_archive(conn: Connection):
+    ArchivedCheaterReport.__table__.create(conn, checkfirst=True)
+
+
+def add_report_time_indexes(conn: Connection):
+    # Created on the partitioned parent, so every existing and future partition gets a matching local index
+    conn.execute(text("CREATE INDEX IF NOT EXISTS ix_cheater_reports_time ON cheater_reports (report_time)"))
+    conn.execute(text("CREATE INDEX IF NOT EXISTS ix_cheater_reports_server_time ON cheater_reports (server_id, report_time)"))
+
+
+def add_daily_stats(conn: Connection):
+    for model in (ReportDailyStat, ReporterDailyStat, VerificationDailyStat):
+        model.__table__.create(conn, checkfirst=True)
+    backfill_daily_stats(conn)
+
+
+def add_applied_writes(conn: Connection):
+    AppliedWrite.__table__.create(conn, checkfirst=True)
+
+
+def backfill_daily_stats(conn: Connection):
+    # Rebuilds every rollup from history, archived reports included; safe to rerun
+    conn.execute(text("TRUNCATE report_daily_stats, reporter_daily_stats, verification_daily_stats"))
+    reports = (
+        "SELECT server_id, reporter_user_id, report_type, report_time FROM cheater_reports "
+        "UNION ALL SELECT server_id, reporter_user_id, report_type, report_time FROM cheater_reports_archive"
+    )
+    conn.execute(
+        text(
+            "INSERT INTO report_daily_stats (day, server_id, report_type, count) "
+            "SELECT COALESCE(report_time, 0) - COALESCE(report_time, 0) % 86400 AS day, COALESCE(server_id, 0), report_type, COUNT(*) "
+            f"FROM ({reports}) AS reports GROUP BY 1, 2, 3"
+        )
+    )
+    conn.execute(
+        text(
+            "INSERT INTO reporter_daily_stats (day, server_id, reporter_user_id, count) "
+            "SELECT COALESCE(report_time, 0) - COALESCE(report_time, 0) % 86400 AS day, COALESCE(server_id, 0), reporter_user_id, COUNT(*) "
+            f"FROM ({reports}) AS reports WHERE reporter_user_id IS NOT NULL GROUP BY 1, 2, 3"
+        )
+    )
+    conn.execute(
+        text(
+            "INSERT INTO verification_daily_stats (day, server_id, count) "
+            "SELECT COALESCE(verified_time, 0) - COALESCE(verified_time, 0) % 86400 AS day, COALESCE(server_id, 0), COUNT(*) "
+            "FROM verified_legit GROUP BY 1, 2"
+        )
+    )
+    logger.info("Backfilled daily statistics rollups")
+
+
+def rebuild_daily_stats() -> bool:
+    # Repairs rollups that drifted from the reports, e.g. after manual edits; TRUNCATE holds writers off until it commits
+    engine = get_engine()
+    if engine is None:
+        return False
+    try:
+        with engine.begin() as conn:
+            backfill_daily_stats(conn)
+        return True
+    except SQLAlchemyError as e:
+        logger.error(f"Error rebuilding daily statistics: {e}")
+        return False
+
+
+# version -> upgrade step applied to databases created before that version
+MIGRATIONS: Dict[int, Callable[[Connection], None]] = {
+    2: add_report_occurrences,
+    3: add_server_digest_interval,
+    4: add_server_webhook,
+    5: add_note_indexes,
+    6: add_players,
+    7: partition_reports,
+    8: add_report_archive,
+    9: add_report_time_indexes,
+    10: add_daily_stats,
+    11: add_applied_writes,
+}
+
+
+def get_schema_version(conn: Connection):
+    SchemaVersion.__table__.create(conn, checkfirst=True)
+    return conn.execute(select(SchemaVersion.version).where(SchemaVersion.id == 1)).scalar()
+
+
+def set_schema_version(conn: Connection, version: int):
+    if conn.execute(select(SchemaVersion.id).where(SchemaVersion.id == 1)).first():
+        conn.execute(SchemaVersion.__table__.update().where(SchemaVersion.id == 1).values(version=version))
+    else:
+        conn.execute(SchemaVersion.__table__.insert().values(id=1, version=version))
+
+
+def schema_is_current() -> bool:
+    # For processes that share a database someone else migrates; they only check they match the code
+    engine = get_engine()
+    if engine is None:
+        return False
+
+    try:
+        with engine.connect() as conn:
+            current = conn.execute(select(SchemaVersion.version).where(SchemaVersion.id == 1)).scalar()
+    except SQLAlchemyError as e:
+        logger.error(f"Error reading database schema version: {e}")
+        return False
+    if current != SCHEMA_VERSION:
+        logger.error(f"Database schema is at version {current}, expected {SCHEMA_VERSION}")
+        return False
+    return True
+
+
+def init_schema() -> bool:
+    engine = get_engine()
+    if engine is None:
+        return False
+
+    try:
+        with engine.begin() as conn:
+            current = get_schema_version(conn)
+            if current == SCHEMA_VERSION:
+                ensure_report_partitions(conn, settings.REPORT_PARTITIONS_AHEAD)
+                logger.info(f"Database schema is up to date (version {SCHEMA_VERSION})")
+                return True
+
+            if current is None and not inspect(conn).has_table(CheaterReportFields.TABLE_NAME.value):
+                # Fresh database: the models already describe the latest schema
+                Base.metadata.create_all(conn)
+                logger.info(f"Database schema created at version {SCHEMA_VERSION}")
+            else:
+                # Databases that predate version tracking are at the baseline schema
+                for version in range((current or 1) + 1, SCHEMA_VERSION + 1):
+                    logger.info(f"Migrating database schema to version {version}")
+                    MIGRATIONS[version](conn)
+                Base.metadata.create_all(conn)
+                logger.info(f"Database schema migrated from version {current or 1} to {SCHEMA_VERSION}")
+
+            ensure_report_partitions(conn, settings.REPORT_PARTITIONS_AHEAD)
+            set_schema_version(conn, SCHEMA_VERSION)
+        return True
+    except SQLAlchemyError as e:
+        logger.error(f"Error initializing database schema: {e}")
+        return False
@@ -0,0 +1,138 @@
+import asyncio
+import json
+import logging
+from typing import Optional
+
+from db.cache import entity_cache, list_cache, settings_cache
+from db.database import (
+    CACHE_EVENT_CHANNEL,
+    INSTANCE_ID,
+    DatabaseManager,
+    DatabaseUnavailableError,
+    DeadlineExceededError,
+    get_engine,
+)
+from db.deadline import deadline_at
+from db.snapshot import report_snapshot
+
+logger = logging.getLogger("database")
+
+
+class CacheEventListener:
+    def __init__(self, channel: str = CACHE_EVENT_CHANNEL, retry_delay: int = 5):
+        self.channel = channel
+        self.retry_delay = retry_delay
+        self.task: Optional[asyncio.Task] = None
+        self.connected_once = False
+
+    def start(self):
+        self.task = asyncio.create_task(self._run())
+
+    def _connect(self):
+        # A dedicated connection outside the pool: LISTEN only lives as long as the session that issued it
+        pooled = get_engine().raw_connection()
+        pooled.detach()
+        connection = pooled.dbapi_connection
+        connection.autocommit = True
+        with connection.cursor() as cursor:
+            cursor.execute(f'LISTEN "{self.channel}"')
+        return connection
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            connection = None
+            try:
+                connection = await asyncio.to_thread(self._connect)
+                if self.connected_once:
+                    # Events sent while we were disconnected are gone, so start from a clean slate
+                    await self._resynchronize()
+                self.connected_once = True
+                logger.info(f"Listening for cache events on '{self.channel}'")
+
+                lost = loop.create_future()
+                loop.add_reader(connection.fileno(), self._on_readable, connection, lost)
+                try:
+                    await lost
+                finally:
+                    loop.remove_reader(connection.fileno())
+            except Exception as e:
+                logger.warning(f"Cache event listener disconnected: {e}")
+            finally:
+                if connection is not None and not connection.closed:
+                    connection.close()
+            await asyncio.sleep(self.retry_delay)
+
+    def _on_readable(self, connection, lost: asyncio.Future):
+        try:
+            connection.poll()
+        except Exception as e:
+            if not lost.done():
+                lost.set_result(e)
+            return
+
+        while connection.notifies:
+            notify = connection.notifies.pop(0)
+            try:
+                message = json.loads(notify.payload)
+                if message.pop("origin") == INSTANCE_ID:
+                    continue
+                DatabaseManager.apply_cache_event(message.pop("event"), message)
+            except (ValueError, KeyError) as e:
+                logger.error(f"Malformed cache event {notify.payload!r}: {e}")
+
+    async def _resynchronize(self):
+        list_cache.clear()
+        settings_cache.clear()
+        entity_cache.clear()
+        report_snapshot.invalidate()
+
+
+class SnapshotReloader:
+    # Reloads the report snapshot in the background after it was invalidated, from any thread
+    def __init__(self, retry_delay: int = 30):
+        self.retry_delay = retry_delay
+        self.loop: Optional[asyncio.AbstractEventLoop] = None
+        self.task: Optional[asyncio.Task] = None
+        self.requested = False
+
+    def start(self):
+        self.loop = asyncio.get_running_loop()
+        report_snapshot.reload_hook = self.request
+
+    def request(self):
+        if self.loop is not None:
+            self.loop.call_soon_threadsafe(self._schedule)
+
+    def _schedule(self):
+        self.requested = True
+        if self.task is None or self.task.done():
+            self.task = asyncio.create_task(self._run())
+
+    async def _run(self):
+        # The task may have been scheduled from inside a command, whose deadline has nothing to do with this reload
+        with deadline_at(None):
+            await self._reload()
+
+    async def _reload(self):
+        while self.requested:
+            self.requested = False
+            changes = report_snapshot.changes
+            try:
+                rows = await asyncio.to_thread(DatabaseManager.get_report_snapshot_rows)
+                names = await asyncio.to_thread(DatabaseManager.get_player_names)
+            except (DatabaseUnavailableError, DeadlineExceededError) as e:
+                logger.warning(f"Report snapshot reload deferred: {e}")
+                rows = names = None
+            if rows is None or names is None:
+                logger.warning(f"Report snapshot reload failed, retrying in {self.retry_delay}s")
+                self.requested = True
+                await asyncio.sleep(self.retry_delay)
+            elif report_snapshot.changes != changes:
+                # A write landed while the rows were being read and may be missing from them
+                self.requested = True
+            else:
+                report_snapshot.load(rows, names)
+
+
+snapshot_reloader = SnapshotReloader()
@@ -0,0 +1,131 @@
+import logging
+import time
+from datetime import datetime, timezone
+from typing import List, Optional, Tuple
+
+from sqlalchemy import text
+from sqlalchemy.engine import Connection
+from sqlalchemy.exc import SQLAlchemyError
+
+import settings
+from db.database import CheaterReportFields, get_engine
+
+logger = logging.getLogger("database")
+
+REPORTS_TABLE = CheaterReportFields.TABLE_NAME.value
+DEFAULT_PARTITION = f"{REPORTS_TABLE}_default"
+
+
+def month_start(year: int, month: int) -> int:
+    return int(datetime(year, month, 1, tzinfo=timezone.utc).timestamp())
+
+
+def next_month(year: int, month: int) -> Tuple[int, int]:
+    return (year + 1, 1) if month == 12 else (year, month + 1)
+
+
+def partition_name(year: int, month: int) -> str:
+    return f"{REPORTS_TABLE}_y{year}m{month:02d}"
+
+
+def month_range(first: int, months_ahead: int, now: Optional[int] = None) -> List[Tuple[int, int]]:
+    # Every (year, month) from the month containing `first` through `months_ahead` months past the current one
+    start = datetime.fromtimestamp(first, tz=timezone.utc)
+    end = datetime.fromtimestamp(now if now is not None else time.time(), tz=timezone.utc)
+    year, month = end.year, end.month
+    for _ in range(months_ahead):
+        year, month = next_month(year, month)
+
+    months, current = [], (start.year, start.month)
+    while current <= (year, month):
+        months.append(current)
+        current = next_month(*current)
+    return months
+
+
+def is_partitioned(conn: Connection) -> bool:
+    return bool(
+        conn.execute(
+            text("SELECT 1 FROM pg_partitioned_table p JOIN pg_class c ON c.oid = p.partrelid WHERE c.relname = :table"),
+            {"table": REPORTS_TABLE},
+        ).scalar()
+    )
+
+
+def existing_partitions(conn: Connection) -> List[str]:
+    return list(
+        conn.execute(
+            text(
+                "SELECT child.relname FROM pg_inherits "
+                "JOIN pg_class parent ON parent.oid = pg_inherits.inhparent "
+                "JOIN pg_class child ON child.oid = pg_inherits.inhrelid "
+                "WHERE parent.relname = :table"
+            ),
+            {"table": REPORTS_TABLE},
+        ).scalars()
+    )
+
+
+def ensure_report_partitions(conn: Connection, months_ahead: int, first: Optional[int] = None) -> int:
+    if conn.dialect.name != "postgresql" or not is_partitioned(conn):
+        return 0
+
+    existing = set(existing_partitions(conn))
+    if DEFAULT_PARTITION not in existing:
+        # Catches rows with unusual timestamps instead of failing the insert
+        conn.execute(text(f'CREATE TABLE "{DEFAULT_PARTITION}" PARTITION OF "{REPORTS_TABLE}" DEFAULT'))
+
+    created = 0
+    for year, month in month_range(first if first is not None else int(time.time()), months_ahead):
+        name = partition_name(year, month)
+        if name in existing:
+            continue
+        create_report_partition(conn, year, month)
+        created += 1
+
+    if created:
+        logger.info(f"Created {created} report partition(s) up to {months_ahead} month(s) ahead")
+    return created
+
+
+def create_report_partition(conn: Connection, year: int, month: int):
+    name = partition_name(year, month)
+    lower, upper = month_start(year, month), month_start(*next_month(year, month))
+    in_range = f"report_time >= {lower} AND report_time < {upper}"
+
+    # Rows that landed in the default partition for this month would block creating it, so move them across
+    stranded = conn.execute(text(f'SELECT COUNT(*) FROM "{DEFAULT_PARTITION}" WHERE {in_range}')).scalar()
+    if stranded:
+        conn.execute(text(f'CREATE TEMP TABLE stranded_reports (LIKE "{REPORTS_TABLE}") ON COMMIT DROP'))
+        conn.execute(
+            text(
+                f'WITH moved AS (DELETE FROM "{DEFAULT_PARTITION}" WHERE {in_range} RETURNING *) '
+                "INSERT INTO stranded_reports SELECT * FROM moved"
+            )
+        )
+
+    conn.execute(text(f'CREATE TABLE "{name}" PARTITION OF "{REPORTS_TABLE}" FOR VALUES FROM ({lower}) TO ({upper})'))
+
+    if stranded:
+        conn.execute(text(f'INSERT INTO "{REPORTS_TABLE}" SELECT * FROM stranded_reports'))
+        conn.execute(text("DROP TABLE stranded_reports"))
+        logger.info(f"Moved {stranded} report(s) from the default partition into {name}")
+
+
+def maintain_report_partitions() -> Optional[int]:
+    engine = get_engine()
+    if engine is None:
+        return None
+    try:
+        with engine.begin() as conn:
+            return ensure_report_partitions(conn, settings.REPORT_PARTITIONS_AHEAD)
+    except SQLAlchemyError as e:
+        logger.error(f"Error maintaining report partitions: {e}")
+        return None
+
+
+def detach_report_partition(conn: Connection, year: int, month: int):
+    # The detached table keeps its rows and can be dumped or dropped without touching the live table
+    name = partition_name(year, month)
+    conn.execute(text(f'ALTER TABLE "{REPORTS_TABLE}" DETACH PARTITION "{name}"'))
+    logger.info(f"Detached report partition {name}")
@@ -0,0 +1,331 @@
+import logging
+import threading
+import time
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from db.heavy_hitters import SpaceSaving
+
+logger = logging.getLogger("database")
+
+# (profile_id, reporter_user_id, server_id, report_type code, report_time, absolved)
+ReportRow = Tuple[int, int, int, int, int, bool]
+
+# (profile_id, count, latest_name, latest_time, top_reporter_id, top_reporter_count)
+SummaryRow = Tuple[int, int, str, int, int, int]
+
+
+class ReportSnapshot:
+    COLUMNS = {
+        "profile_ids": np.int64,
+        "reporter_ids": np.int64,
+        "server_ids": np.int64,
+        "type_codes": np.int8,
+        "report_times": np.int64,
+        "absolved": np.bool_,
+    }
+
+    def __init__(self, initial_capacity: int = 1024):
+        self.loaded = False
+        # Set once the snapshot has been loaded; a reset snapshot is reloaded only if it was in use before
+        self.enabled = False
+        # Bumped on every change, applied or not, so a reload can tell whether it raced a write
+        self.changes = 0
+        # Called when the snapshot drops its rows and wants them reloaded in the background
+        self.reload_hook: Optional[Callable[[], None]] = None
+        # Held while columns, row count or lookup tables are swapped, so views never mix two generations
+        self._lock = threading.Lock()
+        self._size = 0
+        # profile_id -> current name, mirrored from the players table
+        self._names: Dict[int, str] = {}
+        # profile_id -> {type code (None for all types) -> top reporters among non-absolved reports}
+        self._top_reporters: Dict[int, Dict[Optional[int], SpaceSaving]] = {}
+        self._allocate(initial_capacity)
+
+    def __len__(self) -> int:
+        return self._size
+
+    @property
+    def nbytes(self) -> int:
+        return sum(getattr(self, column).nbytes for column in self.COLUMNS)
+
+    def _allocate(self, capacity: int):
+        columns = {column: np.zeros(capacity, dtype=dtype) for column, dtype in self.COLUMNS.items()}
+        with self._lock:
+            for column, values in columns.items():
+                setattr(self, column, values)
+
+    def _grow(self, min_capacity: int):
+        capacity = max(min_capacity, 2 * len(self.profile_ids))
+        columns = {}
+        for column, dtype in self.COLUMNS.items():
+            grown = np.zeros(capacity, dtype=dtype)
+            grown[: self._size] = getattr(self, column)[: self._size]
+            columns[column] = grown
+        with self._lock:
+            for column, values in columns.items():
+                setattr(self, column, values)
+
+    def reset(self):
+        self.changes += 1
+        self.loaded = False
+        with self._lock:
+            # Replaced rather than cleared, so views taken before the reset keep a coherent picture
+            self._size = 0
+            self._names = {}
+            self._top_reporters = {}
+        self._allocate(1024)
+
+    def load(self, rows: Iterable[ReportRow], names: Dict[int, str]):
+        start = time.perf_counter()
+        rows = list(rows)
+        self.reset()
+        self._allocate(max(len(rows), 1024))
+        self._names.update(names)
+
+        if rows:
+            profile_ids, reporter_ids, server_ids, type_codes, report_times, absolved = zip(*rows)
+            size = len(rows)
+            self.profile_ids[:size] = profile_ids
+            self.reporter_ids[:size] = [reporter_id or 0 for reporter_id in reporter_ids]
+            self.server_ids[:size] = [server_id or 0 for server_id in server_ids]
+            self.type_codes[:size] = type_codes
+            self.report_times[:size] = [report_time or 0 for report_time in report_times]
+            self.absolved[:size] = [bool(flag) for flag in absolved]
+            with self._lock:
+                self._size = size
+
+            for profile_id, reporter_id, _, type_code, _, is_absolved in rows:
+                if not is_absolved:
+                    self._track_reporter(profile_id, type_code, reporter_id or 0)
+
+        self.loaded = True
+        self.enabled = True
+        logger.info(
+            f"Loaded report snapshot with {self._size} rows and {len(self._names)} names "
+            f"({self.nbytes / 1024 / 1024:.1f} MiB) in {time.perf_counter() - start:.2f}s"
+        )
+
+    def invalidate(self):
+        # For changes that can't be applied in place; readers use the database until the rows are reloaded
+        if not self.enabled:
+            return
+        self.reset()
+        if self.reload_hook is not None:
+            self.reload_hook()
+
+    def append(self, row: ReportRow):
+        self.changes += 1
+        if not self.loaded:
+            return
+        if self._size == len(self.profile_ids):
+            self._grow(self._size + 1)
+
+        profile_id, reporter_id, server_id, type_code, report_time, absolved = row
+        i = self._size
+        self.profile_ids[i] = profile_id
+        self.reporter_ids[i] = reporter_id or 0
+        self.server_ids[i] = server_id or 0
+        self.type_codes[i] = type_code
+        self.report_times[i] = report_time or 0
+        self.absolved[i] = bool(absolved)
+        with self._lock:
+            self._size += 1
+        if not absolved:
+            self._track_reporter(profile_id, type_code, reporter_id or 0)
+
+    def rename(self, profile_id: int, name: str):
+        self.changes += 1
+        if self.loaded and name:
+            self._names[profile_id] = name
+
+    def _track_reporter(self, profile_id: int, type_code: int, reporter_id: int):
+        sketches = self._top_reporters.setdefault(profile_id, {})
+        for key in (type_code, None):
+            sketch = sketches.get(key)
+            if sketch is None:
+                sketch = sketches[key] = SpaceSaving()
+            sketch.add(reporter_id)
+
+    def absolve(self, profile_id: int):
+        self.changes += 1
+        if not self.loaded:
+            return
+        rows = self.profile_ids[: self._size] == profile_id
+        self.absolved[: self._size][rows] = True
+        self._top_reporters.pop(profile_id, None)
+
+    def retire(self, older_than: int):
+        # Archived reports leave the hot table; flag them inactive here rather than compacting arrays readers may hold
+        self.changes += 1
+        if not self.loaded:
+            return
+        rows = np.flatnonzero(~self.absolved[: self._size] & (self.report_times[: self._size] < older_than))
+        if rows.size == 0:
+            return
+        self.absolved[rows] = True
+
+        affected = np.unique(self.profile_ids[rows])
+        for profile_id in affected.tolist():
+            self._top_reporters.pop(profile_id, None)
+        # One masked pass finds what is still active for every affected profile at once
+        active = np.flatnonzero(~self.absolved[: self._size] & np.isin(self.profile_ids[: self._size], affected))
+        self._rebuild_top_reporters(active)
+
+    def _rebuild_top_reporters(self, rows: np.ndarray):
+        if rows.size == 0:
+            return
+        profile_ids = self.profile_ids[rows]
+        reporter_ids = self.reporter_ids[rows]
+        type_codes = self.type_codes[rows].astype(np.int64)
+
+        # Exact counts per (profile, type, reporter) and per (profile, reporter), fed to the sketches largest first
+        by_type = np.stack([profile_ids, type_codes, reporter_ids])
+        by_profile = np.stack([profile_ids, reporter_ids])
+        for keys, typed in ((by_type, True), (by_profile, False)):
+            groups, counts = np.unique(keys, axis=1, return_counts=True)
+            for g in np.argsort(-counts, kind="stable").tolist():
+                profile_id, reporter_id = int(groups[0, g]), int(groups[-1, g])
+                key = int(groups[1, g]) if typed else None
+                sketches = self._top_reporters.setdefault(profile_id, {})
+                sketch = sketches.get(key)
+                if sketch is None:
+                    sketch = sketches[key] = SpaceSaving()
+                sketch.add(reporter_id, int(counts[g]))
+
+    def view(self) -> "SnapshotView":
+        # Worker threads read a consistent set of columns and row count, however the loop grows or resets the snapshot meanwhile
+        with self._lock:
+            return SnapshotView({column: getattr(self, column) for column in self.COLUMNS}, self._size, self._names, self._top_reporters)
+
+    def top_reporter(self, profile_id: int, type_code: Optional[int] = None) -> Optional[Tuple[int, int]]:
+        return self.view().top_reporter(profile_id, type_code)
+
+    def summarize(
+        self,
+        type_code: Optional[int] = None,
+        reporter_id: Optional[int] = None,
+        since: Optional[int] = None,
+        server_id: Optional[int] = None,
+    ) -> List[SummaryRow]:
+        return self.view().summarize(type_code, reporter_id, since, server_id)
+
+    def cheater_details(self, profile_id: int, type_codes: Iterable[int], top_servers: int = 3) -> Optional[Dict[str, Any]]:
+        return self.view().cheater_details(profile_id, type_codes, top_servers)
+
+
+class SnapshotView:
+    # Read-only view of one generation of the snapshot. The loop appends past `_size`, flips absolved flags in place and
+    # replaces whole arrays and tables, so nothing a view captured changes shape underneath it
+    def __init__(self, columns: Dict[str, np.ndarray], size: int, names: Dict[int, str], top_reporters):
+        for column, values in columns.items():
+            setattr(self, column, values)
+        self._size = size
+        self._names = names
+        self._top_reporters: Dict[int, Dict[Optional[int], SpaceSaving]] = top_reporters
+
+    def top_reporter(self, profile_id: int, type_code: Optional[int] = None) -> Optional[Tuple[int, int]]:
+        sketch = self._top_reporters.get(profile_id, {}).get(type_code)
+        return sketch.top if sketch else None
+
+    def _active_rows(
+        self,
+        type_code: Optional[int] = None,
+        reporter_id: Optional[int] = None,
+        since: Optional[int] = None,
+        server_id: Optional[int] = None,
+    ) -> np.ndarray:
+        mask = ~self.absolved[: self._size]
+        if type_code is not None:
+            mask &= self.type_codes[: self._size] == type_code
+        if reporter_id is not None:
+            mask &= self.reporter_ids[: self._size] == reporter_id
+        if since is not None:
+            mask &= self.report_times[: self._size] >= since
+        if server_id is not None:
+            mask &= self.server_ids[: self._size] == server_id
+        return np.flatnonzero(mask)
+
+    @staticmethod
+    def _group_ends(sorted_keys: np.ndarray) -> np.ndarray:
+        # Position of the last element of every run in an already sorted key array
+        return np.r_[np.flatnonzero(np.diff(sorted_keys)), sorted_keys.size - 1]
+
+    def summarize(
+        self,
+        type_code: Optional[int] = None,
+        reporter_id: Optional[int] = None,
+        since: Optional[int] = None,
+        server_id: Optional[int] = None,
+    ) -> List[SummaryRow]:
+        rows = self._active_rows(type_code, reporter_id, since, server_id)
+        if rows.size == 0:
+            return []
+
+        profile_ids, groups, counts = np.unique(self.profile_ids[rows], return_inverse=True, return_counts=True)
+        report_times = self.report_times[rows]
+
+        latest = np.lexsort((report_times, groups))
+        latest_rows = rows[latest[self._group_ends(groups[latest])]]
+
+        windowed = since is not None or server_id is not None
+        if windowed and reporter_id is None:
+            # The sketches cover all time and every server, so a windowed view ranks reporters from its own rows
+            window_reporters, window_counts = self._top_reporters_by_group(rows, groups)
+
+        summary = []
+        for g in np.argsort(-counts, kind="stable"):
+            profile_id, count = int(profile_ids[g]), int(counts[g])
+            if reporter_id is not None:
+                top_reporter, top_count = reporter_id, count
+            elif windowed:
+                top_reporter, top_count = int(window_reporters[g]), int(window_counts[g])
+            else:
+                top_reporter, top_count = self.top_reporter(profile_id, type_code) or (0, 0)
+            summary.append(
+                (
+                    profile_id,
+                    count,
+                    self._names.get(profile_id, ""),
+                    int(self.report_times[latest_rows[g]]),
+                    top_reporter,
+                    top_count,
+                )
+            )
+        return summary
+
+    def _top_reporters_by_group(self, rows: np.ndarray, groups: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        # Exact per-group top reporter: count (group, reporter) pairs, then keep the largest count in each group
+        pairs, pair_counts = np.unique(np.stack([groups, self.reporter_ids[rows]]), axis=1, return_counts=True)
+        order = np.lexsort((pair_counts, pairs[0]))
+        best = order[self._group_ends(pairs[0][order])]
+        return pairs[1][best], pair_counts[best]
+
+    def cheater_details(self, profile_id: int, type_codes: Iterable[int], top_servers: int = 3) -> Optional[Dict[str, Any]]:
+        profile_rows = np.flatnonzero(self.profile_ids[: self._size] == profile_id)
+        if profile_rows.size == 0:
+            return None
+
+        details: Dict[str, Any] = {"id": profile_id, "name": self._names.get(profile_id, ""), "reports": {}}
+
+        active = profile_rows[~self.absolved[profile_rows]]
+        for type_code in type_codes:
+            rows = active[self.type_codes[active] == type_code]
+            last_row = rows[np.argmax(self.report_times[rows])] if rows.size else None
+            top = self.top_reporter(profile_id, type_code)
+            details["reports"][type_code] = {
+                "total": int(rows.size),
+                "last_reported_by": int(self.reporter_ids[last_row]) if last_row is not None else None,
+                "last_report_time": int(self.report_times[last_row]) if last_row is not None else None,
+                "most_reported_by": {"user_id": top[0], "count": top[1]} if top else None,
+            }
+
+        servers, server_counts = np.unique(self.server_ids[active], return_counts=True)
+        ranking = np.argsort(-server_counts, kind="stable")[:top_servers]
+        details["top_reported_servers"] = [{"server_id": int(servers[i]), "count": int(server_counts[i])} for i in ranking]
+        details["most_reported_server"] = details["top_reported_servers"][0] if ranking.size else None
+        return details
+
+
+report_snapshot = ReportSnapshot()
@@ -0,0 +1,99 @@
+import json
+import logging
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+import settings
+
+logger = logging.getLogger("database")
+
+
+class WriteSpool:
+    # Append-only queue of writes that could not reach Postgres, kept on local disk until they are replayed
+    def __init__(self, path: Path):
+        self.path = path
+        self._connection: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+        self._pending: Optional[int] = None
+
+    @property
+    def connection(self) -> sqlite3.Connection:
+        if self._connection is None:
+            self._connection = sqlite3.connect(self.path, isolation_level=None, check_same_thread=False)
+            self._connection.execute("PRAGMA journal_mode=WAL")
+            self._connection.execute("PRAGMA synchronous=FULL")
+            self._connection.execute(
+                "CREATE TABLE IF NOT EXISTS spooled_writes ("
+                "seq INTEGER PRIMARY KEY AUTOINCREMENT, operation TEXT NOT NULL, payload TEXT NOT NULL, spooled_time REAL NOT NULL)"
+            )
+            # Entries Postgres rejected outright; kept for inspection instead of blocking everything queued behind them
+            self._connection.execute(
+                "CREATE TABLE IF NOT EXISTS dead_letter_writes ("
+                "seq INTEGER PRIMARY KEY, operation TEXT NOT NULL, payload TEXT NOT NULL, spooled_time REAL NOT NULL, "
+                "error TEXT NOT NULL, failed_time REAL NOT NULL)"
+            )
+        return self._connection
+
+    def __len__(self) -> int:
+        # Counted once from disk, then tracked in memory so the write path can check it for free
+        if self._pending is None:
+            with self._lock:
+                self._pending = self.connection.execute("SELECT COUNT(*) FROM spooled_writes").fetchone()[0]
+        return self._pending
+
+    def append(self, operation: str, payload: Dict[str, Any]):
+        with self._lock:
+            self.connection.execute(
+                "INSERT INTO spooled_writes (operation, payload, spooled_time) VALUES (?, ?, ?)",
+                (operation, json.dumps(payload), time.time()),
+            )
+            if self._pending is not None:
+                self._pending += 1
+        logger.warning(f"Spooled {operation} to {self.path.name} until the database is reachable")
+
+    def peek(self, limit: int = 100) -> List[Tuple[int, str, Dict[str, Any]]]:
+        with self._lock:
+            rows = self.connection.execute(
+                "SELECT seq, operation, payload FROM spooled_writes ORDER BY seq LIMIT ?", (limit,)
+            ).fetchall()
+        return [(seq, operation, json.loads(payload)) for seq, operation, payload in rows]
+
+    def remove(self, seq: int):
+        with self._lock:
+            self.connection.execute("DELETE FROM spooled_writes WHERE seq = ?", (seq,))
+            if self._pending:
+                self._pending -= 1
+
+    def dead_letter(self, seq: int, error: str):
+        with self._lock:
+            connection = self.connection
+            connection.execute("BEGIN IMMEDIATE")
+            try:
+                connection.execute(
+                    "INSERT OR REPLACE INTO dead_letter_writes (seq, operation, payload, spooled_time, error, failed_time) "
+                    "SELECT seq, operation, payload, spooled_time, ?, ? FROM spooled_writes WHERE seq = ?",
+                    (error, time.time(), seq),
+                )
+                connection.execute("DELETE FROM spooled_writes WHERE seq = ?", (seq,))
+                connection.execute("COMMIT")
+            except Exception:
+                connection.execute("ROLLBACK")
+                raise
+            if self._pending:
+                self._pending -= 1
+
+    def dead_letters(self) -> List[Tuple[int, str, Dict[str, Any], str]]:
+        with self._lock:
+            rows = self.connection.execute("SELECT seq, operation, payload, error FROM dead_letter_writes ORDER BY seq").fetchall()
+        return [(seq, operation, json.loads(payload), error) for seq, operation, payload, error in rows]
+
+    def close(self):
+        if self._connection is not None:
+            self._connection.close()
+            self._connection = None
+
+
+write_spool = WriteSpool(settings.DATA_DIR / (f"write_spool-{settings.LOG_TAG}.sqlite3" if settings.LOG_TAG else "write_spool.sqlite3"))
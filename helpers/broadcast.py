@@ -0,0 +1,189 @@
+import asyncio
+import logging
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+import aiohttp
+import discord
+
+import db.database
+import settings
+from helpers.scheduler import timeout_scheduler
+
+logger = logging.getLogger(__name__)
+
+# Discord's per-message limits
+MAX_EMBEDS_PER_MESSAGE = 10
+MAX_EMBED_CHARACTERS_PER_MESSAGE = 6000
+
+# Any of these leaves the webhook unusable for now; the bot can still post to the channel itself
+WEBHOOK_ERRORS = (discord.HTTPException, db.database.DatabaseConnectionError, db.database.DeadlineExceededError)
+
+
+def batch_embeds(embeds: List[discord.Embed]) -> List[List[discord.Embed]]:
+    batches, batch, size = [], [], 0
+    for embed in embeds:
+        if batch and (len(batch) >= MAX_EMBEDS_PER_MESSAGE or size + len(embed) > MAX_EMBED_CHARACTERS_PER_MESSAGE):
+            batches.append(batch)
+            batch, size = [], 0
+        batch.append(embed)
+        size += len(embed)
+    if batch:
+        batches.append(batch)
+    return batches
+
+
+class WebhookTransport:
+    def __init__(self):
+        self._session: Optional[aiohttp.ClientSession] = None
+        # guild id -> (channel id, webhook bound to the pooled session)
+        self._webhooks: Dict[int, Tuple[int, discord.Webhook]] = {}
+
+    @property
+    def session(self) -> aiohttp.ClientSession:
+        # One connection pool shared by every webhook, separate from the bot's own HTTP client and its route limits
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession()
+        return self._session
+
+    def forget(self, guild_id: int):
+        self._webhooks.pop(guild_id, None)
+
+    async def _stored(self, guild_id: int) -> Optional[Dict[str, Any]]:
+        server_settings = await asyncio.to_thread(db.database.DatabaseManager.get_server_settings, guild_id)
+        if server_settings is None:
+            # Only a failed read comes back as None; without it there is no telling which webhook is ours
+            raise db.database.DatabaseConnectionError(f"Could not read server settings for guild {guild_id}")
+        return server_settings[0] if server_settings else None
+
+    async def create(self, channel: discord.TextChannel) -> discord.Webhook:
+        # Discord allows 15 webhooks per channel, so adopt one this bot already owns there before making another
+        me = channel.guild.me
+        existing = next((hook for hook in await channel.webhooks() if hook.user and hook.user.id == me.id and hook.token), None)
+        if existing is not None:
+            found, action = existing, "Reused"
+        else:
+            found, action = await channel.create_webhook(name=settings.BOT_NAME, reason="Report broadcasts"), "Created"
+        await asyncio.to_thread(db.database.DatabaseManager.update_server_webhook, channel.guild.id, found.id, found.token)
+        webhook = discord.Webhook.partial(found.id, found.token, session=self.session)
+        self._webhooks[channel.guild.id] = (channel.id, webhook)
+        logger.info(f"{action} broadcast webhook {found.id} in channel {channel.id}")
+        return webhook
+
+    async def replace(self, channel: discord.TextChannel):
+        setting = await self._stored(channel.guild.id)
+        self.forget(channel.guild.id)
+        if setting and setting.get("webhook_id"):
+            previous = discord.Webhook.partial(setting["webhook_id"], setting["webhook_token"], session=self.session)
+            try:
+                current = await previous.fetch()
+            except discord.NotFound:
+                current = None
+            if current is not None and current.channel_id == channel.id:
+                # Re-selecting the same channel keeps its webhook rather than deleting and recreating it
+                self._webhooks[channel.guild.id] = (channel.id, previous)
+                logger.info(f"Kept broadcast webhook {current.id} in channel {channel.id}")
+                return
+            if current is not None:
+                # The previous webhook would otherwise linger in the old reporting channel
+                try:
+                    await previous.delete(reason="Reporting channel changed")
+                except discord.HTTPException as e:
+                    logger.warning(f"Failed to delete previous broadcast webhook {setting['webhook_id']}: {e}")
+        await self.create(channel)
+
+    async def _get(self, channel: discord.TextChannel) -> Optional[discord.Webhook]:
+        cached = self._webhooks.get(channel.guild.id)
+        if cached is not None and cached[0] == channel.id:
+            return cached[1]
+
+        setting = await self._stored(channel.guild.id)
+        if not setting or not setting.get("webhook_id") or setting.get("channel_id") != channel.id:
+            return None
+
+        webhook = discord.Webhook.partial(setting["webhook_id"], setting["webhook_token"], session=self.session)
+        self._webhooks[channel.guild.id] = (channel.id, webhook)
+        return webhook
+
+    async def send(self, channel: discord.TextChannel, embeds: List[discord.Embed]):
+        webhook = await self._get(channel) or await self.create(channel)
+        me = channel.guild.me
+        options = {"embeds": embeds, "silent": True, "username": me.display_name, "avatar_url": me.display_avatar.url}
+        try:
+            await webhook.send(**options)
+        except discord.NotFound:
+            logger.warning(f"Broadcast webhook for channel {channel.id} was deleted, recreating it")
+            self.forget(channel.guild.id)
+            webhook = await self.create(channel)
+            await webhook.send(**options)
+
+    async def close(self):
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+
+
+webhook_transport = WebhookTransport()
+# Another instance may have replaced or deleted a guild's webhook; its server_settings event drops our copy
+db.database.settings_listeners.append(webhook_transport.forget)
+
+
+async def prepare_channel(channel: discord.TextChannel) -> bool:
+    if settings.BROADCAST_TRANSPORT != "webhook":
+        return True
+    try:
+        await webhook_transport.replace(channel)
+        return True
+    except WEBHOOK_ERRORS as e:
+        logger.warning(f"Could not set up a broadcast webhook in channel {channel.id}: {e}")
+        return False
+
+
+async def deliver(channel: discord.TextChannel, embeds: List[discord.Embed]):
+    if settings.BROADCAST_TRANSPORT == "webhook":
+        try:
+            await webhook_transport.send(channel, embeds)
+            return
+        except WEBHOOK_ERRORS as e:
+            logger.warning(f"Webhook delivery to channel {channel.id} failed, posting as the bot instead: {e}")
+    await channel.send(embeds=embeds, silent=True)
+
+
+class DigestBroadcaster:
+    def __init__(self):
+        # channel id -> (channel, buffered embeds in arrival order)
+        self._buffers: Dict[int, Tuple[discord.abc.Messageable, List[discord.Embed]]] = {}
+
+    def __len__(self) -> int:
+        return sum(len(embeds) for _, embeds in self._buffers.values())
+
+    async def add(self, channel: discord.abc.Messageable, embed: discord.Embed, interval: int):
+        _, embeds = self._buffers.setdefault(channel.id, (channel, []))
+        embeds.append(embed)
+
+        if len(embeds) >= MAX_EMBEDS_PER_MESSAGE:
+            timeout_scheduler.cancel(("digest", channel.id))
+            await self.flush(channel.id)
+        elif len(embeds) == 1:
+            # The first buffered embed starts the clock; later ones ride along with it
+            timeout_scheduler.schedule(("digest", channel.id), time.time() + interval, lambda: self.flush(channel.id))
+
+    async def flush(self, channel_id: int):
+        buffered = self._buffers.pop(channel_id, None)
+        if buffered is None:
+            return
+
+        channel, embeds = buffered
+        for batch in batch_embeds(embeds):
+            try:
+                await deliver(channel, batch)
+                logger.info(f"Digest of {len(batch)} embeds sent to channel {channel_id}")
+            except Exception as e:
+                logger.error(f"Failed to send digest to channel {channel_id}: {e}")
+
+    async def flush_all(self):
+        for channel_id in list(self._buffers):
+            timeout_scheduler.cancel(("digest", channel_id))
+            await self.flush(channel_id)
+
+
+digest_broadcaster = DigestBroadcaster()
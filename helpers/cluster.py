@@ -0,0 +1,137 @@
+import asyncio
+import json
+import logging
+from typing import Awaitable, Callable, Dict, List, Optional, Set
+
+import settings
+
+logger = logging.getLogger(__name__)
+
+MessageHandler = Callable[[Dict], Awaitable[None]]
+
+
+def shard_for_guild(guild_id: int, shard_count: int) -> int:
+    return (guild_id >> 22) % shard_count
+
+
+def split_shards(shard_count: int, cluster_count: int) -> List[List[int]]:
+    per_cluster, remainder = divmod(shard_count, cluster_count)
+    clusters, start = [], 0
+    for cluster_id in range(cluster_count):
+        size = per_cluster + (1 if cluster_id < remainder else 0)
+        clusters.append(list(range(start, start + size)))
+        start += size
+    return clusters
+
+
+async def _send(writer: asyncio.StreamWriter, message: Dict):
+    writer.write(json.dumps(message).encode() + b"\n")
+    await writer.drain()
+
+
+class Coordinator:
+    def __init__(self, host: str = settings.CLUSTER_COORDINATOR_HOST, port: int = settings.CLUSTER_COORDINATOR_PORT):
+        self.host = host
+        self.port = port
+        self.workers: Dict[int, asyncio.StreamWriter] = {}
+        self.server: Optional[asyncio.AbstractServer] = None
+
+    async def start(self):
+        self.server = await asyncio.start_server(self._handle_worker, self.host, self.port)
+        logger.info(f"Cluster coordinator listening on {self.host}:{self.port}")
+
+    async def _handle_worker(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        cluster_id = None
+        try:
+            while line := await reader.readline():
+                message = json.loads(line)
+                if message["op"] == "hello":
+                    cluster_id = message["cluster_id"]
+                    self.workers[cluster_id] = writer
+                    logger.info(f"Cluster {cluster_id} connected ({len(self.workers)} online)")
+                else:
+                    await self._relay(message, origin=cluster_id)
+        except (ConnectionError, ValueError, KeyError) as e:
+            logger.warning(f"Dropping connection to cluster {cluster_id}: {e}")
+        finally:
+            if cluster_id is not None and self.workers.get(cluster_id) is writer:
+                del self.workers[cluster_id]
+                logger.info(f"Cluster {cluster_id} disconnected")
+            writer.close()
+
+    async def _relay(self, message: Dict, origin: Optional[int]):
+        for cluster_id, writer in list(self.workers.items()):
+            if cluster_id == origin:
+                continue
+            try:
+                await _send(writer, message)
+            except ConnectionError as e:
+                logger.warning(f"Failed to relay '{message['op']}' to cluster {cluster_id}: {e}")
+
+
+class ClusterClient:
+    def __init__(
+        self,
+        cluster_id: int,
+        shard_ids: List[int],
+        shard_count: int,
+        host: str = settings.CLUSTER_COORDINATOR_HOST,
+        port: int = settings.CLUSTER_COORDINATOR_PORT,
+    ):
+        self.cluster_id = cluster_id
+        self.shard_ids = set(shard_ids)
+        self.shard_count = shard_count
+        self.host = host
+        self.port = port
+        self.handlers: Dict[str, MessageHandler] = {}
+        self.writer: Optional[asyncio.StreamWriter] = None
+        self.task: Optional[asyncio.Task] = None
+        # Handlers run as their own tasks so a slow one can't stall the connection; held here until they finish
+        self._dispatching: Set[asyncio.Task] = set()
+
+    @property
+    def is_leader(self) -> bool:
+        return self.cluster_id == 0
+
+    def owns_guild(self, guild_id: int) -> bool:
+        return shard_for_guild(guild_id, self.shard_count) in self.shard_ids
+
+    def on(self, op: str, handler: MessageHandler):
+        self.handlers[op] = handler
+
+    def start(self):
+        self.task = asyncio.create_task(self._run())
+
+    async def publish(self, op: str, **payload):
+        if self.writer is None:
+            logger.warning(f"Coordinator unavailable, '{op}' not relayed to other clusters")
+            return
+        try:
+            await _send(self.writer, {"op": op, **payload})
+        except ConnectionError as e:
+            logger.warning(f"Failed to publish '{op}' to coordinator: {e}")
+
+    async def _run(self):
+        while True:
+            try:
+                reader, writer = await asyncio.open_connection(self.host, self.port)
+                await _send(writer, {"op": "hello", "cluster_id": self.cluster_id})
+                self.writer = writer
+                logger.info(f"Cluster {self.cluster_id} connected to coordinator {self.host}:{self.port}")
+                while line := await reader.readline():
+                    task = asyncio.create_task(self._dispatch(json.loads(line)))
+                    self._dispatching.add(task)
+                    task.add_done_callback(self._dispatching.discard)
+            except (OSError, ValueError) as e:
+                logger.warning(f"Coordinator connection lost: {e}")
+            self.writer = None
+            await asyncio.sleep(5)
+
+    async def _dispatch(self, message: Dict):
+        handler = self.handlers.get(message.get("op"))
+        if handler is None:
+            return
+        try:
+            await handler(message)
+        except Exception as e:
+            logger.error(f"Cluster handler for '{message.get('op')}' failed: {e}")
@@ -0,0 +1,105 @@
+import asyncio
+import hashlib
+import json
+import logging
+import pathlib
+from typing import Dict, List
+
+import discord
+
+import settings
+
+logger = logging.getLogger(__name__)
+
+
+class CommandSyncer:
+    def __init__(
+        self,
+        bot,
+        state_path: pathlib.Path = settings.DATA_DIR / "command_sync.json",
+        mode: str = settings.COMMAND_SYNC_MODE,
+        concurrency: int = settings.COMMAND_SYNC_CONCURRENCY,
+        leader: bool = True,
+    ):
+        self.bot = bot
+        self.state_path = state_path
+        self.mode = mode
+        # Only one process of a cluster registers global commands; guild syncs stay with the cluster owning the guild
+        self.leader = leader
+        self.semaphore = asyncio.Semaphore(concurrency)
+        self.state = self._load_state()
+
+    def _load_state(self) -> Dict:
+        try:
+            with open(self.state_path, "r") as f:
+                state = json.load(f)
+            return {"global": state.get("global"), "guilds": state.get("guilds", {})}
+        except FileNotFoundError:
+            return {"global": None, "guilds": {}}
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable command sync state {self.state_path}: {e}")
+            return {"global": None, "guilds": {}}
+
+    def _save_state(self):
+        tmp_path = self.state_path.with_suffix(".tmp")
+        with open(tmp_path, "w") as f:
+            json.dump(self.state, f)
+        tmp_path.replace(self.state_path)
+
+    def fingerprint(self) -> str:
+        payload = sorted(
+            (command.to_dict(self.bot.tree) for command in self.bot.tree.get_commands()),
+            key=lambda command: (command.get("type", 1), command["name"]),
+        )
+        return hashlib.sha256(json.dumps(payload, sort_keys=True).encode()).hexdigest()
+
+    async def sync(self, guilds: List[discord.Guild], force: bool = False):
+        fingerprint = self.fingerprint()
+        if self.mode == "global":
+            await self._sync_global(fingerprint, guilds, force)
+        else:
+            await self._sync_guilds(fingerprint, guilds, force)
+        self._save_state()
+
+    async def _sync_global(self, fingerprint: str, guilds: List[discord.Guild], force: bool):
+        if not self.leader:
+            logger.info("Global commands are synced by the leader cluster")
+        elif force or self.state["global"] != fingerprint:
+            await self.bot.tree.sync()
+            self.state["global"] = fingerprint
+            logger.info("Global commands synced")
+        else:
+            logger.info("Global commands unchanged, skipping sync")
+
+        # Guild copies left over from guild mode would show every command twice
+        stale = [guild for guild in guilds if str(guild.id) in self.state["guilds"]]
+        await asyncio.gather(*(self._clear_guild(guild) for guild in stale))
+
+    async def _sync_guilds(self, fingerprint: str, guilds: List[discord.Guild], force: bool):
+        pending = [guild for guild in guilds if force or self.state["guilds"].get(str(guild.id)) != fingerprint]
+        logger.info(f"Syncing commands for {len(pending)} of {len(guilds)} guild(s)")
+        await asyncio.gather(*(self._sync_guild(guild, fingerprint) for guild in pending))
+
+    async def _sync_guild(self, guild: discord.Guild, fingerprint: str):
+        async with self.semaphore:
+            try:
+                self.bot.tree.copy_global_to(guild=guild)
+                await self.bot.tree.sync(guild=guild)
+                self.state["guilds"][str(guild.id)] = fingerprint
+                logger.info(f"Commands synced for guild: {guild.name}")
+            except discord.HTTPException as e:
+                logger.error(f"Failed to sync commands for guild {guild.name} ({guild.id}): {e}")
+
+    async def _clear_guild(self, guild: discord.Guild):
+        async with self.semaphore:
+            try:
+                self.bot.tree.clear_commands(guild=guild)
+                await self.bot.tree.sync(guild=guild)
+                self.state["guilds"].pop(str(guild.id), None)
+                logger.info(f"Cleared guild command copies for guild: {guild.name}")
+            except discord.HTTPException as e:
+                logger.error(f"Failed to clear commands for guild {guild.name} ({guild.id}): {e}")
+
+    def forget(self, guild: discord.Guild):
+        if self.state["guilds"].pop(str(guild.id), None) is not None:
+            self._save_state()
@@ -0,0 +1,164 @@
+import asyncio
+import functools
+import logging
+from typing import Dict, Optional, Tuple
+
+import discord
+from discord.ext import commands
+
+import settings
+from db.database import DeadlineExceededError
+from db.deadline import QueryScope, deadline_at
+
+logger = logging.getLogger(__name__)
+
+
+# Discord's "Interaction has already been acknowledged"
+ALREADY_ACKNOWLEDGED = 40060
+
+
+def response_lock(interaction: discord.Interaction) -> asyncio.Lock:
+    # is_done() only flips once the defer or reply has come back from Discord, so the two take turns instead of racing
+    return interaction.extras.setdefault("response_lock", asyncio.Lock())
+
+
+def _already_acknowledged(error: Exception) -> bool:
+    return isinstance(error, discord.InteractionResponded) or (
+        isinstance(error, discord.HTTPException) and error.code == ALREADY_ACKNOWLEDGED
+    )
+
+
+class AutoDefer:
+    # Discord fails an interaction that isn't acknowledged within 3 seconds of being created, so defer shortly before that
+    def __init__(self, interaction: discord.Interaction, ephemeral: bool = True, budget: Optional[float] = None):
+        self.interaction = interaction
+        self.ephemeral = ephemeral
+        self.budget = settings.INTERACTION_DEFER_BUDGET if budget is None else budget
+        self._task: Optional[asyncio.Task] = None
+        self._deferring = False
+
+    @property
+    def remaining(self) -> float:
+        elapsed = (discord.utils.utcnow() - self.interaction.created_at).total_seconds()
+        return self.budget - elapsed
+
+    def start(self):
+        self._task = asyncio.create_task(self._defer_when_due())
+
+    def cancel(self):
+        # A defer already on its way to Discord must finish, or nobody knows whether the interaction was acknowledged
+        if self._task is not None and not self._task.done() and not self._deferring:
+            self._task.cancel()
+
+    async def _defer_when_due(self):
+        await asyncio.sleep(max(0.0, self.remaining))
+        self._deferring = True
+        async with response_lock(self.interaction):
+            if self.interaction.response.is_done():
+                return
+            try:
+                if self.interaction.type == discord.InteractionType.component:
+                    # Component clicks edit their own message, so acknowledge without a new "thinking…" message
+                    await self.interaction.response.defer()
+                else:
+                    await self.interaction.response.defer(ephemeral=self.ephemeral, thinking=True)
+                    self.interaction.extras["deferred_ephemeral"] = self.ephemeral
+                logger.info(f"Deferred interaction {self.interaction.id} after spending its {self.budget}s budget")
+            except discord.HTTPException as e:
+                logger.debug(f"Interaction {self.interaction.id} was answered before it could be deferred: {e}")
+
+
+def auto_defer(ephemeral: bool = True):
+    # Wraps cog commands, hybrid commands and modal submits; handlers must answer through `respond` or `ctx.send`
+    def decorator(func):
+        @functools.wraps(func)
+        async def wrapper(self, target, *args, **kwargs):
+            interaction = target.interaction if isinstance(target, commands.Context) else target
+            if interaction is None:
+                return await func(self, target, *args, **kwargs)
+
+            deferral = AutoDefer(interaction, ephemeral=ephemeral)
+            deferral.start()
+            try:
+                # Queries issued by the handler, including through asyncio.to_thread, stop once nobody can see their result
+                with deadline_at(interaction_deadline(interaction, settings.INTERACTION_QUERY_DEADLINE)):
+                    return await func(self, target, *args, **kwargs)
+            finally:
+                deferral.cancel()
+
+        return wrapper
+
+    return decorator
+
+
+def interaction_deadline(interaction: discord.Interaction, seconds: float) -> float:
+    return interaction.created_at.timestamp() + seconds
+
+
+# (user id, command name) -> scope of the autocomplete query still running for that user's previous keystroke
+_autocomplete_scopes: Dict[Tuple[int, str], QueryScope] = {}
+
+
+def latest_autocomplete(func):
+    # Every keystroke sends a fresh autocomplete interaction; only the newest one's query is worth finishing
+    @functools.wraps(func)
+    async def wrapper(self, interaction: discord.Interaction, current: str):
+        key = (interaction.user.id, interaction.command.qualified_name if interaction.command else "")
+        scope = QueryScope()
+        previous = _autocomplete_scopes.get(key)
+        _autocomplete_scopes[key] = scope
+        if previous is not None:
+            # Cancelling talks to the server, so keep it off the event loop
+            await asyncio.to_thread(previous.cancel)
+        try:
+            with deadline_at(interaction_deadline(interaction, settings.AUTOCOMPLETE_QUERY_DEADLINE), scope):
+                return await func(self, interaction, current)
+        except DeadlineExceededError as e:
+            logger.debug(f"Autocomplete for {key} abandoned: {e}")
+            return []
+        finally:
+            if _autocomplete_scopes.get(key) is scope:
+                del _autocomplete_scopes[key]
+
+    return wrapper
+
+
+async def respond(interaction: discord.Interaction, content: Optional[str] = None, **kwargs) -> Optional[discord.Message]:
+    async with response_lock(interaction):
+        if not interaction.response.is_done():
+            try:
+                await interaction.response.send_message(content, **kwargs)
+                return None
+            except (discord.InteractionResponded, discord.HTTPException) as e:
+                if not _already_acknowledged(e):
+                    raise
+
+        # The first followup after a deferral replaces the "thinking…" message and keeps the defer's visibility.
+        # When that is wrong for this reply, e.g. an ephemeral error after a public defer, drop it and send a fresh message
+        deferred_ephemeral = interaction.extras.pop("deferred_ephemeral", None)
+        if deferred_ephemeral is not None and deferred_ephemeral != kwargs.get("ephemeral", False):
+            try:
+                await interaction.delete_original_response()
+            except discord.HTTPException as e:
+                logger.debug(f"Could not remove deferred response of interaction {interaction.id}: {e}")
+        return await interaction.followup.send(content, wait=True, **kwargs)
+
+
+async def reply(ctx: commands.Context, content: Optional[str] = None, **kwargs) -> Optional[discord.Message]:
+    # Hybrid commands: slash invocations go through respond so visibility survives an automatic deferral
+    if ctx.interaction is None:
+        return await ctx.send(content, **kwargs)
+    return await respond(ctx.interaction, content, **kwargs)
+
+
+async def edit_response(interaction: discord.Interaction, **kwargs):
+    # Component counterpart of respond: edit the clicked message whether or not the click was deferred
+    async with response_lock(interaction):
+        if not interaction.response.is_done():
+            try:
+                await interaction.response.edit_message(**kwargs)
+                return
+            except (discord.InteractionResponded, discord.HTTPException) as e:
+                if not _already_acknowledged(e):
+                    raise
+        await interaction.edit_original_response(**kwargs)
@@ -0,0 +1,156 @@
+import asyncio
+import bisect
+import logging
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+import discord
+
+logger = logging.getLogger(__name__)
+
+
+class MemberIndex:
+    def __init__(self):
+        self._names: Dict[int, str] = {}
+        self._display_names: Dict[int, str] = {}
+        self._sorted: List[Tuple[str, int]] = []
+        self._trigrams: Dict[str, Set[int]] = {}
+
+    def __len__(self) -> int:
+        return len(self._names)
+
+    @staticmethod
+    def _trigrams_of(name: str) -> Set[str]:
+        return {name[i : i + 3] for i in range(len(name) - 2)}
+
+    @classmethod
+    def build(cls, members: Iterable[Tuple[int, str]]) -> "MemberIndex":
+        # Bulk load: one sort instead of an insort per member, which is quadratic for large guilds
+        index = cls()
+        for member_id, display_name in members:
+            index._names[member_id] = display_name.lower()
+            index._display_names[member_id] = display_name
+        index._sorted = sorted((name, member_id) for member_id, name in index._names.items())
+        for name, member_id in index._sorted:
+            for trigram in cls._trigrams_of(name):
+                index._trigrams.setdefault(trigram, set()).add(member_id)
+        return index
+
+    def add(self, member_id: int, display_name: str):
+        if member_id in self._names:
+            self.remove(member_id)
+
+        name = display_name.lower()
+        self._names[member_id] = name
+        self._display_names[member_id] = display_name
+        bisect.insort(self._sorted, (name, member_id))
+        for trigram in self._trigrams_of(name):
+            self._trigrams.setdefault(trigram, set()).add(member_id)
+
+    def remove(self, member_id: int):
+        name = self._names.pop(member_id, None)
+        if name is None:
+            return
+
+        del self._display_names[member_id]
+        position = bisect.bisect_left(self._sorted, (name, member_id))
+        if position < len(self._sorted) and self._sorted[position] == (name, member_id):
+            del self._sorted[position]
+        for trigram in self._trigrams_of(name):
+            members = self._trigrams.get(trigram)
+            if members is not None:
+                members.discard(member_id)
+                if not members:
+                    del self._trigrams[trigram]
+
+    def search(self, query: str, limit: int = 8) -> List[Tuple[int, str]]:
+        query = query.lower()
+        matches: List[int] = []
+
+        # Prefix matches come first, straight out of the sorted name list
+        position = bisect.bisect_left(self._sorted, (query,))
+        while position < len(self._sorted) and len(matches) < limit:
+            name, member_id = self._sorted[position]
+            if not name.startswith(query):
+                break
+            matches.append(member_id)
+            position += 1
+
+        if len(matches) < limit and query:
+            seen = set(matches)
+            for member_id in self._substring_candidates(query):
+                if member_id not in seen and query in self._names[member_id]:
+                    matches.append(member_id)
+                    if len(matches) >= limit:
+                        break
+
+        return [(member_id, self._display_names[member_id]) for member_id in matches]
+
+    def _substring_candidates(self, query: str):
+        trigrams = self._trigrams_of(query)
+        if not trigrams:
+            # Too short for the trigram index; common one or two letter fragments hit the limit quickly
+            return (member_id for _, member_id in self._sorted)
+
+        postings = sorted((self._trigrams.get(trigram, set()) for trigram in trigrams), key=len)
+        candidates = set(postings[0]).intersection(*postings[1:])
+        return sorted(candidates, key=self._names.get)
+
+
+class MemberIndexRegistry:
+    def __init__(self):
+        self._indexes: Dict[int, MemberIndex] = {}
+        self._builds: Dict[int, asyncio.Task] = {}
+        # guild_id -> (member_id, display name or None if they left) seen while that guild's index was being built
+        self._pending: Dict[int, List[Tuple[int, Optional[str]]]] = {}
+
+    async def get(self, guild: discord.Guild) -> MemberIndex:
+        index = self._indexes.get(guild.id)
+        if index is not None:
+            return index
+        build = self._builds.get(guild.id)
+        if build is None:
+            self._pending[guild.id] = []
+            build = self._builds[guild.id] = asyncio.create_task(self._build(guild))
+        # Concurrent keystrokes share one build, and an abandoned autocomplete must not cancel it
+        return await asyncio.shield(build)
+
+    async def _build(self, guild: discord.Guild) -> MemberIndex:
+        try:
+            members = [(member.id, member.display_name) for member in guild.members]
+            index = await asyncio.to_thread(MemberIndex.build, members)
+            for member_id, display_name in self._pending[guild.id]:
+                if display_name is None:
+                    index.remove(member_id)
+                else:
+                    index.add(member_id, display_name)
+            self._indexes[guild.id] = index
+            logger.debug(f"Built member index for guild {guild.id} with {len(index)} members")
+            return index
+        finally:
+            self._pending.pop(guild.id, None)
+            self._builds.pop(guild.id, None)
+
+    def _update(self, guild_id: int, member_id: int, display_name: Optional[str]):
+        index = self._indexes.get(guild_id)
+        if index is None:
+            if guild_id in self._pending:
+                self._pending[guild_id].append((member_id, display_name))
+        elif display_name is None:
+            index.remove(member_id)
+        else:
+            index.add(member_id, display_name)
+
+    def add(self, member: discord.Member):
+        self._update(member.guild.id, member.id, member.display_name)
+
+    def remove(self, member: discord.Member):
+        self._update(member.guild.id, member.id, None)
+
+    def drop(self, guild_id: int):
+        self._indexes.pop(guild_id, None)
+        build = self._builds.pop(guild_id, None)
+        if build is not None:
+            build.cancel()
+
+
+member_indexes = MemberIndexRegistry()
@@ -1,9 +1,16 @@
 import asyncio
+import logging
 import time
-from typing import Callable, Optional
+from collections import OrderedDict
+from typing import Callable, Dict, Optional, Tuple
 
 import discord
 
+from helpers.deferral import AutoDefer, edit_response, respond
+from helpers.scheduler import timeout_scheduler
+
+logger = logging.getLogger(__name__)
+
 
 class Pagination(discord.ui.View):
     def __init__(
@@ -13,6 +20,8 @@ class Pagination(discord.ui.View):
         timeout: int = 30,
         delete_on_timeout: bool = False,
         ephemeral: bool = False,
+        cache_size: int = 8,
+        prefetch: bool = True,
     ):
         super().__init__(timeout=None)  # Set to None to manage timeout manually
         self.interaction = interaction
@@ -21,11 +30,14 @@ class Pagination(discord.ui.View):
         self.index = 1
         self.timeout_duration = timeout
         self.timeout_timestamp = None
-        self.task = None
         self.delete_on_timeout = delete_on_timeout
         self.timeout_field_name = "*Command Timeout:*"
         self.ephemeral = ephemeral
         self.embed_color = None
+        self.cache_size = cache_size
+        self.prefetch = prefetch
+        self._page_cache: "OrderedDict[int, Tuple[discord.Embed, int]]" = OrderedDict()
+        self._pending_pages: Dict[int, asyncio.Task] = {}
 
     async def navigate(self):
         await self._update_page(initial=True)
@@ -35,7 +47,15 @@ class Pagination(discord.ui.View):
 
     async def _update_page(self, interaction: Optional[discord.Interaction] = None, initial: bool = False):
         self._update_timeout()
-        embed, self.total_pages = await self.get_page(self.index)
+        # Uncached pages may need a database round trip; acknowledge the click in time if rendering runs long
+        deferral = None if initial else AutoDefer(interaction)
+        if deferral:
+            deferral.start()
+        try:
+            embed, self.total_pages = await self._get_cached_page(self.index)
+        finally:
+            if deferral:
+                deferral.cancel()
         self._update_buttons()
         self._update_timeout_field(embed)
         self._update_footer(embed)
@@ -46,12 +66,47 @@ class Pagination(discord.ui.View):
             embed.color = self.embed_color
 
         if initial:
-            await self.interaction.response.send_message(embed=embed, view=self, silent=True, ephemeral=self.ephemeral)
+            # The command may already have been deferred, in which case the first page replaces its "thinking…" message
+            await respond(self.interaction, embed=embed, view=self, silent=True, ephemeral=self.ephemeral)
         else:
-            await interaction.response.edit_message(embed=embed, view=self)
+            await edit_response(interaction, embed=embed, view=self)
 
-        if not self.task:
-            self.task = asyncio.create_task(self._check_timeout())
+        timeout_scheduler.schedule(self, self.timeout_timestamp, self._on_timeout)
+        self._prefetch_page(self.index + 1)
+
+    async def _get_cached_page(self, index: int) -> Tuple[discord.Embed, int]:
+        if index in self._page_cache:
+            self._page_cache.move_to_end(index)
+            embed, total_pages = self._page_cache[index]
+        elif index in self._pending_pages:
+            embed, total_pages = await self._pending_pages[index]
+        else:
+            embed, total_pages = await self._render_page(index)
+        # The cached embed stays pristine; timeout field, footer and colour are applied to a copy
+        return embed.copy(), total_pages
+
+    async def _render_page(self, index: int) -> Tuple[discord.Embed, int]:
+        embed, total_pages = await self.get_page(index)
+        self._page_cache[index] = (embed, total_pages)
+        self._page_cache.move_to_end(index)
+        while len(self._page_cache) > self.cache_size:
+            self._page_cache.popitem(last=False)
+        return embed, total_pages
+
+    def _prefetch_page(self, index: int):
+        if not self.prefetch or self.total_pages is None or index > self.total_pages:
+            return
+        if index in self._page_cache or index in self._pending_pages:
+            return
+
+        task = asyncio.create_task(self._render_page(index))
+        self._pending_pages[index] = task
+        task.add_done_callback(lambda t: self._on_prefetch_done(index, t))
+
+    def _on_prefetch_done(self, index: int, task: asyncio.Task):
+        self._pending_pages.pop(index, None)
+        if not task.cancelled() and task.exception():
+            logger.error(f"Failed to prefetch page {index}: {task.exception()}")
 
     def _update_timeout(self):
         self.timeout_timestamp = int(time.time()) + self.timeout_duration
@@ -93,13 +148,6 @@ class Pagination(discord.ui.View):
         self.index = self.total_pages
         await self.edit_page(interaction)
 
-    async def _check_timeout(self):
-        while True:
-            await asyncio.sleep(1)  # Check every second
-            if time.time() > self.timeout_timestamp:
-                await self._on_timeout()
-                break
-
     async def _on_timeout(self):
         try:
             message = await self.interaction.original_response()
@@ -110,6 +158,9 @@ class Pagination(discord.ui.View):
                 await message.edit(embed=embed, view=None)
         except discord.NotFound:
             pass
+        for task in self._pending_pages.values():
+            task.cancel()
+        self._page_cache.clear()
         self.stop()
 
     @staticmethod
@@ -0,0 +1,71 @@
+import asyncio
+import heapq
+import itertools
+import logging
+import time
+from typing import Awaitable, Callable, Dict, Hashable, List, Optional, Set, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+class TimeoutScheduler:
+    def __init__(self, clock: Callable[[], float] = time.time):
+        self._clock = clock
+        self._heap: List[Tuple[float, int, Hashable]] = []
+        self._entries: Dict[Hashable, Tuple[int, Callable[[], Awaitable[None]]]] = {}
+        self._counter = itertools.count()
+        self._wakeup: Optional[asyncio.Event] = None
+        self._task: Optional[asyncio.Task] = None
+        # The loop only keeps weak references to tasks, so callbacks still running are held here
+        self._firing: Set[asyncio.Task] = set()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def schedule(self, key: Hashable, deadline: float, callback: Callable[[], Awaitable[None]]):
+        # Re-arming just pushes a new entry; the superseded one is dropped lazily when it reaches the top
+        seq = next(self._counter)
+        self._entries[key] = (seq, callback)
+        heapq.heappush(self._heap, (deadline, seq, key))
+
+        if self._task is None or self._task.done():
+            self._wakeup = asyncio.Event()
+            self._task = asyncio.create_task(self._run())
+        elif self._heap[0][1] == seq:
+            self._wakeup.set()
+
+    def cancel(self, key: Hashable):
+        self._entries.pop(key, None)
+
+    async def _run(self):
+        while self._heap:
+            deadline, seq, key = self._heap[0]
+            entry = self._entries.get(key)
+            if entry is None or entry[0] != seq:
+                heapq.heappop(self._heap)
+                continue
+
+            delay = deadline - self._clock()
+            if delay > 0:
+                self._wakeup.clear()
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), timeout=delay)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+
+            heapq.heappop(self._heap)
+            del self._entries[key]
+            task = asyncio.create_task(self._fire(key, entry[1]))
+            self._firing.add(task)
+            task.add_done_callback(self._firing.discard)
+
+    @staticmethod
+    async def _fire(key: Hashable, callback: Callable[[], Awaitable[None]]):
+        try:
+            await callback()
+        except Exception as e:
+            logger.error(f"Timeout callback for {key!r} failed: {e}")
+
+
+timeout_scheduler = TimeoutScheduler()
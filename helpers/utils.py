@@ -3,6 +3,9 @@ import re
 
 import discord
 
+from helpers.broadcast import deliver, digest_broadcaster
+from helpers.deferral import respond
+
 logger = logging.getLogger(__name__)
 
 
@@ -17,14 +20,29 @@ async def get_user_mention(user_id: int) -> str:
         return f"`@Error User ({user_id})`"
 
 
-async def send_to_report_channels(bot, server_settings, embed):
+async def send_database_unavailable(interaction: discord.Interaction):
+    await respond(interaction, "The database is temporarily unavailable. Please try again in a minute.", ephemeral=True)
+
+
+async def send_query_timed_out(interaction: discord.Interaction):
+    await respond(interaction, "That took too long and was cancelled. Please try again.", ephemeral=True)
+
+
+async def send_to_report_channels(bot, server_settings, embed, relay: bool = True):
+    cluster = getattr(bot, "cluster", None)
     for setting in server_settings:
+        if cluster and not cluster.owns_guild(setting.get("server_id")):
+            continue
         channel_id = setting.get("channel_id")
         if channel_id:
             report_channel = bot.get_channel(channel_id)
             if report_channel:
+                digest_interval = setting.get("digest_interval")
+                if digest_interval:
+                    await digest_broadcaster.add(report_channel, embed, digest_interval)
+                    continue
                 try:
-                    await report_channel.send(embed=embed, silent=True)
+                    await deliver(report_channel, [embed])
                     logger.info(f"Message sent to channel {channel_id}")
                 except Exception as e:
                     logger.error(f"Failed to send message to channel {channel_id}: {e}")
@@ -33,6 +51,10 @@ async def send_to_report_channels(bot, server_settings, embed):
         else:
             logger.warning(f"No report channel configured for server settings: {setting}")
 
+    # Other clusters deliver to the guilds on their own shards
+    if cluster and relay:
+        await cluster.publish("broadcast", embed=embed.to_dict())
+
 
 def is_valid_game_name(game_name):
     return re.match(r"^(?!.*\d{5})[a-zA-Z0-9_-]{3,15}$", game_name)
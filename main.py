@@ -1,13 +1,24 @@
 import asyncio
 import logging
 import sys
+import time
+from contextlib import contextmanager
 from typing import List
 
 import discord
+from discord import app_commands
 from discord.ext import commands
 
 import db.database as database
 import settings
+from db.migrations import init_schema, schema_is_current
+from db.notifications import CacheEventListener, snapshot_reloader
+from db.snapshot import report_snapshot
+from helpers.broadcast import digest_broadcaster, webhook_transport
+from helpers.cluster import ClusterClient
+from helpers.command_sync import CommandSyncer
+from helpers.deferral import reply
+from helpers.utils import send_database_unavailable, send_query_timed_out, send_to_report_channels
 
 logger = logging.getLogger(__name__)
 
@@ -20,32 +31,110 @@ EXTENSIONS = [
     "commands.VerifyLegit",
     "commands.VerifiedDetails",
     "commands.ListVerified",
+    "commands.Maintenance",
+    "commands.Stats",
 ]
 
 
+@contextmanager
+def startup_phase(name: str):
+    start = time.perf_counter()
+    yield
+    logger.info(f"Startup phase '{name}' finished in {time.perf_counter() - start:.2f}s")
+
+
 class TarkovCheaterBot(commands.Bot):
-    def __init__(self):
-        intents = discord.Intents.default()
-        intents.message_content = True
-        intents.members = True
-        super().__init__(command_prefix="!", intents=intents)
+    def __init__(self, started_at: float = None, cluster: ClusterClient = None, **options):
+        if settings.LEAN_GATEWAY:
+            intents = discord.Intents.none()
+            intents.guilds = True
+            super().__init__(
+                command_prefix="!",
+                intents=intents,
+                chunk_guilds_at_startup=False,
+                member_cache_flags=discord.MemberCacheFlags.none(),
+                max_messages=None,
+                **options,
+            )
+        else:
+            intents = discord.Intents.default()
+            intents.message_content = True
+            intents.members = True
+            super().__init__(command_prefix="!", intents=intents, **options)
+        self.cluster = cluster
+        if cluster:
+            self.command_syncer = CommandSyncer(
+                self, state_path=settings.DATA_DIR / f"command_sync-{settings.LOG_TAG}.json", leader=cluster.is_leader
+            )
+        else:
+            self.command_syncer = CommandSyncer(self)
+        self.started_at = started_at or time.perf_counter()
+        self.first_ready = True
 
     async def setup_hook(self):
-        for extension in EXTENSIONS:
-            await self.load_extension_safe(extension)
+        self.default_tree_error = self.tree.on_error
+        self.tree.on_error = self.on_app_command_error
+        with startup_phase("extensions"):
+            await asyncio.gather(*(self.load_extension_safe(extension) for extension in EXTENSIONS))
+        if self.cluster:
+            self.cluster.on("broadcast", self.on_cluster_broadcast)
+            self.cluster.start()
+        database.bind_cache_loop(asyncio.get_running_loop())
+        snapshot_reloader.start()
+        if settings.CACHE_EVENTS_ENABLED:
+            self.cache_events = CacheEventListener()
+            self.cache_events.start()
 
     async def on_ready(self):
         logger.info(f"Connected as {self.user} (ID: {self.user.id})")
         guilds = [guild.name for guild in self.guilds]
         logger.info(f"Guilds ({len(self.guilds)}): {', '.join(guilds)}")
-        await self.sync_commands()
+        with startup_phase("command sync"):
+            await self.sync_commands()
+        if self.first_ready:
+            self.first_ready = False
+            logger.info(f"Ready to serve {time.perf_counter() - self.started_at:.2f}s after startup")
 
     async def on_guild_join(self, guild: discord.Guild):
         logger.info(f"Joined new guild: {guild.name} (ID: {guild.id})")
-        await self.sync_commands(guilds=[guild])
+        # Global commands already reach the new guild; forcing would re-register the whole global tree
+        await self.sync_commands(guilds=[guild], force=self.command_syncer.mode == "guild")
 
     async def on_guild_remove(self, guild: discord.Guild):
         logger.info(f"Removed from guild: {guild.name} (ID: {guild.id})")
+        self.command_syncer.forget(guild)
+
+    async def close(self):
+        # Deliver anything still waiting in a digest rather than dropping it on shutdown
+        await digest_broadcaster.flush_all()
+        await webhook_transport.close()
+        await super().close()
+
+    async def on_app_command_error(self, interaction: discord.Interaction, error: app_commands.AppCommandError):
+        if isinstance(getattr(error, "original", None), database.DatabaseUnavailableError):
+            logger.warning(f"Command '{interaction.command.name if interaction.command else 'unknown'}' failed fast: {error.original}")
+            await send_database_unavailable(interaction)
+            return
+        if isinstance(getattr(error, "original", None), database.DeadlineExceededError):
+            logger.warning(f"Command '{interaction.command.name if interaction.command else 'unknown'}' timed out: {error.original}")
+            await send_query_timed_out(interaction)
+            return
+        await self.default_tree_error(interaction, error)
+
+    async def on_command_error(self, ctx: commands.Context, error: commands.CommandError):
+        # Hybrid commands wrap the original error once per layer they pass through
+        original = error
+        while getattr(original, "original", None) is not None:
+            original = original.original
+        if isinstance(original, database.DatabaseUnavailableError):
+            logger.warning(f"Command '{ctx.command}' failed fast: {original}")
+            await reply(ctx, "The database is temporarily unavailable. Please try again in a minute.", ephemeral=True)
+            return
+        if isinstance(original, database.DeadlineExceededError):
+            logger.warning(f"Command '{ctx.command}' timed out: {original}")
+            await reply(ctx, "That took too long and was cancelled. Please try again.", ephemeral=True)
+            return
+        await super().on_command_error(ctx, error)
 
     async def load_extension_safe(self, extension: str):
         try:
@@ -54,32 +143,58 @@ class TarkovCheaterBot(commands.Bot):
         except Exception as e:
             logger.error(f"Failed to load extension '{extension}': {e}")
 
-    async def sync_commands(self, guilds: List[discord.Guild] = None):
+    async def on_cluster_broadcast(self, message: dict):
+        embed = discord.Embed.from_dict(message["embed"])
+        server_settings = database.DatabaseManager.get_server_settings()
+        if server_settings:
+            await send_to_report_channels(self, server_settings, embed, relay=False)
+
+    async def sync_commands(self, guilds: List[discord.Guild] = None, force: bool = False):
         if guilds is None:
             guilds = self.guilds
-        for guild in guilds:
-            self.tree.copy_global_to(guild=guild)
-            await self.tree.sync(guild=guild)
-            logger.info(f"Commands synced for guild: {guild.name}")
+        await self.command_syncer.sync(guilds, force=force)
+
+
+class ShardedTarkovCheaterBot(TarkovCheaterBot, commands.AutoShardedBot):
+    pass
+
+
+def create_bot(started_at: float) -> TarkovCheaterBot:
+    if settings.CLUSTERED:
+        logger.info(f"Starting cluster {settings.CLUSTER_ID} with shards {settings.SHARD_IDS} of {settings.SHARD_COUNT}")
+        cluster = ClusterClient(settings.CLUSTER_ID, settings.SHARD_IDS, settings.SHARD_COUNT)
+        return ShardedTarkovCheaterBot(started_at, cluster=cluster, shard_ids=settings.SHARD_IDS, shard_count=settings.SHARD_COUNT)
+    if settings.SHARD_COUNT:
+        logger.info(f"Starting all {settings.SHARD_COUNT} shards in this process")
+        return ShardedTarkovCheaterBot(started_at, shard_count=settings.SHARD_COUNT)
+    return TarkovCheaterBot(started_at)
 
 
 def init_database():
-    if database.engine is not None:
-        database.Base.metadata.create_all(database.engine)
-        logger.info("Database initialized successfully")
-    else:
-        logger.error("Failed to initialize database: engine is None")
-        sys.exit(1)
+    with startup_phase("database schema"):
+        # Clustered workers share one database, which the launcher migrates once before starting any of them
+        if not (schema_is_current() if settings.CLUSTERED else init_schema()):
+            logger.error("Failed to initialize database")
+            sys.exit(1)
+
+    with startup_phase("report snapshot"):
+        rows = database.DatabaseManager.get_report_snapshot_rows()
+        names = database.DatabaseManager.get_player_names()
+        if rows is not None and names is not None:
+            report_snapshot.load(rows, names)
+        else:
+            logger.warning("Report snapshot unavailable, list and detail summaries will query the database")
 
 
 async def main():
     logger.info(f"Starting up bot '{settings.BOT_NAME} v{settings.BOT_VERSION}'")
+    started_at = time.perf_counter()
 
     # Initialize the database
     init_database()
 
     # Create and run the bot
-    bot = TarkovCheaterBot()
+    bot = create_bot(started_at)
 
     try:
         await bot.start(settings.DISCORD_API_SECRET)
@@ -20,6 +20,11 @@ load_dotenv()
 # Bot Configuration
 DISCORD_API_SECRET = os.getenv("DISCORD_API_SECRET")
 BASE_OWNER_ID = int(os.getenv("BASE_OWNER_ID", 0))
+COMMAND_SYNC_MODE = os.getenv("COMMAND_SYNC_MODE", "guild")  # "guild" copies commands into every guild, "global" registers them once
+COMMAND_SYNC_CONCURRENCY = int(os.getenv("COMMAND_SYNC_CONCURRENCY", 5))
+# Lean mode drops privileged intents and member chunking; everything the bot does is slash commands
+LEAN_GATEWAY = os.getenv("LEAN_GATEWAY", "false").lower() in ("1", "true", "yes")
+BROADCAST_TRANSPORT = os.getenv("BROADCAST_TRANSPORT", "channel")  # "channel" posts as the bot, "webhook" posts through a webhook per guild
 
 # Database Configuration
 DB_USER = os.getenv("DB_USER")
@@ -28,12 +33,53 @@ DB_HOST = os.getenv("DB_HOST")
 DB_PORT = int(os.getenv("DB_PORT", 3306))  # Default MySQL port is 3306
 DB_NAME = os.getenv("DB_NAME")
 
+# Interaction Configuration
+INTERACTION_DEFER_BUDGET = float(os.getenv("INTERACTION_DEFER_BUDGET", 2.0))  # Seconds a command may run before it is deferred automatically
+INTERACTION_QUERY_DEADLINE = float(os.getenv("INTERACTION_QUERY_DEADLINE", 30.0))  # Seconds after an interaction is created that its database queries may run
+AUTOCOMPLETE_QUERY_DEADLINE = float(os.getenv("AUTOCOMPLETE_QUERY_DEADLINE", 3.0))  # Autocomplete results are useless once Discord stops waiting for them
+
+# Database Circuit Breaker Configuration
+DB_BREAKER_FAILURE_THRESHOLD = int(os.getenv("DB_BREAKER_FAILURE_THRESHOLD", 3))  # Consecutive connectivity failures before failing fast
+DB_BREAKER_RESET_TIMEOUT = float(os.getenv("DB_BREAKER_RESET_TIMEOUT", 30))  # Seconds to fail fast before probing the database again
+
+# Cache Configuration
+LIST_CACHE_TTL = int(os.getenv("LIST_CACHE_TTL", 300))  # Seconds a shared list_reports/list_verified result stays valid
+SETTINGS_CACHE_TTL = int(os.getenv("SETTINGS_CACHE_TTL", 600))  # Seconds cached server settings stay valid without a change event
+ENTITY_CACHE_SIZE = int(os.getenv("ENTITY_CACHE_SIZE", 2000))  # Profiles whose details stay cached, least recently used evicted first
+ENTITY_CACHE_TTL = int(os.getenv("ENTITY_CACHE_TTL", 3600))  # Backstop for change events missed while disconnected
+CACHE_EVENTS_ENABLED = os.getenv("CACHE_EVENTS_ENABLED", "true").lower() in ("1", "true", "yes")  # LISTEN for other instances' writes
+REPORT_COALESCE_WINDOW = int(os.getenv("REPORT_COALESCE_WINDOW", 600))  # Seconds repeat reports merge into the first one; 0 disables
+TOP_REPORTER_SLOTS = int(os.getenv("TOP_REPORTER_SLOTS", 8))  # Heavy-hitter slots tracked per cheater for "Reported Most By"
+
+# Maintenance Configuration
+SPOOL_REPLAY_INTERVAL = int(os.getenv("SPOOL_REPLAY_INTERVAL", 15))  # Seconds between attempts to replay writes spooled during a DB outage
+SPOOL_REPLAY_BATCH = int(os.getenv("SPOOL_REPLAY_BATCH", 10))  # Spooled writes replayed per attempt; they run on the event loop, so keep this small
+APPLIED_WRITE_RETENTION_DAYS = int(os.getenv("APPLIED_WRITE_RETENTION_DAYS", 30))  # Days write ids are kept to recognise replays of writes that already landed
+REPORT_PARTITIONS_AHEAD = int(os.getenv("REPORT_PARTITIONS_AHEAD", 3))  # Monthly cheater_reports partitions kept created ahead of time
+MAINTENANCE_INTERVAL_HOURS = int(os.getenv("MAINTENANCE_INTERVAL_HOURS", 24))
+ARCHIVE_ABSOLVED = os.getenv("ARCHIVE_ABSOLVED", "true").lower() in ("1", "true", "yes")  # Move absolved reports to cheater_reports_archive
+ARCHIVE_AFTER_DAYS = int(os.getenv("ARCHIVE_AFTER_DAYS", 0))  # Also archive reports older than this many days; 0 keeps them
+ARCHIVE_BATCH_SIZE = int(os.getenv("ARCHIVE_BATCH_SIZE", 5000))
+REBUILD_DAILY_STATS = os.getenv("REBUILD_DAILY_STATS", "false").lower() in ("1", "true", "yes")  # Recompute /stats rollups from report history on every maintenance run
+
+# Cluster Configuration
+SHARD_COUNT = int(os.getenv("SHARD_COUNT") or 0) or None  # Unset runs unsharded; cluster.py asks Discord for the recommended count
+SHARD_IDS = [int(shard_id) for shard_id in os.getenv("SHARD_IDS", "").split(",") if shard_id]  # Set by cluster.py per worker
+CLUSTER_ID = int(os.getenv("CLUSTER_ID", 0))
+CLUSTER_COUNT = int(os.getenv("CLUSTER_COUNT", 1))
+CLUSTERED = bool(SHARD_IDS)
+CLUSTER_COORDINATOR_HOST = os.getenv("CLUSTER_COORDINATOR_HOST", "127.0.0.1")
+CLUSTER_COORDINATOR_PORT = int(os.getenv("CLUSTER_COORDINATOR_PORT", 8765))
+LOG_TAG = f"cluster-{CLUSTER_ID}" if CLUSTERED else None
+
 # Logging Configuration
 LOGGING_CONFIG = {
     "version": 1,
     "disable_existing_loggers": False,
     "formatters": {
-        "normal": {"format": "%(levelname)-10s - %(asctime)s - %(module)-15s : %(message)s"},
+        "normal": {
+            "format": f"%(levelname)-10s - %(asctime)s - {f'[{LOG_TAG}] - ' if LOG_TAG else ''}%(module)-15s : %(message)s"
+        },
     },
     "handlers": {
         "console": {
@@ -44,7 +90,7 @@ LOGGING_CONFIG = {
         "file": {
             "level": "INFO",
             "class": "logging.handlers.RotatingFileHandler",
-            "filename": LOGS_DIR / "infos.log",
+            "filename": LOGS_DIR / (f"infos-{LOG_TAG}.log" if LOG_TAG else "infos.log"),
             "mode": "a",
             "formatter": "normal",
             "maxBytes": 50 * 1024 * 1024,  # 50 MB
@@ -0,0 +1,70 @@
+from types import SimpleNamespace
+
+import pytest
+
+from db import breaker
+from db.breaker import BreakerState, CircuitBreaker
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = SimpleNamespace(now=1000.0)
+    monkeypatch.setattr(breaker, "time", SimpleNamespace(monotonic=lambda: clock.now))
+    return clock
+
+
+def tripped(clock):
+    circuit = CircuitBreaker(failure_threshold=3, reset_timeout=30)
+    for _ in range(3):
+        assert circuit.allow()
+        circuit.record_failure()
+    return circuit
+
+
+def test_opens_after_consecutive_failures_only(clock):
+    circuit = CircuitBreaker(failure_threshold=3, reset_timeout=30)
+    circuit.record_failure()
+    circuit.record_failure()
+    circuit.record_success()
+    circuit.record_failure()
+    circuit.record_failure()
+    assert circuit.state == BreakerState.CLOSED
+
+    circuit.record_failure()
+    assert circuit.state == BreakerState.OPEN
+    assert circuit.trips == 1
+
+
+def test_open_circuit_fails_fast_until_the_timeout(clock):
+    circuit = tripped(clock)
+
+    clock.now += 29
+    assert not circuit.allow()
+    assert circuit.rejected == 1
+    assert circuit.retry_after == pytest.approx(1)
+
+
+def test_half_open_lets_a_single_probe_through(clock):
+    circuit = tripped(clock)
+    clock.now += 30
+
+    assert circuit.allow()
+    assert circuit.state == BreakerState.HALF_OPEN
+    assert not circuit.allow()
+
+    circuit.record_success()
+    assert circuit.state == BreakerState.CLOSED
+    assert circuit.allow()
+
+
+def test_failed_probe_reopens_for_another_timeout(clock):
+    circuit = tripped(clock)
+    clock.now += 30
+    assert circuit.allow()
+
+    circuit.record_failure()
+
+    assert circuit.state == BreakerState.OPEN
+    assert circuit.trips == 2
+    assert not circuit.allow()
+    assert circuit.metrics()["retry_after"] == 30
@@ -0,0 +1,89 @@
+import pytest
+
+from db import cache, database
+from db.cache import EntityCache, RecentReportIndex, ResultCache
+from db.database import DatabaseManager
+from db.snapshot import ReportSnapshot
+
+# (command, report_type, user filter, server filter, since window)
+ALL_TYPES = ("list_reports", "All", None, None, None)
+SAME_TYPE = ("list_reports", "KILLED_BY_CHEATER", None, None, None)
+OTHER_TYPE = ("list_reports", "STREAM_SNIPER", None, None, None)
+SAME_REPORTER = ("list_reports", "All", "10", None, None)
+OTHER_REPORTER = ("list_reports", "All", "11", None, None)
+SAME_SERVER = ("list_reports", "All", None, 100, None)
+OTHER_SERVER = ("list_reports", "All", None, 101, None)
+VERIFIED = ("list_verified", None, None, None, None)
+REPORT_LISTS = (ALL_TYPES, SAME_TYPE, OTHER_TYPE, SAME_REPORTER, OTHER_REPORTER, SAME_SERVER, OTHER_SERVER)
+
+
+@pytest.fixture
+def list_cache(monkeypatch):
+    list_cache = ResultCache(ttl=300)
+    monkeypatch.setattr(database, "list_cache", list_cache)
+    monkeypatch.setattr(database, "entity_cache", EntityCache(max_entries=10, ttl=300))
+    monkeypatch.setattr(database, "recent_reports", RecentReportIndex(window=600))
+    monkeypatch.setattr(database, "report_snapshot", ReportSnapshot())
+    for key in REPORT_LISTS:
+        list_cache.set(key, ["summary"], profile_ids=[2])
+    list_cache.set(VERIFIED, ["summary"], profile_ids=[1])
+    return list_cache
+
+
+def cached_keys(list_cache):
+    return {key for key in REPORT_LISTS + (VERIFIED,) if list_cache.get(key)}
+
+
+def test_new_report_invalidates_only_lists_it_belongs_to(list_cache):
+    DatabaseManager.apply_cache_event(
+        "report_added",
+        {
+            "id": 1,
+            "reporter_user_id": 10,
+            "server_id": 100,
+            "cheater_game_name": "cheater",
+            "cheater_profile_id": 1,
+            "report_time": 1000,
+            "report_type": "KILLED_BY_CHEATER",
+            "absolved": False,
+            "renamed": False,
+        },
+    )
+
+    assert cached_keys(list_cache) == {OTHER_TYPE, OTHER_REPORTER, OTHER_SERVER, VERIFIED}
+
+
+def test_rename_invalidates_every_list_showing_the_profile(list_cache):
+    DatabaseManager.apply_cache_event(
+        "report_coalesced", {"id": 1, "cheater_profile_id": 2, "cheater_game_name": "renamed", "renamed": True}
+    )
+
+    assert cached_keys(list_cache) == {VERIFIED}
+
+
+def test_absolving_leaves_verified_lists_alone(list_cache):
+    DatabaseManager.apply_cache_event("reports_absolved", {"profile_id": 2})
+
+    assert cached_keys(list_cache) == {VERIFIED}
+
+
+def test_verification_invalidates_only_verified_lists(list_cache):
+    DatabaseManager.apply_cache_event("verified", {"profile_id": 1, "tarkov_game_name": "legit", "renamed": False})
+
+    assert VERIFIED not in cached_keys(list_cache)
+    assert cached_keys(list_cache) == set(REPORT_LISTS)
+
+
+def test_expired_entries_are_dropped_unless_kept_stale(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(cache.time, "monotonic", lambda: now[0])
+    results, settings = ResultCache(ttl=10), ResultCache(ttl=10, keep_stale=True)
+    results.set("key", "value")
+    settings.set("key", "value")
+
+    now[0] += 11
+
+    assert results.get("key") is None
+    assert len(results) == 0
+    assert settings.get("key") is None
+    assert settings.get("key", stale=True) == "value"
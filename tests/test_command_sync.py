@@ -0,0 +1,80 @@
+import asyncio
+from types import SimpleNamespace
+
+from helpers.command_sync import CommandSyncer
+
+
+class FakeCommand:
+    def __init__(self, name, description="does things"):
+        self.name = name
+        self.description = description
+
+    def to_dict(self, tree):
+        return {"type": 1, "name": self.name, "description": self.description}
+
+
+class FakeTree:
+    def __init__(self, commands):
+        self.commands = commands
+        self.synced = []
+
+    def get_commands(self):
+        return list(self.commands)
+
+    def copy_global_to(self, guild):
+        pass
+
+    def clear_commands(self, guild):
+        pass
+
+    async def sync(self, guild=None):
+        self.synced.append(guild.id if guild else "global")
+
+
+def syncer(tmp_path, commands, mode="guild"):
+    bot = SimpleNamespace(tree=FakeTree(commands))
+    return CommandSyncer(bot, state_path=tmp_path / "command_sync.json", mode=mode, concurrency=2)
+
+
+def guilds(*ids):
+    return [SimpleNamespace(id=guild_id, name=f"guild {guild_id}") for guild_id in ids]
+
+
+def test_fingerprint_ignores_registration_order(tmp_path):
+    first = syncer(tmp_path, [FakeCommand("report"), FakeCommand("stats")])
+    second = syncer(tmp_path, [FakeCommand("stats"), FakeCommand("report")])
+
+    assert first.fingerprint() == second.fingerprint()
+
+
+def test_fingerprint_changes_with_any_command_field(tmp_path):
+    before = syncer(tmp_path, [FakeCommand("report")]).fingerprint()
+    after = syncer(tmp_path, [FakeCommand("report", description="reports a cheater")]).fingerprint()
+
+    assert before != after
+
+
+def test_guild_mode_only_syncs_guilds_whose_commands_changed(tmp_path):
+    commands = [FakeCommand("report")]
+    first = syncer(tmp_path, commands)
+    asyncio.run(first.sync(guilds(1, 2)))
+
+    # A restart reads the saved fingerprints back from disk
+    restarted = syncer(tmp_path, commands)
+    asyncio.run(restarted.sync(guilds(1, 2, 3)))
+    asyncio.run(restarted.sync(guilds(1), force=True))
+
+    assert sorted(first.bot.tree.synced) == [1, 2]
+    assert restarted.bot.tree.synced == [3, 1]
+
+
+def test_global_mode_skips_unchanged_tree_and_clears_guild_copies(tmp_path):
+    commands = [FakeCommand("report")]
+    asyncio.run(syncer(tmp_path, commands).sync(guilds(1)))
+
+    switched = syncer(tmp_path, commands, mode="global")
+    asyncio.run(switched.sync(guilds(1)))
+    asyncio.run(switched.sync(guilds(1)))
+
+    assert switched.bot.tree.synced == ["global", 1]
+    assert switched.state["guilds"] == {}
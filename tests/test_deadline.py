@@ -0,0 +1,51 @@
+import asyncio
+import time
+
+import pytest
+
+from db.database import DatabaseManager, DeadlineExceededError
+from db.deadline import deadline_at, remaining
+
+
+def test_deadline_is_copied_into_worker_threads():
+    async def run():
+        with deadline_at(time.time() + 5):
+            inside = await asyncio.to_thread(remaining)
+        outside = await asyncio.to_thread(remaining)
+        return inside, outside
+
+    inside, outside = asyncio.run(run())
+
+    assert 0 < inside <= 5
+    assert outside is None
+
+
+def test_expired_deadline_fails_before_touching_the_database(monkeypatch):
+    def unexpected():
+        raise AssertionError("No session should be opened once the deadline has passed")
+
+    monkeypatch.setattr(DatabaseManager, "_get_session", staticmethod(unexpected))
+
+    async def run():
+        with deadline_at(time.time() - 1):
+            await asyncio.to_thread(DatabaseManager._execute_db_operation, lambda session: None)
+
+    with pytest.raises(DeadlineExceededError):
+        asyncio.run(run())
+
+
+def test_spooled_writes_never_inherit_a_deadline(monkeypatch):
+    seen = []
+
+    def execute_now(cls, name, payload, operation, replay):
+        seen.append(remaining())
+
+    monkeypatch.setattr(DatabaseManager, "_execute_spooled_write_now", classmethod(execute_now))
+
+    async def run():
+        with deadline_at(time.time() - 1):
+            await asyncio.to_thread(DatabaseManager.mark_cheater_reports_as_absolved, 1)
+
+    asyncio.run(run())
+
+    assert seen == [None]
@@ -0,0 +1,55 @@
+import random
+
+from db.heavy_hitters import SpaceSaving
+
+
+def test_counts_are_exact_below_capacity():
+    sketch = SpaceSaving(capacity=4)
+    for item in "abacab":
+        sketch.add(item)
+
+    assert sketch.items() == [("a", 3, 0), ("b", 2, 0), ("c", 1, 0)]
+    assert sketch.top == ("a", 3)
+
+
+def test_newcomer_inherits_the_evicted_count_as_its_error():
+    sketch = SpaceSaving(capacity=2)
+    sketch.add("a", 5)
+    sketch.add("b", 2)
+    sketch.add("c")
+
+    assert len(sketch) == 2
+    assert sketch.items() == [("a", 5, 0), ("c", 3, 2)]
+
+
+def test_top_follows_the_largest_count():
+    sketch = SpaceSaving(capacity=3)
+    sketch.add("a", 2)
+    sketch.add("b", 2)
+    assert sketch.top == ("b", 2)
+
+    sketch.add("a")
+    assert sketch.top == ("a", 3)
+
+
+def test_empty_sketch_has_no_top():
+    sketch = SpaceSaving(capacity=2)
+
+    assert not sketch
+    assert sketch.top is None
+
+
+def test_frequent_items_survive_a_long_tail():
+    # Anything seen more than n / capacity times is guaranteed a slot, and its estimate never undercounts
+    rng = random.Random(7)
+    stream = ["heavy"] * 300 + ["medium"] * 150 + [f"tail-{rng.randrange(500)}" for _ in range(550)]
+    rng.shuffle(stream)
+    sketch = SpaceSaving(capacity=8)
+    for item in stream:
+        sketch.add(item)
+
+    estimates = {item: (count, error) for item, count, error in sketch.items()}
+    assert sketch.top[0] == "heavy"
+    for item, true_count in (("heavy", 300), ("medium", 150)):
+        count, error = estimates[item]
+        assert count - error <= true_count <= count
@@ -0,0 +1,52 @@
+from helpers.member_index import MemberIndex
+
+MEMBERS = [(1, "Squirrel"), (2, "squad_leader"), (3, "NutSquirrel"), (4, "Bob"), (5, "Squeaky")]
+
+
+def test_prefix_matches_come_first_in_name_order():
+    index = MemberIndex.build(MEMBERS)
+
+    assert index.search("squ") == [(2, "squad_leader"), (5, "Squeaky"), (1, "Squirrel"), (3, "NutSquirrel")]
+
+
+def test_substring_matches_use_the_trigram_index():
+    index = MemberIndex.build(MEMBERS)
+
+    assert index.search("irrel") == [(3, "NutSquirrel"), (1, "Squirrel")]
+    assert index.search("zzz") == []
+
+
+def test_short_queries_scan_names_for_substrings():
+    index = MemberIndex.build(MEMBERS)
+
+    assert index.search("ob") == [(4, "Bob")]
+
+
+def test_limit_caps_prefix_and_substring_matches():
+    index = MemberIndex.build(MEMBERS)
+
+    assert len(index.search("squ", limit=2)) == 2
+    assert index.search("", limit=3) == [(4, "Bob"), (3, "NutSquirrel"), (2, "squad_leader")]
+
+
+def test_incremental_updates_match_a_bulk_build():
+    built = MemberIndex.build(MEMBERS + [(6, "Renamed")])
+    updated = MemberIndex()
+    for member_id, name in MEMBERS:
+        updated.add(member_id, name)
+    updated.add(6, "Old Name")
+    updated.add(6, "Renamed")
+
+    for query in ("squ", "irrel", "old", "ren", "e"):
+        assert updated.search(query) == built.search(query)
+    assert updated._trigrams == built._trigrams
+
+
+def test_removed_members_leave_no_trace():
+    index = MemberIndex.build(MEMBERS)
+    index.remove(3)
+    index.remove(99)
+
+    assert len(index) == 4
+    assert index.search("nut") == []
+    assert all(3 not in members for members in index._trigrams.values())
@@ -0,0 +1,73 @@
+import asyncio
+
+import discord
+
+from helpers.pagination import Pagination
+
+
+def paginate(cache_size, scenario):
+    calls = []
+
+    async def get_page(index):
+        calls.append(index)
+        await asyncio.sleep(0)
+        return discord.Embed(title=f"Page {index}"), 5
+
+    async def run():
+        view = Pagination(interaction=None, get_page=get_page, cache_size=cache_size)
+        result = await scenario(view)
+        return result, view
+
+    result, view = asyncio.run(run())
+    return calls, result, view
+
+
+def test_least_recently_viewed_page_is_evicted():
+    async def scenario(view):
+        for index in (1, 2, 1, 3, 1, 2):
+            await view._get_cached_page(index)
+
+    calls, _, view = paginate(2, scenario)
+
+    # Revisiting page 1 kept it warm, so page 2 was the one pushed out by page 3
+    assert calls == [1, 2, 3, 2]
+    assert list(view._page_cache) == [1, 2]
+
+
+def test_cached_page_is_returned_as_a_copy():
+    async def scenario(view):
+        embed, _ = await view._get_cached_page(1)
+        embed.set_footer(text="Page 1 of 5")
+        return (await view._get_cached_page(1))[0]
+
+    calls, embed, _ = paginate(4, scenario)
+
+    assert calls == [1]
+    assert embed.footer.text is None
+
+
+def test_prefetched_page_is_shared_with_the_click_that_wants_it():
+    async def scenario(view):
+        view.total_pages = 5
+        view._prefetch_page(2)
+        view._prefetch_page(2)
+        embed, total_pages = await view._get_cached_page(2)
+        return embed.title, total_pages
+
+    calls, result, view = paginate(4, scenario)
+
+    assert calls == [2]
+    assert result == ("Page 2", 5)
+    assert not view._pending_pages
+
+
+def test_prefetch_stops_at_the_last_page():
+    async def scenario(view):
+        view.total_pages = 1
+        view._prefetch_page(2)
+        return dict(view._pending_pages)
+
+    calls, pending, _ = paginate(4, scenario)
+
+    assert calls == []
+    assert pending == {}
@@ -0,0 +1,30 @@
+from db.partitions import month_range, month_start, partition_name
+
+NOW = month_start(2024, 11) + 12 * 86400
+
+
+def test_range_runs_from_first_report_through_months_ahead_across_years():
+    assert month_range(month_start(2024, 9) + 5, 3, now=NOW) == [
+        (2024, 9),
+        (2024, 10),
+        (2024, 11),
+        (2024, 12),
+        (2025, 1),
+        (2025, 2),
+    ]
+
+
+def test_range_without_months_ahead_ends_at_the_current_month():
+    assert month_range(NOW, 0, now=NOW) == [(2024, 11)]
+
+
+def test_last_second_of_a_month_still_belongs_to_it():
+    assert month_range(month_start(2024, 11) - 1, 0, now=NOW) == [(2024, 10), (2024, 11)]
+
+
+def test_first_report_past_the_range_yields_nothing():
+    assert month_range(month_start(2025, 6), 1, now=NOW) == []
+
+
+def test_partition_names_are_zero_padded():
+    assert partition_name(2025, 1) == "cheater_reports_y2025m01"
@@ -0,0 +1,79 @@
+import asyncio
+
+from helpers.scheduler import TimeoutScheduler
+
+
+class FakeClock:
+    def __init__(self, now: float):
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def recorder(fired, key):
+    async def callback():
+        fired.append(key)
+
+    return callback
+
+
+async def settle():
+    for _ in range(5):
+        await asyncio.sleep(0)
+
+
+def test_due_entries_fire_in_deadline_order():
+    async def run():
+        scheduler = TimeoutScheduler(clock=FakeClock(100))
+        fired = []
+        for key, deadline in (("a", 5), ("b", 3), ("c", 4)):
+            scheduler.schedule(key, deadline, recorder(fired, key))
+        await settle()
+        return scheduler, fired
+
+    scheduler, fired = asyncio.run(run())
+
+    assert fired == ["b", "c", "a"]
+    assert len(scheduler) == 0
+    assert not scheduler._firing
+
+
+def test_superseded_and_cancelled_entries_are_dropped_lazily():
+    async def run():
+        clock = FakeClock(100)
+        scheduler = TimeoutScheduler(clock=clock)
+        fired = []
+        scheduler.schedule("a", 3, recorder(fired, "a"))
+        scheduler.schedule("b", 4, recorder(fired, "b"))
+        scheduler.schedule("a", 200, recorder(fired, "a"))
+        scheduler.cancel("b")
+        await settle()
+        waiting = (list(fired), len(scheduler), len(scheduler._heap))
+
+        # A new earliest deadline wakes the sleeping loop, which then finds both entries due
+        clock.now = 300
+        scheduler.schedule("c", 150, recorder(fired, "c"))
+        await settle()
+        return waiting, fired
+
+    waiting, fired = asyncio.run(run())
+
+    assert waiting == ([], 1, 1)
+    assert fired == ["c", "a"]
+
+
+def test_failing_callback_does_not_stop_later_ones():
+    async def run():
+        scheduler = TimeoutScheduler(clock=FakeClock(100))
+        fired = []
+
+        async def fail():
+            raise RuntimeError("boom")
+
+        scheduler.schedule("bad", 1, fail)
+        scheduler.schedule("good", 2, recorder(fired, "good"))
+        await settle()
+        return fired
+
+    assert asyncio.run(run()) == ["good"]
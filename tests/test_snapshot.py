@@ -0,0 +1,86 @@
+from db.snapshot import ReportSnapshot
+
+KILLED_BY, SNIPER = 1, 4
+
+# (profile_id, reporter_user_id, server_id, report_type code, report_time, absolved)
+ROWS = [
+    (1, 10, 100, KILLED_BY, 1000, False),
+    (1, 10, 100, KILLED_BY, 1010, False),
+    (1, 11, 101, SNIPER, 1020, False),
+    (2, 12, 100, KILLED_BY, 1030, False),
+    (3, 13, 100, KILLED_BY, 1040, True),
+]
+
+
+def loaded():
+    snapshot = ReportSnapshot(initial_capacity=2)
+    snapshot.load(ROWS, {1: "one", 2: "two", 3: "three"})
+    return snapshot
+
+
+def test_summary_ranks_profiles_and_skips_absolved_reports():
+    summary = loaded().summarize()
+
+    assert summary == [(1, 3, "one", 1020, 10, 2), (2, 1, "two", 1030, 12, 1)]
+
+
+def test_summary_filters_by_type_server_and_window():
+    snapshot = loaded()
+
+    assert [row[:2] for row in snapshot.summarize(type_code=SNIPER)] == [(1, 1)]
+    # Windowed views rank reporters from their own rows rather than the all-time sketches
+    assert snapshot.summarize(server_id=101) == [(1, 1, "one", 1020, 11, 1)]
+    assert [row[:2] for row in snapshot.summarize(since=1015)] == [(1, 1), (2, 1)]
+
+
+def test_appended_rows_grow_the_columns():
+    snapshot = loaded()
+    snapshot.append((2, 12, 100, KILLED_BY, 1050, False))
+    snapshot.rename(2, "two renamed")
+
+    assert len(snapshot) == len(ROWS) + 1
+    assert snapshot.summarize(type_code=KILLED_BY)[0] == (1, 2, "one", 1010, 10, 2)
+    assert snapshot.summarize(type_code=KILLED_BY)[1] == (2, 2, "two renamed", 1050, 12, 2)
+
+
+def test_absolve_drops_profile_and_its_top_reporters():
+    snapshot = loaded()
+    snapshot.absolve(1)
+
+    assert [row[0] for row in snapshot.summarize()] == [2]
+    assert snapshot.top_reporter(1) is None
+    assert snapshot.cheater_details(1, [KILLED_BY])["reports"][KILLED_BY]["total"] == 0
+
+
+def test_retire_rebuilds_top_reporters_from_remaining_rows():
+    snapshot = loaded()
+    snapshot.retire(older_than=1015)
+
+    assert snapshot.summarize() == [(1, 1, "one", 1020, 11, 1), (2, 1, "two", 1030, 12, 1)]
+    assert snapshot.top_reporter(1) == (11, 1)
+    assert snapshot.top_reporter(1, KILLED_BY) is None
+
+
+def test_cheater_details_counts_per_type_and_server():
+    details = loaded().cheater_details(1, [KILLED_BY, SNIPER])
+
+    assert details["name"] == "one"
+    assert details["reports"][KILLED_BY] == {
+        "total": 2,
+        "last_reported_by": 10,
+        "last_report_time": 1010,
+        "most_reported_by": {"user_id": 10, "count": 2},
+    }
+    assert details["reports"][SNIPER]["total"] == 1
+    assert details["top_reported_servers"] == [{"server_id": 100, "count": 2}, {"server_id": 101, "count": 1}]
+
+
+def test_view_taken_before_a_reset_keeps_its_rows():
+    snapshot = loaded()
+    view = snapshot.view()
+    snapshot.reset()
+    snapshot.append((9, 9, 9, KILLED_BY, 1, False))
+
+    assert len(snapshot) == 0
+    assert [row[0] for row in view.summarize()] == [1, 2]
+    assert view.cheater_details(1, [KILLED_BY])["name"] == "one"
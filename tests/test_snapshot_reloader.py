@@ -0,0 +1,82 @@
+import asyncio
+
+import pytest
+
+from db import notifications
+from db.database import DatabaseManager, DatabaseUnavailableError, DeadlineExceededError
+from db.notifications import SnapshotReloader
+from db.snapshot import ReportSnapshot
+
+ROWS = [(1, 10, 100, 0, 1000, False), (1, 11, 100, 0, 1001, False)]
+
+
+@pytest.fixture
+def snapshot(monkeypatch):
+    snapshot = ReportSnapshot()
+    snapshot.load([(9, 9, 9, 0, 1, False)], {})
+    monkeypatch.setattr(notifications, "report_snapshot", snapshot)
+    return snapshot
+
+
+def fail_then_succeed(monkeypatch, *failures):
+    calls = []
+
+    def get_report_snapshot_rows():
+        calls.append(1)
+        if len(calls) <= len(failures):
+            raise failures[len(calls) - 1]
+        return ROWS
+
+    monkeypatch.setattr(DatabaseManager, "get_report_snapshot_rows", staticmethod(get_report_snapshot_rows))
+    monkeypatch.setattr(DatabaseManager, "get_player_names", staticmethod(lambda: {1: "cheater"}))
+    return calls
+
+
+async def reload(snapshot):
+    reloader = SnapshotReloader(retry_delay=0)
+    reloader.start()
+    snapshot.invalidate()
+    await asyncio.sleep(0)
+    await reloader.task
+    return reloader
+
+
+@pytest.mark.parametrize("error", [DatabaseUnavailableError("circuit open"), DeadlineExceededError("deadline passed")])
+def test_reload_retries_when_database_raises(snapshot, monkeypatch, error):
+    calls = fail_then_succeed(monkeypatch, error, error)
+
+    asyncio.run(reload(snapshot))
+
+    assert len(calls) == 3
+    assert snapshot.loaded
+    assert len(snapshot) == len(ROWS)
+    assert snapshot.summarize()[0][:3] == (1, 2, "cheater")
+
+
+def test_reload_reads_again_after_a_racing_write(snapshot, monkeypatch):
+    calls = []
+
+    def get_report_snapshot_rows():
+        calls.append(1)
+        if len(calls) == 1:
+            snapshot.append((2, 12, 100, 0, 1002, False))
+        return ROWS
+
+    monkeypatch.setattr(DatabaseManager, "get_report_snapshot_rows", staticmethod(get_report_snapshot_rows))
+    monkeypatch.setattr(DatabaseManager, "get_player_names", staticmethod(lambda: {}))
+
+    asyncio.run(reload(snapshot))
+
+    assert len(calls) == 2
+    assert snapshot.loaded
+
+
+def test_invalidate_without_prior_load_does_nothing(monkeypatch):
+    snapshot = ReportSnapshot()
+    requested = []
+    snapshot.reload_hook = lambda: requested.append(1)
+
+    snapshot.invalidate()
+
+    assert requested == []
+    assert not snapshot.loaded
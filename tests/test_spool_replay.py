@@ -0,0 +1,133 @@
+import pytest
+from sqlalchemy.exc import IntegrityError, OperationalError
+
+from db import database
+from db.database import AppliedWrite, DatabaseManager, ReportResult, ReportType
+from db.spool import WriteSpool
+
+
+@pytest.fixture
+def spool(tmp_path, monkeypatch):
+    spool = WriteSpool(tmp_path / "write_spool.sqlite3")
+    monkeypatch.setattr(database, "write_spool", spool)
+    yield spool
+    spool.close()
+
+
+def replay_with(monkeypatch, failures):
+    applied = []
+
+    def add_verified_legit(cls, tarkov_profile_id, replay=False, **payload):
+        if tarkov_profile_id in failures:
+            raise failures[tarkov_profile_id]
+        applied.append(tarkov_profile_id)
+        return True
+
+    monkeypatch.setattr(DatabaseManager, "add_verified_legit", classmethod(add_verified_legit))
+    return applied
+
+
+def test_poison_entry_is_dead_lettered_and_replay_continues(spool, monkeypatch):
+    poison = IntegrityError("INSERT INTO verified_legit", {}, Exception("duplicate key value violates unique constraint"))
+    applied = replay_with(monkeypatch, {1: poison})
+    spool.append("add_verified_legit", {"tarkov_profile_id": 1})
+    spool.append("add_verified_legit", {"tarkov_profile_id": 2})
+
+    assert DatabaseManager.replay_spooled_writes() == 1
+    assert applied == [2]
+    assert len(spool) == 0
+    assert spool.peek() == []
+    [(_, operation, payload, error)] = spool.dead_letters()
+    assert operation == "add_verified_legit"
+    assert payload == {"tarkov_profile_id": 1}
+    assert "duplicate key" in error
+
+
+def test_connectivity_failure_keeps_entries_queued(spool, monkeypatch):
+    applied = replay_with(monkeypatch, {1: OperationalError("SELECT 1", {}, Exception("could not connect to server"))})
+    spool.append("add_verified_legit", {"tarkov_profile_id": 1})
+    spool.append("add_verified_legit", {"tarkov_profile_id": 2})
+
+    assert DatabaseManager.replay_spooled_writes() == 0
+    assert applied == []
+    assert len(spool) == 2
+    assert spool.dead_letters() == []
+
+
+def test_unknown_operation_is_dead_lettered(spool, monkeypatch):
+    applied = replay_with(monkeypatch, {})
+    spool.append("drop_everything", {})
+    spool.append("add_verified_legit", {"tarkov_profile_id": 3})
+
+    assert DatabaseManager.replay_spooled_writes() == 1
+    assert applied == [3]
+    assert [operation for _, operation, _, _ in spool.dead_letters()] == ["drop_everything"]
+
+
+REPORT = {
+    "reporter_user_id": 10,
+    "server_id": 100,
+    "cheater_game_name": "cheater",
+    "cheater_profile_id": 1,
+    "report_time": 1000,
+    "report_type": ReportType.KILLED_BY_CHEATER,
+    "notes": "aimbot",
+    "absolved": False,
+}
+
+
+class LandedSession:
+    # Knows only which write ids committed; any other query means the replay tried to apply the write again
+    def __init__(self, applied):
+        self.applied = applied
+
+    def get(self, model, key, **kwargs):
+        assert model is AppliedWrite
+        return AppliedWrite(write_id=key, applied_time=0) if key in self.applied else None
+
+    def __getattr__(self, name):
+        raise AssertionError(f"Replay of an applied write called session.{name}")
+
+
+def run_with(monkeypatch, run_operation):
+    monkeypatch.setattr(DatabaseManager, "_run_operation", staticmethod(run_operation))
+
+
+def test_write_is_spooled_when_database_unreachable(spool, monkeypatch):
+    def unreachable(operation):
+        raise OperationalError("INSERT INTO cheater_reports", {}, Exception("could not connect to server"))
+
+    run_with(monkeypatch, unreachable)
+
+    assert DatabaseManager.add_cheater_report(**REPORT) == ReportResult.SPOOLED
+    [(_, operation, payload)] = spool.peek()
+    assert operation == "add_cheater_report"
+    assert payload["report_type"] == "KILLED_BY_CHEATER"
+    assert payload["write_id"]
+
+
+def test_write_queues_behind_pending_entries(spool, monkeypatch):
+    def unexpected(operation):
+        raise AssertionError("A write must not overtake entries already in the spool")
+
+    run_with(monkeypatch, unexpected)
+    spool.append("add_verified_legit", {"tarkov_profile_id": 1})
+
+    assert DatabaseManager.add_cheater_report(**REPORT) == ReportResult.SPOOLED
+    assert [operation for _, operation, _ in spool.peek()] == ["add_verified_legit", "add_cheater_report"]
+
+
+def test_replay_skips_write_that_already_landed(spool, monkeypatch):
+    # The commit reached Postgres but the connection dropped before the acknowledgement, so the write was spooled anyway
+    def lost_acknowledgement(operation):
+        raise OperationalError("COMMIT", {}, Exception("server closed the connection unexpectedly"))
+
+    run_with(monkeypatch, lost_acknowledgement)
+    assert DatabaseManager.add_cheater_report(**REPORT) == ReportResult.SPOOLED
+    [(_, _, payload)] = spool.peek()
+
+    run_with(monkeypatch, lambda operation: operation(LandedSession({payload["write_id"]})))
+
+    assert DatabaseManager.replay_spooled_writes() == 1
+    assert len(spool) == 0
+    assert spool.dead_letters() == []